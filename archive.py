@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime
+
+
+ARCHIVE_SUFFIX = ".archive.jsonl.gz"
+PARTITIONED_ARCHIVE_FILE = "archive.jsonl.gz"
+
+
+def empty_rollup():
+    """
+    Aggregates kept in the live data file for everything in the archive.
+    "batches" lists the archive runs the data file has saved, in order;
+    "deleted" maps a deleted subject to the number of runs saved before
+    it was deleted, so its older rows stay hidden if the name is reused.
+    """
+    return {"sessions": 0, "by_subject": {}, "by_day": {}, "batches": [], "deleted": {}}
+
+
+def new_batch():
+    # Identity of one archive run, stored on each row it appends
+    return uuid.uuid4().hex
+
+
+def session_hours(session):
+    start = datetime.strptime(session["start_time"], "%H:%M")
+    end = datetime.strptime(session["end_time"], "%H:%M")
+    return (end - start).seconds / 3600
+
+
+def add_to_rollup(rollup, sessions, batch):
+    # Fold one archive run's sessions into the per-subject and per-day rollups
+    rollup.setdefault("batches", []).append(batch)
+    by_subject = rollup["by_subject"]
+    by_day = rollup["by_day"]
+    for session in sessions:
+        hours = session_hours(session)
+        subject = by_subject.setdefault(session["subject"], {"sessions": 0, "hours": 0.0})
+        subject["sessions"] += 1
+        subject["hours"] += hours
+        day = by_day.setdefault(session["date"], {})
+        day[session["subject"]] = day.get(session["subject"], 0.0) + hours
+        rollup["sessions"] += 1
+    return rollup
+
+
+def remove_subject_from_rollup(rollup, name):
+    # Drop a deleted subject's archived hours from the rollups
+    subject = rollup["by_subject"].pop(name, None)
+    if subject is None:
+        return rollup
+    rollup["sessions"] -= subject["sessions"]
+    rollup.setdefault("deleted", {})[name] = len(rollup.get("batches", []))
+    for date in list(rollup["by_day"]):
+        day = rollup["by_day"][date]
+        day.pop(name, None)
+        if not day:
+            del rollup["by_day"][date]
+    return rollup
+
+
+def append_sessions(path, sessions, batch):
+    # Append one archive run's sessions to the compressed cold store as one new gzip member
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for session in sessions:
+            row = dict(session.items())
+            row["archive_batch"] = batch
+            f.write(json.dumps(row, separators=(",", ":")))
+            f.write("\n")
+
+
+def iter_sessions(path, rollup, start_date=None, end_date=None, subject=None):
+    """
+    Stream archived sessions, optionally filtered by date range and
+    subject. Rows of runs the rollup does not list (appended before a
+    save that never happened) and rows of deleted subjects are skipped.
+    """
+    if path is None or not os.path.exists(path):
+        return
+    positions = {batch: pos for pos, batch in enumerate(rollup.get("batches", []))}
+    deleted = rollup.get("deleted", {})
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            session = json.loads(line)
+            batch = session.pop("archive_batch", None)
+            if batch is None:
+                # Written before runs were tracked: only the subject's rollup entry tells
+                if session["subject"] not in rollup["by_subject"] or session["subject"] in deleted:
+                    continue
+            elif batch not in positions or positions[batch] < deleted.get(session["subject"], 0):
+                continue
+            if start_date is not None and session["date"] < start_date:
+                continue
+            if end_date is not None and session["date"] > end_date:
+                continue
+            if subject is not None and session["subject"] != subject:
+                continue
+            yield session
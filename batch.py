@@ -0,0 +1,133 @@
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from locking import FileLock
+from logic import StudyPlannerLogic
+
+
+REPORT_FIELDS = [
+    "student",
+    "status",
+    "scheduled_count",
+    "incomplete_subjects",
+    "conflicts",
+    "total_subjects",
+    "total_hours_needed",
+    "total_hours_completed",
+    "total_sessions",
+    "completed_sessions",
+    "seconds",
+]
+
+
+def find_data_files(directory):
+    # List planner data files in a directory, one per student
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".json")
+    )
+
+
+def schedule_student(data_file, start_time, end_time, session_duration, break_time):
+    # Auto-schedule one student's planner and collect conflicts and stats,
+    # leaving no schedule cache or lock file behind in the cohort directory
+    started = time.perf_counter()
+    lock = FileLock(data_file)
+    had_lock_file = os.path.exists(lock.path)
+    row = {
+        "student": os.path.splitext(os.path.basename(data_file))[0],
+        "status": "ok",
+        "scheduled_count": 0,
+        "incomplete_subjects": "",
+    }
+
+    try:
+        logic = StudyPlannerLogic(data_file, cache_schedules=False)
+        success, result = logic.auto_schedule(
+            start_time, end_time, session_duration, break_time
+        )
+        if success:
+            row["scheduled_count"] = result["scheduled_count"]
+            row["incomplete_subjects"] = "; ".join(result["incomplete_subjects"])
+        else:
+            row["status"] = result
+
+        row["conflicts"] = len(logic.detect_conflicts())
+        row.update(logic.get_statistics())
+    except Exception as e:
+        row["status"] = f"error: {e}"
+    finally:
+        if not had_lock_file:
+            lock.discard()
+
+    row["seconds"] = round(time.perf_counter() - started, 4)
+    return row
+
+
+def run_cohort(directory, report_file, start_time="09:00", end_time="21:00",
+               session_duration=2.0, break_time=0.0, max_workers=None):
+    """
+    Auto-schedule every planner data file in directory on a process pool,
+    streaming one report row per student as soon as it finishes.
+    Returns the number of students processed.
+    """
+    data_files = find_data_files(directory)
+    task = partial(
+        schedule_student,
+        start_time=start_time,
+        end_time=end_time,
+        session_duration=session_duration,
+        break_time=break_time,
+    )
+
+    processed = 0
+    with open(report_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(task, data_file) for data_file in data_files]
+            for future in as_completed(futures):
+                writer.writerow(future.result())
+                f.flush()
+                processed += 1
+
+    return processed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Auto-schedule a whole cohort of planners")
+    parser.add_argument("directory", help="Directory with one planner JSON file per student")
+    parser.add_argument("--report", default="cohort_report.csv")
+    parser.add_argument("--start", default="09:00")
+    parser.add_argument("--end", default="21:00")
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--break-time", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    is_valid, error = StudyPlannerLogic(data_file=None).validate_auto_schedule_params(
+        args.start, args.end, str(args.duration), str(args.break_time)
+    )
+    if not is_valid:
+        sys.exit(error)
+
+    started = time.perf_counter()
+    count = run_cohort(
+        args.directory,
+        args.report,
+        args.start,
+        args.end,
+        args.duration,
+        args.break_time,
+        args.workers,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Scheduled {count} students in {elapsed:.2f}s -> {args.report}")
@@ -0,0 +1,337 @@
+import gc
+import json
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from records import Session
+
+
+SLOTS = [("09:00", "11:00"), ("11:00", "13:00"), ("14:00", "16:00"), ("16:00", "18:00")]
+
+
+def make_dataset(num_sessions, num_subjects=8, start=date(2020, 1, 1)):
+    # Build a synthetic planner dataset with num_sessions sessions
+    subjects = [
+        {
+            "name": f"Subject {i}",
+            "exam_date": (start + timedelta(days=num_sessions // len(SLOTS) + 30 + i)).isoformat(),
+            "difficulty": 1 + i % 5,
+            "past_score": 50 + i * 5,
+            "recommended_hours": 40,
+            "hours_completed": 0,
+            "daily_study_hours": 4,
+        }
+        for i in range(num_subjects)
+    ]
+
+    sessions = []
+    for i in range(num_sessions):
+        slot_start, slot_end = SLOTS[i % len(SLOTS)]
+        sessions.append({
+            "subject": subjects[i % num_subjects]["name"],
+            "date": (start + timedelta(days=i // len(SLOTS))).isoformat(),
+            "start_time": slot_start,
+            "end_time": slot_end,
+            "notes": "Auto-scheduled" if i % 3 else f"Chapter {i % 40} review",
+            "completed": i % 2 == 0,
+        })
+
+    return {"subjects": subjects, "study_sessions": sessions}
+
+
+def _measure(build):
+    # Bytes still allocated after build() returns, with its result kept alive
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def bench_memory(num_sessions):
+    # Per-session memory for JSON-loaded dicts versus slotted Session records
+    text = json.dumps(make_dataset(num_sessions)["study_sessions"])
+
+    dicts, dict_bytes = _measure(lambda: json.loads(text))
+    del dicts
+
+    records, record_bytes = _measure(
+        lambda: [Session.from_dict(s) for s in json.loads(text)]
+    )
+    del records
+
+    print(f"sessions:          {num_sessions}")
+    print(f"dict per session:   {dict_bytes / num_sessions:8.1f} bytes")
+    print(f"record per session: {record_bytes / num_sessions:8.1f} bytes")
+
+
+def bench_columnar(num_sessions):
+    # Analytics on session dicts versus the NumPy columnar backend
+    from logic import StudyPlannerLogic
+
+    data = make_dataset(num_sessions)
+    timings = {}
+    for columnar in (False, True):
+        logic = StudyPlannerLogic(data_file=None, columnar=columnar)
+        logic.subjects = data["subjects"]
+        logic.study_sessions = [Session.from_dict(s) for s in data["study_sessions"]]
+
+        if columnar:
+            started = time.perf_counter()
+            logic.get_columns()
+            print(f"column build:       {time.perf_counter() - started:8.4f}s")
+
+        queries = [
+            ("get_statistics", logic.get_statistics),
+            ("get_hours_by_subject", logic.get_hours_by_subject),
+            ("get_upcoming_sessions_today", logic.get_upcoming_sessions_today),
+        ]
+        # The pairwise loop is quadratic, so only time it on small datasets
+        if columnar or num_sessions <= 20_000:
+            queries.append(("detect_conflicts", logic.detect_conflicts))
+
+        for name, query in queries:
+            started = time.perf_counter()
+            query()
+            timings[name, columnar] = time.perf_counter() - started
+
+    for name in ("get_statistics", "get_hours_by_subject", "get_upcoming_sessions_today", "detect_conflicts"):
+        dicts = timings.get((name, False))
+        columns = timings[name, True]
+        dicts_text = f"{dicts:8.4f}s" if dicts is not None else "  skipped"
+        print(f"{name:<28} dicts {dicts_text}  columnar {columns:8.4f}s")
+
+
+def bench_load(num_sessions):
+    # load_data time for the pretty-printed JSON file versus a binary snapshot
+    import os
+    import tempfile
+
+    from logic import StudyPlannerLogic
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = os.path.join(directory, "planner.json")
+        snapshot_file = os.path.join(directory, "planner.snap")
+
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(make_dataset(num_sessions), f, indent=2)
+        StudyPlannerLogic(json_file).export_snapshot(snapshot_file)
+
+        for label, path in (("json", json_file), ("snapshot", snapshot_file)):
+            gc.collect()
+            started = time.perf_counter()
+            logic = StudyPlannerLogic(path)
+            elapsed = time.perf_counter() - started
+            size = os.path.getsize(path) / 1e6
+            print(f"{label:<9} load {elapsed:7.2f}s  file {size:7.1f} MB  ({len(logic.study_sessions)} sessions)")
+
+            started = time.perf_counter()
+            logic.save_data()
+            print(f"{label:<9} save {time.perf_counter() - started:7.2f}s")
+            del logic
+
+
+def bench_startup(num_sessions):
+    # Fresh-process time to import the UI, load the data and fit the ML model
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    script = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        "import ui\n"
+        "imported = time.perf_counter()\n"
+        "from logic import StudyPlannerLogic\n"
+        "logic = StudyPlannerLogic(sys.argv[1])\n"
+        "loaded = time.perf_counter()\n"
+        "logic.prepare_predictions()\n"
+        "ready = time.perf_counter()\n"
+        "print(imported - started, loaded - imported, ready - loaded)\n"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "planner.json")
+        with open(data_file, "w", encoding="utf-8") as f:
+            json.dump(make_dataset(num_sessions), f, indent=2)
+
+        output = subprocess.run(
+            [sys.executable, "-c", script, data_file],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        imported, loaded, ready = (float(value) for value in output.split())
+
+    print(f"import ui (before first paint): {imported:8.3f}s")
+    print(f"load data (background):         {loaded:8.3f}s")
+    print(f"fit model (background):         {ready:8.3f}s")
+
+
+def bench_concurrency(num_sessions, readers=8, writers=4, seconds=3.0):
+    # Hammer one planner from reader and writer threads while it saves in the background
+    import collections
+    import os
+    import random
+    import tempfile
+    import threading
+
+    from logic import SESSION_ADDED, StudyPlannerLogic
+
+    errors = []
+    counts = {"reads": 0, "adds": 0, "deletes": 0, "completes": 0}
+    counts_lock = threading.Lock()
+    stop = threading.Event()
+
+    def run(work, name):
+        done = 0
+        try:
+            while not stop.is_set():
+                if work() is not False:
+                    done += 1
+        except Exception as e:
+            errors.append(f"{name}: {e!r}")
+        finally:
+            with counts_lock:
+                counts[name] += done
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "planner.json")
+        data = make_dataset(num_sessions)
+        with open(data_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        logic = StudyPlannerLogic(data_file, save_delay=0.05)
+        subjects = logic.get_subject_names()
+
+        def read():
+            stats = logic.get_statistics()
+            by_date = logic.get_sessions_by_date(include_recurring=False)
+            listed = sum(len(day) for day in by_date.values())
+            logic.get_hours_by_subject()
+            if stats["completed_sessions"] > stats["total_sessions"] or listed <= 0:
+                raise AssertionError(f"inconsistent read: {stats} / {listed} listed")
+
+        def add():
+            day = date(2030, 1, 1) + timedelta(days=random.randrange(365))
+            logic.add_session(random.choice(subjects), day.isoformat(), "07:00", "08:00", "stress")
+
+        # Sessions the adders created, handed to the deleter through the change events
+        added = collections.deque()
+        deleted = []
+
+        def on_change(event, details):
+            if event == SESSION_ADDED and details["session"]["notes"] == "stress":
+                added.append(details["session"])
+
+        logic.subscribe(on_change)
+
+        def delete():
+            # Only remove sessions this benchmark added, so reads never see an empty schedule
+            try:
+                session = added.popleft()
+            except IndexError:
+                # Nothing to delete yet
+                time.sleep(0.001)
+                return False
+            if logic.remove_session(session):
+                deleted.append(session)
+
+        def complete():
+            logic.complete_session(random.randrange(len(logic.study_sessions)))
+
+        threads = [threading.Thread(target=run, args=(read, "reads")) for _ in range(readers)]
+        for i in range(writers):
+            work, name = [(add, "adds"), (delete, "deletes"), (complete, "completes")][i % 3]
+            threads.append(threading.Thread(target=run, args=(work, name)))
+
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        expected = num_sessions + counts["adds"] - len(deleted)
+        result = logic.close()
+        saved = len(StudyPlannerLogic(data_file).study_sessions)
+
+    print(f"threads:            {readers} readers, {writers} writers, {seconds:.1f}s")
+    for name, count in counts.items():
+        print(f"{name + ':':<19} {count:8d}  ({count / seconds:10.1f}/s)")
+    print(f"sessions:           {len(logic.study_sessions)} in memory, {saved} saved, {expected} expected")
+    if errors or result is not True or saved != expected or len(logic.study_sessions) != expected:
+        raise SystemExit("FAILED: " + "; ".join(errors or [str(result)]))
+    print("consistent:         yes")
+
+
+def bench_validate(num_sessions):
+    # Batch validation of imported rows versus the one-value-at-a-time validators
+    from logic import StudyPlannerLogic
+
+    today = date.today()
+    logic = StudyPlannerLogic(None)
+    for subject in make_dataset(0, start=today)["subjects"]:
+        logic.add_subject(
+            subject["name"], subject["exam_date"], subject["difficulty"],
+            subject["past_score"], subject["daily_study_hours"],
+        )
+    rows = make_dataset(num_sessions, start=today)["study_sessions"]
+
+    def one_at_a_time(row):
+        errors = []
+        valid, day = logic.validate_date_format(row["date"])
+        if valid:
+            for check in (logic.validate_date_not_past, logic.check_exam_date_conflict):
+                valid, error = check(day)
+                if not valid:
+                    errors.append(error)
+                    break
+        valid, error, start, end = logic.validate_time_format(row["start_time"], row["end_time"])
+        if valid:
+            hours = (end - start).seconds / 3600
+            valid, error = logic.validate_session_duration(row["subject"], hours)
+        if not valid:
+            errors.append(error)
+        return errors
+
+    started = time.perf_counter()
+    single = [one_at_a_time(row) for row in rows]
+    single_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = logic.validate_sessions(rows)
+    batch_time = time.perf_counter() - started
+
+    print(f"rows:               {num_sessions} ({sum(1 for errors in batch if errors)} with errors)")
+    print(f"one at a time:      {single_time:8.3f}s")
+    print(f"validate_sessions:  {batch_time:8.3f}s")
+    if sum(map(bool, single)) != sum(map(bool, batch)):
+        raise SystemExit("FAILED: batch and single validation disagree")
+
+
+BENCHMARKS = {
+    "columnar": bench_columnar,
+    "concurrency": bench_concurrency,
+    "load": bench_load,
+    "memory": bench_memory,
+    "startup": bench_startup,
+    "validate": bench_validate,
+}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Study planner benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    BENCHMARKS[args.benchmark](args.sessions)
+    print(f"total:              {time.perf_counter() - started:8.2f}s")
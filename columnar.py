@@ -0,0 +1,158 @@
+from datetime import date
+
+import numpy as np
+
+
+COMPLETED = 1
+REMINDED = 2
+
+
+def time_to_minute(time_str):
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+class SessionColumns:
+    """
+    Column-oriented NumPy copy of a session list for analytics queries.
+    Rows keep the order of the source list, so row numbers are session
+    indices. Build it once and rebuild after the sessions change.
+    """
+
+    def __init__(self, sessions):
+        count = len(sessions)
+        self.size = count
+        self.subject_names = []
+
+        date_ordinals = {}
+        minutes = {}
+        subject_codes = {}
+
+        def date_ordinal(date_str):
+            ordinal = date_ordinals.get(date_str)
+            if ordinal is None:
+                ordinal = date.fromisoformat(date_str).toordinal()
+                date_ordinals[date_str] = ordinal
+            return ordinal
+
+        def minute(time_str):
+            value = minutes.get(time_str)
+            if value is None:
+                value = time_to_minute(time_str)
+                minutes[time_str] = value
+            return value
+
+        def subject_code(name):
+            code = subject_codes.get(name)
+            if code is None:
+                code = len(self.subject_names)
+                subject_codes[name] = code
+                self.subject_names.append(name)
+            return code
+
+        self.date = np.fromiter(
+            (date_ordinal(s["date"]) for s in sessions), dtype=np.int32, count=count
+        )
+        self.start = np.fromiter(
+            (minute(s["start_time"]) for s in sessions), dtype=np.int16, count=count
+        )
+        self.end = np.fromiter(
+            (minute(s["end_time"]) for s in sessions), dtype=np.int16, count=count
+        )
+        self.subject = np.fromiter(
+            (subject_code(s["subject"]) for s in sessions), dtype=np.int32, count=count
+        )
+        self.flags = np.fromiter(
+            (
+                (COMPLETED if s.get("completed", False) else 0)
+                | (REMINDED if s.get("reminded", False) else 0)
+                for s in sessions
+            ),
+            dtype=np.uint8,
+            count=count,
+        )
+
+    @classmethod
+    def from_arrays(cls, date, start, end, subject, flags, subject_names):
+        # Wrap ready-made column arrays, e.g. from a binary snapshot
+        columns = cls.__new__(cls)
+        columns.size = len(date)
+        columns.date = date
+        columns.start = start
+        columns.end = end
+        columns.subject = subject
+        columns.flags = flags
+        columns.subject_names = subject_names
+        return columns
+
+    def set_flag(self, row, flag):
+        # Set a flag on one row after the matching session was updated
+        self.flags[row] |= flag
+
+    def completed_count(self):
+        # Number of completed sessions
+        return int(np.count_nonzero(self.flags & COMPLETED))
+
+    def overlapping_pairs(self):
+        # All (i, j) pairs with i < j of same-day sessions whose times overlap
+        if self.size < 2:
+            return np.empty((0, 2), dtype=np.int64)
+
+        key_start = self.date.astype(np.int64) * 1440 + self.start
+        key_end = self.date.astype(np.int64) * 1440 + self.end
+
+        order = np.argsort(key_start, kind="stable")
+        sorted_start = key_start[order]
+
+        # Sessions after position p that start before p ends overlap it
+        positions = np.arange(self.size)
+        upper = np.searchsorted(sorted_start, key_end[order], side="left")
+        counts = np.clip(upper - positions - 1, 0, None)
+
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty((0, 2), dtype=np.int64)
+
+        first_pos = np.repeat(positions, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        second_pos = first_pos + 1 + offsets
+
+        first = order[first_pos]
+        second = order[second_pos]
+
+        # Equal starts with a zero-length session do not overlap
+        keep = key_end[second] > key_start[first]
+        first, second = first[keep], second[keep]
+
+        pairs = np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def hours_by_subject(self, completed_only=False):
+        # Scheduled (or completed) hours per subject name
+        hours = (self.end.astype(np.float64) - self.start) / 60
+        weights = hours
+        if completed_only:
+            weights = np.where(self.flags & COMPLETED, hours, 0.0)
+        totals = np.bincount(self.subject, weights=weights, minlength=len(self.subject_names))
+        return {name: float(totals[code]) for code, name in enumerate(self.subject_names)}
+
+    def hours_by_day_and_subject(self):
+        # Summed hours per (date ordinal, subject code) pair, as three parallel arrays
+        hours = (self.end.astype(np.float64) - self.start) / 60
+        keys = self.date.astype(np.int64) * len(self.subject_names) + self.subject
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=hours)
+        ordinals, subjects = np.divmod(unique_keys, max(len(self.subject_names), 1))
+        return ordinals, subjects, totals
+
+    def reminder_candidates(self, now):
+        # Rows of today's open, unreminded sessions starting in 14-16 minutes
+        now_minute = now.hour * 60 + now.minute
+        time_diff = self.start.astype(np.int32) - now_minute
+        mask = (
+                (self.date == now.date().toordinal())
+                & ((self.flags & (COMPLETED | REMINDED)) == 0)
+                & (time_diff >= 14)
+                & (time_diff <= 16)
+        )
+        return np.flatnonzero(mask)
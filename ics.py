@@ -0,0 +1,348 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import recurrence
+
+
+PRODUCT_ID = "-//Intelligent Study Planner//EN"
+
+# Busy events that fill a whole day block the day up to this time
+END_OF_DAY = "23:59"
+
+WEEKDAY_CODES = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+# Writing
+
+def _escape(text):
+    # Escape a TEXT value per RFC 5545
+    return (
+        str(text)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    # Split a content line into 75-octet pieces joined by CRLF + space
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    pieces = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never cut a multi-byte character in half
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = 74
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def _local_stamp(date_str, time_str):
+    return date_str.replace("-", "") + "T" + time_str.replace(":", "") + "00"
+
+
+def _session_event(session, uid, stamp):
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{_local_stamp(session['date'], session['start_time'])}",
+        f"DTEND:{_local_stamp(session['date'], session['end_time'])}",
+        f"SUMMARY:{_escape('Study: ' + session['subject'])}",
+    ]
+    if session.get("notes"):
+        lines.append(f"DESCRIPTION:{_escape(session['notes'])}")
+    if session.get("completed", False):
+        lines.append("STATUS:CONFIRMED")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def _exam_event(subject, stamp):
+    day = subject["exam_date"].replace("-", "")
+    next_day = (
+        datetime.strptime(subject["exam_date"], "%Y-%m-%d") + timedelta(days=1)
+    ).strftime("%Y%m%d")
+    return [
+        "BEGIN:VEVENT",
+        f"UID:exam-{day}-{_uid_part(subject['name'])}@study-planner",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{day}",
+        f"DTEND;VALUE=DATE:{next_day}",
+        f"SUMMARY:{_escape('Exam: ' + subject['name'])}",
+        "END:VEVENT",
+    ]
+
+
+def _rule_event(rule, index, stamp):
+    parts = [f"FREQ={rule['frequency'].upper()}"]
+    if (rule.get("interval") or 1) > 1:
+        parts.append(f"INTERVAL={rule['interval']}")
+    if rule["frequency"] == recurrence.WEEKLY and rule.get("weekdays"):
+        parts.append("BYDAY=" + ",".join(WEEKDAY_CODES[d] for d in rule["weekdays"]))
+    parts.append(f"UNTIL={_local_stamp(rule['end_date'], '23:59')}")
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:rule-{index}-{rule['start_date'].replace('-', '')}-"
+        f"{_uid_part(rule['subject'])}@study-planner",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{_local_stamp(rule['start_date'], rule['start_time'])}",
+        f"DTEND:{_local_stamp(rule['start_date'], rule['end_time'])}",
+        f"RRULE:{';'.join(parts)}",
+        f"SUMMARY:{_escape('Study: ' + rule['subject'])}",
+    ]
+    for skipped in rule.get("exceptions") or ():
+        lines.append(f"EXDATE:{_local_stamp(skipped, rule['start_time'])}")
+    if rule.get("notes"):
+        lines.append(f"DESCRIPTION:{_escape(rule['notes'])}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def _uid_part(text):
+    return "".join(c if c.isalnum() else "-" for c in text.lower())
+
+
+def write_calendar(path, sessions, subjects=(), rules=()):
+    """
+    Write sessions, exam days and recurring rules as an iCalendar file.
+    Events are written one at a time, so memory use does not grow with
+    the size of the schedule. Times are floating local times.
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODUCT_ID}", "CALSCALE:GREGORIAN"):
+            f.write(_fold(line))
+
+        for idx, session in enumerate(sessions):
+            uid = (
+                f"session-{_local_stamp(session['date'], session['start_time'])}-"
+                f"{idx}-{_uid_part(session['subject'])}@study-planner"
+            )
+            for line in _session_event(session, uid, stamp):
+                f.write(_fold(line))
+            count += 1
+
+        for subject in subjects:
+            for line in _exam_event(subject, stamp):
+                f.write(_fold(line))
+            count += 1
+
+        for idx, rule in enumerate(rules):
+            for line in _rule_event(rule, idx, stamp):
+                f.write(_fold(line))
+            count += 1
+
+        f.write(_fold("END:VCALENDAR"))
+    return count
+
+
+# Reading
+
+def _unfolded_lines(f):
+    # Content lines with RFC 5545 line folding undone, read lazily
+    current = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _parse_property(line):
+    # "NAME;PARAM=VALUE:text" -> (NAME, {PARAM: VALUE}, text)
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    parameters = {}
+    for param in params:
+        key, _, param_value = param.partition("=")
+        parameters[key.upper()] = param_value.strip('"')
+    return name.upper(), parameters, value
+
+
+def _unescape(text):
+    result = []
+    chars = iter(text)
+    for c in chars:
+        if c == "\\":
+            following = next(chars, "")
+            result.append("\n" if following in ("n", "N") else following)
+        else:
+            result.append(c)
+    return "".join(result)
+
+
+def _parse_when(value, parameters):
+    # A DATE or DATE-TIME value as a local naive datetime, plus whether it was a whole day
+    if parameters.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d"), True
+
+    moment = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None), False
+
+    tzid = parameters.get("TZID")
+    if tzid:
+        try:
+            from zoneinfo import ZoneInfo
+
+            return moment.replace(tzinfo=ZoneInfo(tzid)).astimezone().replace(tzinfo=None), False
+        except Exception:
+            pass
+    return moment, False
+
+
+def iter_events(path):
+    """
+    Stream VEVENTs from an iCalendar file as dicts with summary, start,
+    end (local naive datetimes), all_day and transparent flags, and the
+    raw rrule if any. Only one event is held in memory at a time.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        event = None
+        for line in _unfolded_lines(f):
+            upper = line.upper()
+            if upper == "BEGIN:VEVENT":
+                event = {
+                    "summary": "",
+                    "start": None,
+                    "end": None,
+                    "duration": None,
+                    "all_day": False,
+                    "transparent": False,
+                    "status": None,
+                    "rrule": None,
+                    "exdates": set(),
+                }
+                continue
+            if event is None:
+                continue
+            if upper == "END:VEVENT":
+                if event["start"] is not None:
+                    if event["end"] is None:
+                        if event["duration"] is not None:
+                            event["end"] = event["start"] + event["duration"]
+                        elif event["all_day"]:
+                            event["end"] = event["start"] + timedelta(days=1)
+                        else:
+                            event["end"] = event["start"]
+                    yield event
+                event = None
+                continue
+
+            name, parameters, value = _parse_property(line)
+            if name == "SUMMARY":
+                event["summary"] = _unescape(value)
+            elif name == "DTSTART":
+                event["start"], event["all_day"] = _parse_when(value, parameters)
+            elif name == "DTEND":
+                event["end"], _ = _parse_when(value, parameters)
+            elif name == "DURATION":
+                event["duration"] = _parse_duration(value)
+            elif name == "TRANSP":
+                event["transparent"] = value.upper() == "TRANSPARENT"
+            elif name == "STATUS":
+                event["status"] = value.upper()
+            elif name == "RRULE":
+                event["rrule"] = value
+            elif name == "EXDATE":
+                for item in value.split(","):
+                    event["exdates"].add(_parse_when(item, parameters)[0].date().isoformat())
+
+
+def _parse_duration(value):
+    # "PT1H30M", "P1D", "P2W" -> timedelta (negative durations count as zero)
+    match = re.fullmatch(
+        r"[+-]?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?", value.strip()
+    )
+    if match is None or value.strip().startswith("-"):
+        return timedelta(0)
+    weeks, days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+def expand_event(event, until):
+    """
+    Occurrences of an event up to a date. Daily and weekly RRULEs
+    (INTERVAL, BYDAY, UNTIL, COUNT) are expanded with the planner's own
+    recurrence rules; other events yield just their first occurrence.
+    """
+    rrule = event["rrule"]
+    parts = dict(part.partition("=")[::2] for part in rrule.upper().split(";")) if rrule else {}
+    frequency = parts.get("FREQ", "").lower()
+    if frequency not in recurrence.FREQUENCIES:
+        yield event
+        return
+
+    first_day = event["start"].date()
+    last_day = until
+    if "UNTIL" in parts:
+        last_day = min(last_day, _parse_when(parts["UNTIL"], {})[0].date())
+
+    rule = {
+        "start_date": first_day.isoformat(),
+        "end_date": max(first_day, last_day).isoformat(),
+        "frequency": frequency,
+        "interval": int(parts.get("INTERVAL", 1)),
+        "weekdays": [
+            WEEKDAY_CODES.index(code[-2:])
+            for code in parts.get("BYDAY", "").split(",")
+            if code[-2:] in WEEKDAY_CODES
+        ],
+        "exceptions": sorted(event["exdates"]),
+    }
+    remaining = int(parts["COUNT"]) if "COUNT" in parts else None
+    length = event["end"] - event["start"]
+    for date_str in recurrence.iter_dates(rule):
+        if remaining is not None:
+            if remaining <= 0:
+                return
+            remaining -= 1
+        day = datetime.strptime(date_str, "%Y-%m-%d")
+        start = datetime.combine(day.date(), event["start"].time())
+        yield dict(event, start=start, end=start + length, rrule=None)
+
+
+def busy_blocks(event):
+    """
+    Split an event into per-day busy blocks:
+    {"date", "start_time", "end_time", "summary"}.
+    """
+    start, end = event["start"], event["end"]
+    if end <= start:
+        return
+
+    day = start.date()
+    while True:
+        day_start = datetime.combine(day, datetime.min.time())
+        block_start = max(start, day_start)
+        block_end = min(end, day_start + timedelta(days=1))
+        if block_end > block_start:
+            yield {
+                "date": day.isoformat(),
+                "start_time": block_start.strftime("%H:%M"),
+                "end_time": (
+                    END_OF_DAY if block_end >= day_start + timedelta(days=1)
+                    else block_end.strftime("%H:%M")
+                ),
+                "summary": event["summary"],
+            }
+        day += timedelta(days=1)
+        if datetime.combine(day, datetime.min.time()) >= end:
+            break
+
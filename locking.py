@@ -0,0 +1,216 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class RWLock:
+    """
+    Readers-writer lock: any number of threads may read at once, a writer
+    has the data to itself. Waiting writers block new readers so a steady
+    stream of reads cannot starve them. Both sides are re-entrant, and the
+    writing thread may also read; a reader may not upgrade to writing.
+    Work queued with after_write() runs once the writer has let go.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = {}            # thread id -> nested read count
+        self._writer = None           # thread id of the writer
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._after_write = []        # callbacks queued by the writer
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or me in self._readers:
+                # Nested read: never wait, or a queued writer would deadlock us
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers[me] = 1
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            count = self._readers[me] - 1
+            if count:
+                self._readers[me] = count
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("cannot upgrade a read lock to a write lock")
+
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        with self._cond:
+            self._write_depth -= 1
+            if self._write_depth:
+                return
+            self._writer = None
+            callbacks, self._after_write = self._after_write, []
+            self._cond.notify_all()
+        for callback in callbacks:
+            callback()
+
+    def after_write(self, callback):
+        # Call callback() once this thread's outermost write lock is released, or now if it holds none
+        with self._cond:
+            if self._writer == threading.get_ident():
+                self._after_write.append(callback)
+                return
+        callback()
+
+    def reading(self):
+        return _Held(self.acquire_read, self.release_read)
+
+    def writing(self):
+        return _Held(self.acquire_write, self.release_write)
+
+
+class _Held:
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+        return False
+
+
+def read_locked(method):
+    # Run a method while holding self._lock for reading
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.reading():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def write_locked(method):
+    # Run a method while holding self._lock for writing
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.writing():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class FileLock:
+    """
+    Advisory lock shared by every process that opens the same data file.
+    It locks a "<path>.lock" side file, because saves replace the data
+    file itself. Only writers create that file: until one has, readers
+    have nobody to wait for, as every save replaces files atomically.
+    Windows has no shared byte-range locks, so there shared locks are
+    exclusive too. A thread that already holds the lock may
+    take it again (but not upgrade shared to exclusive); other threads
+    of the same process wait like another process would. discard()
+    removes the side file again, for one-off tools that leave nothing
+    behind.
+    """
+
+    def __init__(self, path):
+        self.path = path.rstrip("/\\") + ".lock"
+        self._held_here = threading.local()
+
+    def shared(self):
+        return self._held(exclusive=False)
+
+    def exclusive(self):
+        return self._held(exclusive=True)
+
+    @contextlib.contextmanager
+    def _held(self, exclusive):
+        mode = getattr(self._held_here, "mode", None)
+        if mode is not None:
+            if exclusive and mode == "shared":
+                raise RuntimeError("cannot upgrade a shared file lock to exclusive")
+            yield
+            return
+
+        if not exclusive and not os.path.exists(self.path):
+            self._held_here.mode = "shared"
+            try:
+                yield
+            finally:
+                self._held_here.mode = None
+            return
+
+        f = self._open_locked(exclusive)
+        self._held_here.mode = "exclusive" if exclusive else "shared"
+        try:
+            yield
+        finally:
+            self._held_here.mode = None
+            try:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                f.close()
+
+    def _open_locked(self, exclusive):
+        # Open and lock the side file, retrying if discard() removed it while we waited
+        while True:
+            f = open(self.path, "a+b")
+            fd = f.fileno()
+            if fcntl is None:
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        return f
+                    except OSError:
+                        # LK_LOCK gives up after about ten seconds; keep waiting
+                        time.sleep(0.1)
+
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                if os.stat(self.path).st_ino == os.fstat(fd).st_ino:
+                    return f
+            except FileNotFoundError:
+                pass
+            f.close()
+
+    def discard(self):
+        # Remove the side file; holders still waiting on it move on to a new one
+        if fcntl is None or not os.path.exists(self.path):
+            # Windows cannot remove a file another process has open
+            return
+        with self.exclusive():
+            os.remove(self.path)
@@ -1,81 +1,684 @@
+import bisect
+import contextlib
+import copy
+import hashlib
 import json
 import os
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
 import numpy as np
+from columnar import COMPLETED, REMINDED, SessionColumns, time_to_minute
+from records import Recurrence, Session, Subject
+import archive
+import ics
+import partitions
+import recurrence
+import snapshot
+from locking import FileLock, RWLock, read_locked, write_locked
+from persistence import ScheduleCache, WriteBehindSaver, replace_atomically
+
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Session count from which analytics switch to the NumPy columnar backend
+COLUMNAR_THRESHOLD = 2000
+
+# Days ahead of today kept in memory when sessions are stored partitioned by month
+ACTIVE_WINDOW_DAYS = 56
+
+# Weekdays missing from a template are open for the whole availability window
+DEFAULT_WEEKLY_AVAILABILITY = {"5": [], "6": []}
+
+# Hours of the day used to relocate conflicting sessions on days without a template
+RESOLVE_DAY_START = "08:00"
+RESOLVE_DAY_END = "22:00"
+
+# How many days past its original date a conflicting session may be moved
+RESOLVE_HORIZON_DAYS = 60
+
+# Days ahead of today kept when importing busy times from an iCalendar file
+ICS_IMPORT_HORIZON_DAYS = 365
+
+# Validation messages shared by the one-value and batch validators
+FUTURE_EXAM_ERROR = "Exam date must be in the future"
+PAST_SESSION_ERROR = "Cannot schedule sessions for past dates. Please select today or a future date."
+UNKNOWN_SUBJECT_ERROR = "Subject not found"
+
+# Generated schedules remembered per planner, keyed by their inputs
+SCHEDULE_CACHE_SIZE = 8
+
+# Records changed by another process that are patched in one by one; more means a full rebuild
+RELOAD_EVENT_LIMIT = 200
+
+# Study-hours model training rows: difficulty, past score, days until exam, hours
+HOURS_TRAINING_DATA = [
+    [1, 90, 30, 8],
+    [1, 70, 20, 10],
+    [1, 45, 15, 13],
+    [2, 85, 25, 12],
+    [2, 60, 20, 15],
+    [2, 40, 10, 14],
+    [3, 90, 40, 15],
+    [3, 75, 30, 20],
+    [3, 50, 20, 26],
+    [3, 30, 15, 28],
+    [4, 85, 35, 25],
+    [4, 70, 25, 28],
+    [4, 45, 20, 35],
+    [5, 90, 45, 28],
+    [5, 70, 30, 35],
+    [5, 40, 20, 42],
+    [1, 75, 30, 10],
+    [2, 75, 25, 15],
+    [3, 75, 30, 20],
+    [4, 75, 35, 28],
+    [5, 75, 40, 35],
+]
+
+# Change events passed to subscribers, with the details each one carries
+SESSION_ADDED = "session_added"          # index, session
+SESSION_UPDATED = "session_updated"      # index, session
+SESSION_REMOVED = "session_removed"      # index, session
+SUBJECT_CHANGED = "subject_changed"      # name, subject
+DATA_RESET = "data_reset"                # anything else; views should rebuild
 
 
 class StudyPlannerLogic:
 
-    def __init__(self, data_file="study_planner_data.json"):
+    def __init__(self, data_file="study_planner_data.json", columnar=None, save_delay=None,
+                 cache_schedules=True):
+        # Readers (statistics, views, background saves) share it; mutations hold it alone
+        self._lock = RWLock()
+
         self.data_file = data_file
         self.subjects = []
         self.study_sessions = []
+        self.weekly_availability = dict(DEFAULT_WEEKLY_AVAILABILITY)
+        self.blackout_dates = []
+        self.archive_rollup = archive.empty_rollup()
+
+        # Repeating sessions, kept as rules and expanded per queried date range
+        self.recurring_sessions = []
+
+        # Busy times imported from other calendars, as per-day blocks
+        self.busy_events = []
+
+        # None picks the columnar backend automatically for large schedules
+        self.columnar = columnar
+        self.data_version = 0
+        self._columns = None
+
+        # Per-day hours per subject, cached as (data_version, rollup)
+        self._daily_hours = None
+
+        # Month-partitioned storage only keeps the months in use in memory
+        self._store = None
+        self._loaded_months = set()
+
+        # Callables notified as listener(event, details) after each change
+        self._listeners = []
+
+        # Word index over session notes and subjects, built on the first search
+        self._search_index = None
+
+        # Readers fill in derived caches (search index, daily hours) under this lock
+        self._cache_lock = threading.Lock()
+
+        # Exam dates to subject names, cached per version of the subject list
+        self._exam_index = None
+
+        # Other processes may use the same data file: saves and loads take an
+        # advisory lock on it, and changes made elsewhere are merged against
+        # what the file held when we last read or wrote it
+        self._file_lock = FileLock(data_file) if data_file is not None else None
+        self._disk_lock = threading.Lock()
+        self._disk_stamp = None
+        self._disk_state = None
+
+        # data_version before a merge done by a background save; listeners hear
+        # about it from the next reload_changes() call, on the caller's thread
+        self._merged_since = None
+
         self.load_data()
 
+        # Recent auto-schedule results, reused while their inputs stay the same;
+        # one-off runs pass cache_schedules=False and keep them in memory only
+        self._schedule_cache = ScheduleCache(
+            data_file.rstrip("/\\") + ".schedules" if data_file is not None and cache_schedules else None,
+            SCHEDULE_CACHE_SIZE,
+        )
+
+        # With a save_delay, saves are coalesced and written on a background thread
+        self._saver = None
+        if save_delay is not None and data_file is not None:
+            self._saver = WriteBehindSaver(self.save_data, save_delay)
+
     # Data persistence
 
+    @write_locked
     def load_data(self):
-
-        if os.path.exists(self.data_file):
+        # A data_file of None keeps the planner purely in memory
+        with self._disk_lock, self._locked_data_file(exclusive=False):
+            self._read_data_file()
+
+    def _locked_data_file(self, exclusive):
+        # Advisory lock on the data file, shared with other processes
+        if self._file_lock is None:
+            return contextlib.nullcontext()
+        if exclusive:
+            return self._file_lock.exclusive()
+        return self._file_lock.shared()
+
+    def _read_data_file(self):
+        # Replace everything in memory with the data file; the caller holds the locks
+        session_columns = None
+        self._store = None
+        self._loaded_months = set()
+        self._disk_stamp = None
+        self._disk_state = None
+        if self.data_file is not None and partitions.is_partitioned_path(self.data_file):
+            self._load_partitioned()
+        elif self.data_file is not None and os.path.exists(self.data_file):
             try:
-                with open(self.data_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.subjects = data.get("subjects", [])
-                self.study_sessions = data.get("study_sessions", [])
+                self._disk_stamp = _file_stamp(self.data_file)
+                if snapshot.is_snapshot_file(self.data_file):
+                    data = snapshot.read_snapshot(self.data_file)
+                    self.subjects = data["subjects"]
+                    self.study_sessions = data["study_sessions"]
+                    session_columns = data["session_columns"]
+                    data = data["settings"]
+                    self._disk_state = _disk_state(
+                        [s.to_dict() for s in self.subjects],
+                        [s.to_dict() for s in self.study_sessions],
+                        data,
+                    )
+                else:
+                    with open(self.data_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    self._disk_state = _disk_state_of_file(data)
+                    self.subjects = [Subject.from_dict(s) for s in data.get("subjects", [])]
+                    self.study_sessions = [
+                        Session.from_dict(s) for s in data.get("study_sessions", [])
+                    ]
+                self._apply_settings(data)
             except Exception:
                 self.subjects = []
                 self.study_sessions = []
         else:
             self.subjects = []
             self.study_sessions = []
+            self.archive_rollup = archive.empty_rollup()
+            self.recurring_sessions = []
+            self.busy_events = []
+        self._mark_changed()
+        self._columns = session_columns
+
+    def _load_partitioned(self):
+        # Read the manifest and only the months around today
+        self._store = partitions.PartitionStore(self.data_file)
+        self._disk_stamp = _file_stamp(self._stamp_path())
+        manifest = self._store.read_manifest()
+        self.subjects = [Subject.from_dict(s) for s in manifest["subjects"]]
+        self._apply_settings(manifest["settings"])
+
+        # The merge base covers the manifest and grows with each month loaded
+        self._disk_state = _disk_state(manifest["subjects"], [], manifest["settings"])
+
+        self.study_sessions = []
+        today = datetime.now().date()
+        self._load_months(
+            self._store.months_in_range(today, today + timedelta(days=ACTIVE_WINDOW_DAYS))
+        )
+
+    def _load_months(self, month_keys):
+        # Append stored months that are not in memory yet
+        loaded_any = False
+        for key in month_keys:
+            if key in self._loaded_months:
+                continue
+            with self._locked_data_file(exclusive=False):
+                month_sessions = self._store.load_month(key)
+            self.study_sessions.extend(month_sessions)
+            if self._disk_state is not None:
+                self._disk_state["sessions"].update(_record_key(s.to_dict()) for s in month_sessions)
+            self._loaded_months.add(key)
+            loaded_any = True
+        if loaded_any:
+            self._mark_changed()
+
+    @write_locked
+    def load_range(self, start_date, end_date):
+        # Make sure sessions between two YYYY-MM-DD dates are in memory
+        if self._store is None:
+            return
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        self._load_months(self._store.months_in_range(start, end))
+
+    def _load_for_range(self, date_range):
+        # Load the months an optional (start, end) pair of dates covers, all of them for None
+        start_date, end_date = date_range or (None, None)
+        if start_date is None and end_date is None:
+            self.load_all()
+        else:
+            self.load_range(start_date or "0001-01-01", end_date or "9999-12-31")
+        return start_date, end_date
+
+    def active_window(self):
+        """
+        The (start, end) dates views should show by default: the months
+        loaded at startup for a partitioned store, or None when the whole
+        schedule is in memory anyway.
+        """
+        if self._store is None:
+            return None
+        today = datetime.now().date()
+        return (
+            today.replace(day=1).strftime("%Y-%m-%d"),
+            (today + timedelta(days=ACTIVE_WINDOW_DAYS)).strftime("%Y-%m-%d"),
+        )
+
+    def load_all(self):
+        # Bring every stored month into memory (needed before whole-schedule edits and totals)
+        if self._store is None or self._loaded_months.issuperset(self._store.months()):
+            return
+        with self._lock.writing():
+            if self._store is not None:
+                self._load_months(self._store.months())
 
     def save_data(self):
-        # Save subjects and sessions to a JSON file
-        data = {
-            "subjects": self.subjects,
-            "study_sessions": self.study_sessions,
-        }
+        # Save subjects and sessions to the data file
+        if self.data_file is None:
+            return True
         try:
-            with open(self.data_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            self.write_data_file(self.data_file)
             return True
         except Exception as e:
             return False, str(e)
 
+    def _get_settings(self):
+        # Settings and rollups stored alongside subjects and sessions
+        return {
+            "weekly_availability": self.weekly_availability,
+            "blackout_dates": self.blackout_dates,
+            "archive_rollup": self.archive_rollup,
+            "recurring_sessions": [r.to_dict() for r in self.recurring_sessions],
+            "busy_events": self.busy_events,
+        }
+
+    def _apply_settings(self, settings):
+        # Restore settings and rollups read from a data file
+        self.weekly_availability = settings.get(
+            "weekly_availability", dict(DEFAULT_WEEKLY_AVAILABILITY)
+        )
+        self.blackout_dates = settings.get("blackout_dates", [])
+        self.archive_rollup = settings.get("archive_rollup", archive.empty_rollup())
+        self.recurring_sessions = [
+            Recurrence.from_dict(r) for r in settings.get("recurring_sessions", [])
+        ]
+        self.busy_events = settings.get("busy_events", [])
+
+    def flush(self):
+        # Write any pending background save now
+        if self._saver is None:
+            return True
+        return self._saver.flush()
+
+    def close(self):
+        # Flush pending changes and stop the background saver
+        if self._saver is None:
+            return True
+        saver, self._saver = self._saver, None
+        return saver.close()
+
+    @read_locked
+    def _capture_state(self):
+        # Shallow copies so a save can run while the schedule keeps changing
+        return (
+            list(self.subjects),
+            list(self.study_sessions),
+            copy.deepcopy(self._get_settings()),
+        )
+
+    def write_data_file(self, path):
+        # Write to path as a partitioned directory, a .snap snapshot or JSON
+        if path != self.data_file:
+            self.load_all()
+            self._write_state(path, *self._capture_state())
+            return
+
+        with self._lock.reading():
+            state = self._capture_state()
+            loaded_months = set(self._loaded_months)
+            base_stamp = self._disk_stamp
+
+        with self._disk_lock, self._locked_data_file(exclusive=True):
+            # Unchanged on disk since we last read or wrote it (and no reload since the capture)
+            if self._disk_stamp == base_stamp and _file_stamp(self._stamp_path()) == base_stamp:
+                self._write_own_file(state, loaded_months)
+                return
+
+        # Another process saved in between: merge its changes, then write the result.
+        # This may be the saver thread, so listeners are only told by reload_changes()
+        with self._lock.writing():
+            with self._disk_lock, self._locked_data_file(exclusive=True):
+                events = self._merge_from_disk()
+                self._write_own_file(self._capture_state(), set(self._loaded_months))
+            if events:
+                if self._merged_since is None:
+                    self._merged_since = self.data_version
+                self._mark_changed()
+
+    def _write_own_file(self, state, loaded_months):
+        # Write the data file and remember what it now holds; the caller holds the locks
+        subjects, sessions, settings = state
+        subject_rows = [s.to_dict() for s in subjects]
+        session_rows = [s.to_dict() for s in sessions]
+        if self._store is not None:
+            # Only the months in memory are rewritten, so they are all the base needs
+            self._store.write(subjects, settings, sessions, loaded_months)
+        elif snapshot.is_snapshot_path(self.data_file):
+            self._write_state(self.data_file, subjects, sessions, settings)
+        else:
+            replace_atomically(
+                self.data_file,
+                lambda temp: _write_json(temp, subject_rows, session_rows, settings),
+            )
+        self._disk_state = _disk_state(subject_rows, session_rows, settings)
+        self._disk_stamp = _file_stamp(self._stamp_path())
+
+    def _stamp_path(self):
+        # The file whose stamp changes with every save; a partitioned store writes its manifest last
+        if self._store is not None:
+            return os.path.join(self.data_file, partitions.MANIFEST_FILE)
+        return self.data_file
+
+    def _write_state(self, path, subjects, sessions, settings):
+        # Write captured state to path in the format its name asks for
+        if partitions.is_partitioned_path(path):
+            partitions.PartitionStore(path).write(
+                subjects,
+                settings,
+                sessions,
+                {partitions.month_key(s["date"]) for s in sessions},
+            )
+        elif snapshot.is_snapshot_path(path):
+            replace_atomically(
+                path, lambda temp: snapshot.write_snapshot(temp, subjects, sessions, settings)
+            )
+        else:
+            subject_rows = [s.to_dict() for s in subjects]
+            session_rows = [s.to_dict() for s in sessions]
+            replace_atomically(
+                path, lambda temp: _write_json(temp, subject_rows, session_rows, settings)
+            )
+
+    def export_json(self, path):
+        # Export everything as a pretty-printed JSON data file
+        self.load_all()
+        subjects, sessions, settings = self._capture_state()
+        subject_rows = [s.to_dict() for s in subjects]
+        session_rows = [s.to_dict() for s in sessions]
+        replace_atomically(
+            path, lambda temp: _write_json(temp, subject_rows, session_rows, settings)
+        )
+
+    # Changes made by other processes
+
+    def disk_changed(self):
+        # Whether someone else saved the data file since we last read or wrote it
+        if self.data_file is None:
+            return False
+        return _file_stamp(self._stamp_path()) != self._disk_stamp
+
+    def reload_changes(self):
+        """
+        Merge in what another process saved to the data file. Records it
+        added, changed or removed are patched in one by one with the usual
+        change events; unsaved changes made here are kept. Changes a
+        background save merged in are announced here too, as a DATA_RESET,
+        so call this from the thread that owns the listeners. Returns
+        whether anything was reloaded.
+        """
+        if self._merged_since is None and not self.disk_changed():
+            return False
+        with self._lock.writing():
+            merged_since, self._merged_since = self._merged_since, None
+            if merged_since is not None:
+                self._emit(DATA_RESET, previous_version=merged_since)
+            if not self.disk_changed():
+                return merged_since is not None
+            try:
+                with self._disk_lock, self._locked_data_file(exclusive=False):
+                    events = self._merge_from_disk()
+            except (OSError, ValueError):
+                # Half-written by a program that does not replace files atomically; retry later
+                return merged_since is not None
+            for event, details in events:
+                self._emit_change(event, details)
+        return merged_since is not None or bool(events)
+
+    def _merge_from_disk(self):
+        """
+        Three-way merge of the data file into memory, using what the file
+        held at our last read or write as the common base. Returns the
+        change events to emit once the locks are released.
+        """
+        stamp = _file_stamp(self._stamp_path())
+        if stamp is None or stamp == self._disk_stamp:
+            return []
+
+        if self._store is not None:
+            unloaded = self._unloaded_partitions()
+        data = self._read_disk_rows()
+        # A file that was missing or unreadable when we loaded counts as empty
+        base = self._disk_state or _disk_state([], [], {})
+        theirs = _disk_state_of_file(data)
+        events = []
+
+        # Subjects they added, changed or deleted
+        for name in base["subjects"].keys() | theirs["subjects"].keys():
+            if base["subjects"].get(name) == theirs["subjects"].get(name):
+                continue
+            subject = None
+            current = self.get_subject_by_name(name)
+            if name in theirs["subjects"]:
+                row = next(s for s in data["subjects"] if s["name"] == name)
+                subject = Subject.from_dict(row)
+                if current is not None:
+                    self.subjects[self.subjects.index(current)] = subject
+                else:
+                    self.subjects.append(subject)
+            elif current is not None:
+                self.subjects.remove(current)
+            events.append((SUBJECT_CHANGED, {"name": name, "subject": subject}))
+
+        # Sessions are matched by content; an edit shows up as one removed and one added
+        removed = base["sessions"] - theirs["sessions"]
+        added = theirs["sessions"] - base["sessions"]
+        if removed or added:
+            # A change we made as well (both completed the same session, say) only counts once
+            ours = Counter(
+                key for key in (_record_key(s.to_dict()) for s in self.study_sessions)
+                if key in removed or key in added
+            )
+            for key in removed:
+                removed[key] -= max(0, base["sessions"][key] - ours[key])
+            for key in added:
+                added[key] -= max(0, ours[key] - base["sessions"][key])
+        if removed:
+            for idx in range(len(self.study_sessions) - 1, -1, -1):
+                key = _record_key(self.study_sessions[idx].to_dict())
+                if removed[key] > 0:
+                    removed[key] -= 1
+                    session = self.study_sessions.pop(idx)
+                    events.append((SESSION_REMOVED, {"index": idx, "session": session}))
+        if added:
+            for row in data.get("study_sessions", []):
+                key = _record_key(row)
+                if added[key] > 0:
+                    added[key] -= 1
+                    session = Session.from_dict(row)
+                    self.study_sessions.append(session)
+                    events.append((
+                        SESSION_ADDED,
+                        {"index": len(self.study_sessions) - 1, "session": session},
+                    ))
+
+        settings_changed = base["settings"] != theirs["settings"]
+        if settings_changed:
+            self._apply_settings(data)
+
+        # Months we never loaded only show up in totals
+        if self._store is not None and self._unloaded_partitions() != unloaded:
+            settings_changed = True
+
+        self._disk_stamp = stamp
+        self._disk_state = theirs
+        if settings_changed or len(events) > RELOAD_EVENT_LIMIT:
+            return [(DATA_RESET, {})]
+        return events
+
+    def _unloaded_partitions(self):
+        # Manifest entries (counts and rollups) of the months not in memory
+        return {
+            key: partition
+            for key, partition in self._store.manifest["partitions"].items()
+            if key not in self._loaded_months
+        }
+
+    def _read_disk_rows(self):
+        # The data file as JSON-style rows, whatever its format; only loaded months of a partitioned store
+        if self._store is not None:
+            manifest = self._store.read_manifest()
+            session_rows = []
+            for key in sorted(self._loaded_months):
+                session_rows.extend(s.to_dict() for s in self._store.load_month(key))
+            return {"subjects": manifest["subjects"], "study_sessions": session_rows, **manifest["settings"]}
+        if snapshot.is_snapshot_file(self.data_file):
+            data = snapshot.read_snapshot(self.data_file)
+            return {
+                "subjects": [s.to_dict() for s in data["subjects"]],
+                "study_sessions": [s.to_dict() for s in data["study_sessions"]],
+                **data["settings"],
+            }
+        with open(self.data_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def export_snapshot(self, path):
+        # Export everything as a binary snapshot
+        self.load_all()
+        subjects, sessions, settings = self._capture_state()
+        replace_atomically(
+            path, lambda temp: snapshot.write_snapshot(temp, subjects, sessions, settings)
+        )
+
+    def _mark_changed(self, flag_row=None):
+        # Bump the data version and drop caches derived from the data
+        self.data_version += 1
+
+        # A flag change on one row is patched in place instead of rebuilding columns
+        if flag_row is not None and self._columns is not None:
+            self._columns.set_flag(*flag_row)
+        else:
+            self._columns = None
+
+    def _commit(self, flag_row=None, event=DATA_RESET, **details):
+        # Record a mutation, notify subscribers and persist it
+        if self._store is not None:
+            # Months that gained sessions must be merged with what is on disk first
+            version = self.data_version
+            self._load_months(
+                {partitions.month_key(s["date"]) for s in self.study_sessions}
+                - self._loaded_months
+            )
+            if self.data_version != version:
+                event, details = DATA_RESET, {}
+
+        self._emit_change(event, details, flag_row)
+
+        if self._saver is not None:
+            self._saver.mark_dirty()
+            return True
+        return self.save_data()
+
+    # Change events
+
+    def subscribe(self, listener):
+        # Call listener(event, details) after every committed change
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit_change(self, event, details, flag_row=None):
+        # Bump the data version and tell subscribers what changed
+        previous_version = self.data_version
+        self._mark_changed(flag_row)
+        self._emit(event, previous_version=previous_version, **details)
+
+    def _emit(self, event, **details):
+        # details always has previous_version, the data_version before the change.
+        # Listeners run once the write lock is released, so they never hold up readers
+        self._lock.after_write(lambda: self._notify(event, details))
+
+    def _notify(self, event, details):
+        for listener in list(self._listeners):
+            listener(event, details)
+
+    def _use_columnar(self):
+        # Whether analytics should run on the NumPy columnar backend
+        if self.columnar is None:
+            return len(self.study_sessions) >= COLUMNAR_THRESHOLD
+        return self.columnar
+
+    def get_columns(self):
+        # Columnar view of the sessions, rebuilt only after the data changes
+        columns = self._columns
+        if columns is None or columns.size != len(self.study_sessions):
+            columns = SessionColumns(self.study_sessions)
+            self._columns = columns
+        return columns
+
     # Subject operations
 
+    @write_locked
     def add_subject(self, name, exam_date, difficulty, past_score, daily_study_hours=3):
         # Add a new subject
         recommended_hours = self.predict_study_hours(difficulty, past_score, exam_date)
 
-        subject = {
-            "name": name,
-            "exam_date": exam_date,
-            "difficulty": difficulty,
-            "past_score": past_score,
-            "recommended_hours": recommended_hours,
-            "hours_completed": 0,
-            "daily_study_hours": daily_study_hours,
-        }
+        subject = Subject(
+            name=name,
+            exam_date=exam_date,
+            difficulty=difficulty,
+            past_score=past_score,
+            recommended_hours=recommended_hours,
+            hours_completed=0,
+            daily_study_hours=daily_study_hours,
+        )
 
         self.subjects.append(subject)
-        self.save_data()
+        self._commit(event=SUBJECT_CHANGED, name=name, subject=subject)
         return recommended_hours
 
+    @write_locked
     def delete_subject(self, idx):
         # Delete a subject and its associated sessions
         if 0 <= idx < len(self.subjects):
+            self.load_all()
             subject_name = self.subjects[idx]["name"]
             del self.subjects[idx]
             self.study_sessions = [
                 s for s in self.study_sessions if s["subject"] != subject_name
             ]
-            self.save_data()
+            archive.remove_subject_from_rollup(self.archive_rollup, subject_name)
+            self._commit()
             return True
         return False
 
+    @read_locked
     def get_subject_by_name(self, name):
         # Get subject by name
         for subject in self.subjects:
@@ -83,34 +686,45 @@ class StudyPlannerLogic:
                 return subject
         return None
 
+    @read_locked
     def get_subject_names(self):
         # Get list of all subject names
         return [s["name"] for s in self.subjects]
 
     # Session operations
 
+    @write_locked
     def add_session(self, subject, date, start_time, end_time, notes=""):
         # Add a new study session
-        session = {
-            "subject": subject,
-            "date": date,
-            "start_time": start_time,
-            "end_time": end_time,
-            "notes": notes,
-            "completed": False,
-        }
+        session = Session(
+            subject=subject,
+            date=date,
+            start_time=start_time,
+            end_time=end_time,
+            notes=notes,
+            completed=False,
+        )
         self.study_sessions.append(session)
-        self.save_data()
+        self._commit(
+            event=SESSION_ADDED, index=len(self.study_sessions) - 1, session=session
+        )
         return True
 
+    @write_locked
     def delete_session(self, idx):
         # Delete a study session
         if 0 <= idx < len(self.study_sessions):
-            del self.study_sessions[idx]
-            self.save_data()
+            session = self.study_sessions.pop(idx)
+            self._commit(event=SESSION_REMOVED, index=idx, session=session)
             return True
         return False
 
+    @write_locked
+    def remove_session(self, session):
+        # Delete a session record, finding its index under the same lock
+        return self.delete_session(self.get_session_index(session))
+
+    @write_locked
     def complete_session(self, idx):
         # Mark a session as completed and update subject hours
         if 0 <= idx < len(self.study_sessions):
@@ -127,27 +741,253 @@ class StudyPlannerLogic:
                     subject["hours_completed"] += hours
                     break
 
-            self.save_data()
+            self._commit(
+                flag_row=(idx, COMPLETED), event=SESSION_UPDATED, index=idx, session=session
+            )
             return hours, session["subject"]
         return 0, None
 
-    def get_sessions_by_date(self):
-        # Group sessions by date
-        sessions_by_date = {}
-        for session in self.study_sessions:
-            date = session["date"]
-            if date not in sessions_by_date:
-                sessions_by_date[date] = []
-            sessions_by_date[date].append(session)
-        return dict(sorted(sessions_by_date.items()))
+    def get_sessions_by_date(self, include_archive=False, include_recurring=True, date_range=None):
+        """
+        Sessions grouped by date, in date order. date_range is an optional
+        (start, end) pair of YYYY-MM-DD dates, either of which may be None;
+        only the stored months it covers are loaded.
+        """
+        start_date, end_date = self._load_for_range(date_range)
+        with self._lock.reading():
+            sessions = self.study_sessions
+            if start_date is not None or end_date is not None:
+                sessions = [s for s in sessions if _date_in_range(s["date"], start_date, end_date)]
+            if include_archive:
+                sessions = list(self.iter_archived_sessions(start_date, end_date)) + sessions
+            if include_recurring and self.recurring_sessions:
+                sessions = list(sessions) + list(self.iter_occurrences(start_date, end_date))
+
+            sessions_by_date = {}
+            for session in sessions:
+                date = session["date"]
+                if date not in sessions_by_date:
+                    sessions_by_date[date] = []
+                sessions_by_date[date].append(session)
+            return dict(sorted(sessions_by_date.items()))
+
+    def search(self, query, date_range=None, limit=None):
+        """
+        Sessions whose notes or subject contain every word of query (the
+        last word may be unfinished), ordered by date and start time.
+        date_range is an optional (start, end) pair of YYYY-MM-DD dates,
+        either of which may be None.
+        """
+        start_date, end_date = self._load_for_range(date_range)
+
+        with self._lock.reading():
+            if self._search_index is None:
+                with self._cache_lock:
+                    if self._search_index is None:
+                        from search import SearchIndex
 
+                        self._search_index = SearchIndex(self)
+            return self._search_index.search(query, start_date, end_date, limit)
+
+    @read_locked
     def get_session_index(self, session):
-        # Get the index of a session
+        # Get the index of a session, preferring the very same record over an equal one
+        for idx, candidate in enumerate(self.study_sessions):
+            if candidate is session:
+                return idx
         try:
             return self.study_sessions.index(session)
         except ValueError:
             return -1
 
+    # Recurring sessions
+
+    @write_locked
+    def add_recurring_session(self, subject, start_date, end_date, start_time, end_time,
+                              frequency=recurrence.WEEKLY, weekdays=None, interval=1, notes=""):
+        # Store a repeating session as one rule instead of one session per occurrence
+        if frequency not in recurrence.FREQUENCIES:
+            return False, f"Frequency must be one of: {', '.join(recurrence.FREQUENCIES)}"
+        if end_date < start_date:
+            return False, "The repeat end date must not be before the start date"
+        if interval < 1:
+            return False, "The repeat interval must be at least 1"
+
+        rule = Recurrence(
+            subject=subject,
+            start_date=start_date,
+            end_date=end_date,
+            frequency=frequency,
+            interval=interval,
+            weekdays=sorted(set(weekdays)) if weekdays else [],
+            start_time=start_time,
+            end_time=end_time,
+            notes=notes,
+            exceptions=[],
+        )
+        self.recurring_sessions.append(rule)
+        self._commit()
+        return True, None
+
+    @write_locked
+    def delete_recurring_session(self, idx):
+        # Delete a rule and all of its future occurrences
+        if 0 <= idx < len(self.recurring_sessions):
+            del self.recurring_sessions[idx]
+            self._commit()
+            return True
+        return False
+
+    @write_locked
+    def skip_occurrence(self, idx, date_str):
+        # Drop one occurrence of a rule, e.g. a cancelled tutorial
+        if 0 <= idx < len(self.recurring_sessions):
+            rule = self.recurring_sessions[idx]
+            if date_str not in rule["exceptions"]:
+                rule["exceptions"] = rule["exceptions"] + [date_str]
+            self._commit()
+            return True
+        return False
+
+    @write_locked
+    def complete_occurrence(self, idx, date_str):
+        # Turn one occurrence into a concrete completed session and credit its hours
+        if not 0 <= idx < len(self.recurring_sessions):
+            return 0, None
+        rule = self.recurring_sessions[idx]
+        if date_str in rule["exceptions"]:
+            return 0, None
+
+        rule["exceptions"] = rule["exceptions"] + [date_str]
+        session = Session(
+            subject=rule["subject"],
+            date=date_str,
+            start_time=rule["start_time"],
+            end_time=rule["end_time"],
+            notes=rule.get("notes", ""),
+            completed=True,
+        )
+        self.study_sessions.append(session)
+
+        hours = archive.session_hours(session)
+        subject = self.get_subject_by_name(rule["subject"])
+        if subject is not None:
+            subject["hours_completed"] += hours
+
+        self._commit()
+        return hours, rule["subject"]
+
+    def iter_occurrences(self, start_date=None, end_date=None):
+        # Sessions generated by all rules, only for the requested date range
+        for idx, rule in enumerate(self.recurring_sessions):
+            yield from recurrence.expand(rule, idx, start_date, end_date)
+
+    def _fixed_by_date(self, start_date=None, end_date=None):
+        # Time the planner cannot move, grouped by date: occurrences and imported busy blocks
+        by_date = {}
+        for occurrence in self.iter_occurrences(start_date, end_date):
+            by_date.setdefault(occurrence["date"], []).append(occurrence)
+        for block in self.busy_events:
+            if (start_date is None or block["date"] >= start_date) and (
+                    end_date is None or block["date"] <= end_date
+            ):
+                by_date.setdefault(block["date"], []).append(block)
+        return by_date
+
+    # Calendar sync
+
+    def export_ics(self, path):
+        # Stream sessions, exam days and recurring rules to an iCalendar file
+        self.load_all()
+        try:
+            with self._lock.reading():
+                count = ics.write_calendar(
+                    path, self.study_sessions, self.subjects, self.recurring_sessions
+                )
+            return True, count
+        except Exception as e:
+            return False, str(e)
+
+    def import_ics(self, path):
+        """
+        Replace the imported busy times with the events of an iCalendar
+        file. Events are streamed; only blocks from today up to
+        ICS_IMPORT_HORIZON_DAYS ahead are kept, and free (transparent)
+        or cancelled events are skipped.
+        """
+        today = datetime.now().date()
+        until = today + timedelta(days=ICS_IMPORT_HORIZON_DAYS)
+        first, last = today.isoformat(), until.isoformat()
+
+        blocks = []
+        try:
+            for event in ics.iter_events(path):
+                if event["transparent"] or event["status"] == "CANCELLED":
+                    continue
+                for occurrence in ics.expand_event(event, until):
+                    for block in ics.busy_blocks(occurrence):
+                        if first <= block["date"] <= last:
+                            blocks.append(block)
+        except (OSError, ValueError) as e:
+            return False, f"Could not read calendar: {e}"
+
+        blocks.sort(key=lambda b: (b["date"], b["start_time"]))
+        with self._lock.writing():
+            self.busy_events = blocks
+            self._commit()
+        return True, len(blocks)
+
+    @write_locked
+    def clear_busy_events(self):
+        self.busy_events = []
+        self._commit()
+
+    # Archive
+
+    def get_archive_path(self):
+        # Location of the compressed cold store for archived sessions
+        if self.data_file is None:
+            return None
+        if self._store is not None:
+            return os.path.join(self.data_file, archive.PARTITIONED_ARCHIVE_FILE)
+        return self.data_file + archive.ARCHIVE_SUFFIX
+
+    @write_locked
+    def archive_completed(self, before=None):
+        # Move completed sessions dated before `before` (default today) to the archive
+        path = self.get_archive_path()
+        if path is None:
+            return False, "Archiving needs a data file"
+
+        before = before or datetime.now().strftime("%Y-%m-%d")
+        self.load_all()
+
+        to_archive = []
+        live = []
+        for session in self.study_sessions:
+            if session.get("completed", False) and session["date"] < before:
+                to_archive.append(session)
+            else:
+                live.append(session)
+
+        if not to_archive:
+            return True, 0
+
+        # Write the cold copy first so a failed save never loses sessions; its rows only
+        # count once the data file lists the run, so a retry after a failed save adds no duplicates
+        batch = archive.new_batch()
+        archive.append_sessions(path, to_archive, batch)
+        archive.add_to_rollup(self.archive_rollup, to_archive, batch)
+        self.study_sessions = live
+        self._commit()
+        return True, len(to_archive)
+
+    def iter_archived_sessions(self, start_date=None, end_date=None, subject=None):
+        # Stream archived sessions on demand, filtered by date range and subject
+        path = self.get_archive_path()
+        for data in archive.iter_sessions(path, self.archive_rollup, start_date, end_date, subject):
+            yield Session.from_dict(data)
+
     # Validation methods
 
     def validate_date_format(self, date_str):
@@ -167,14 +1007,14 @@ class StudyPlannerLogic:
         # Check if date is in the future
         today = datetime.now()
         if date_obj.date() <= today.date():
-            return False, "Exam date must be in the future"
+            return False, FUTURE_EXAM_ERROR
         return True, None
 
     def validate_date_not_past(self, date_obj):
         # Check if date is not in the past
         today = datetime.now().date()
         if date_obj.date() < today:
-            return False, "Cannot schedule sessions for past dates. Please select today or a future date."
+            return False, PAST_SESSION_ERROR
         return True, None
 
     def validate_difficulty(self, difficulty_str):
@@ -221,29 +1061,146 @@ class StudyPlannerLogic:
         except ValueError:
             return False, "Daily study hours must be a number", None
 
+    @read_locked
     def validate_session_duration(self, subject_name, session_hours):
         # Validate if session duration is within daily limit
         subject = self.get_subject_by_name(subject_name)
         if subject:
             daily_hours = subject.get("daily_study_hours", 10)
             if session_hours > daily_hours:
-                return False, f"Session duration ({session_hours:.1f}h) exceeds daily study hours ({daily_hours}h) for {subject_name}.\n\nPlease schedule a session of {daily_hours}h or less."
+                return False, _duration_error(session_hours, daily_hours, subject_name)
             return True, None
-        return False, "Subject not found"
+        return False, UNKNOWN_SUBJECT_ERROR
 
+    @read_locked
     def check_exam_date_conflict(self, date_obj):
         # Check if the date conflicts with any exam dates
-        exam_subjects_on_date = []
-        for subj in self.subjects:
-            exam_date_obj = datetime.strptime(subj["exam_date"], "%Y-%m-%d").date()
-            if date_obj.date() == exam_date_obj:
-                exam_subjects_on_date.append(subj["name"])
-
+        date_str = date_obj.strftime("%Y-%m-%d")
+        exam_subjects_on_date = self._exam_dates().get(date_str)
         if exam_subjects_on_date:
-            exam_list = ", ".join(exam_subjects_on_date)
-            return False, f"Cannot schedule study sessions on {date_obj.strftime('%Y-%m-%d')}.\n\nExam(s) scheduled on this date: {exam_list}\n\nPlease choose a different date for studying."
+            return False, _exam_conflict_error(date_str, exam_subjects_on_date)
         return True, None
 
+    def _exam_dates(self):
+        # {exam date: [subject names]}, parsed once per version of the subject list
+        key = (self.data_version, id(self.subjects), len(self.subjects))
+        if self._exam_index is None or self._exam_index[0] != key:
+            by_date = {}
+            for subj in self.subjects:
+                try:
+                    exam_date = datetime.strptime(subj["exam_date"], "%Y-%m-%d").date()
+                except ValueError:
+                    continue
+                by_date.setdefault(exam_date.isoformat(), []).append(subj["name"])
+            self._exam_index = (key, by_date)
+        return self._exam_index[1]
+
+    # Batch validation
+
+    @read_locked
+    def validate_sessions(self, rows):
+        """
+        Validate many candidate sessions at once, e.g. before an import.
+        rows are dicts with subject, date, start_time and end_time. Returns
+        one list of error messages per row, empty when the row is valid.
+        All rows are checked against one "today", and each distinct date
+        or time pair is parsed only once.
+        """
+        today = datetime.now().date()
+        exams = self._exam_dates()
+        subjects = {s["name"]: s for s in self.subjects}
+        date_errors = {}
+        durations = {}
+
+        results = []
+        for row in rows:
+            errors = []
+            name = row.get("subject")
+            subject = subjects.get(name)
+            if subject is None:
+                errors.append(UNKNOWN_SUBJECT_ERROR)
+
+            date_str = _text(row.get("date"))
+            found = date_errors.get(date_str)
+            if found is None:
+                found = date_errors[date_str] = self._session_date_errors(date_str, today, exams)
+            errors.extend(found)
+
+            times = (_text(row.get("start_time")), _text(row.get("end_time")))
+            hours = durations.get(times)
+            if hours is None:
+                is_valid, error, start, end = self.validate_time_format(*times)
+                hours = durations[times] = (end - start).seconds / 3600 if is_valid else error
+            if isinstance(hours, str):
+                errors.append(hours)
+            elif subject is not None:
+                daily_hours = subject.get("daily_study_hours", 10)
+                if hours > daily_hours:
+                    errors.append(_duration_error(hours, daily_hours, name))
+
+            results.append(errors)
+        return results
+
+    def _session_date_errors(self, date_str, today, exams):
+        is_valid, date_obj = self.validate_date_format(date_str)
+        if not is_valid:
+            return [date_obj]
+        if date_obj.date() < today:
+            return [PAST_SESSION_ERROR]
+        if date_str in exams:
+            return [_exam_conflict_error(date_str, exams[date_str])]
+        return []
+
+    @read_locked
+    def validate_subjects(self, rows):
+        """
+        Validate many candidate subjects at once. rows are dicts with
+        name, exam_date, difficulty, past_score and daily_study_hours.
+        Returns one list of error messages per row, empty when the row
+        is valid. Names must be new and unique within the batch.
+        """
+        today = datetime.now().date()
+        taken = set(self.get_subject_names())
+        fields = (
+            ("difficulty", self.validate_difficulty),
+            ("past_score", self.validate_past_score),
+            ("daily_study_hours", self.validate_daily_study_hours),
+        )
+        field_errors = {}
+        date_errors = {}
+
+        results = []
+        for row in rows:
+            errors = []
+            name = _text(row.get("name"))
+            if not name:
+                errors.append("Subject name is required")
+            elif name in taken:
+                errors.append(f"Subject '{name}' already exists")
+            taken.add(name)
+
+            for field, validate in fields:
+                key = (field, _text(row.get(field)))
+                if key not in field_errors:
+                    field_errors[key] = validate(key[1])[1]
+                if field_errors[key] is not None:
+                    errors.append(field_errors[key])
+
+            date_str = _text(row.get("exam_date"))
+            if date_str not in date_errors:
+                is_valid, date_obj = self.validate_date_format(date_str)
+                if not is_valid:
+                    date_errors[date_str] = date_obj
+                elif date_obj.date() <= today:
+                    date_errors[date_str] = FUTURE_EXAM_ERROR
+                else:
+                    date_errors[date_str] = None
+            if date_errors[date_str] is not None:
+                errors.append(date_errors[date_str])
+
+            results.append(errors)
+        return results
+
     def validate_auto_schedule_params(self, start_time, end_time, duration_str, break_str):
         # Validate auto-schedule parameters
         # Validate times
@@ -270,39 +1227,7 @@ class StudyPlannerLogic:
         """
         days_until = self.get_days_until_exam(exam_date)
 
-        # Training data
-        training_data = [
-            [1, 90, 30, 8],
-            [1, 70, 20, 10],
-            [1, 45, 15, 13],
-            [2, 85, 25, 12],
-            [2, 60, 20, 15],
-            [2, 40, 10, 14],
-            [3, 90, 40, 15],
-            [3, 75, 30, 20],
-            [3, 50, 20, 26],
-            [3, 30, 15, 28],
-            [4, 85, 35, 25],
-            [4, 70, 25, 28],
-            [4, 45, 20, 35],
-            [5, 90, 45, 28],
-            [5, 70, 30, 35],
-            [5, 40, 20, 42],
-            [1, 75, 30, 10],
-            [2, 75, 25, 15],
-            [3, 75, 30, 20],
-            [4, 75, 35, 28],
-            [5, 75, 40, 35],
-        ]
-
-        X_train = np.array([[row[0], row[1], row[2]] for row in training_data])
-        y_train = np.array([row[3] for row in training_data])
-
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-
-        model = LinearRegression()
-        model.fit(X_train_scaled, y_train)
+        scaler, model = _get_hours_model()
 
         X_new = np.array([[difficulty, past_score, days_until]])
         X_new_scaled = scaler.transform(X_new)
@@ -312,15 +1237,112 @@ class StudyPlannerLogic:
 
         return round(predicted_hours)
 
+    def prepare_predictions(self):
+        # Load scikit-learn and fit the study-hours model ahead of the first prediction
+        _get_hours_model()
+
     # Conflict detection
 
-    def detect_conflicts(self):
-        # Rule-based conflict detection
+    def detect_conflicts(self, date_range=None):
+        """
+        Rule-based conflict detection. date_range is an optional (start,
+        end) pair of YYYY-MM-DD dates, either of which may be None; only
+        conflicts on those dates are reported and only the stored months
+        the range covers are loaded.
+        """
+        start_date, end_date = self._load_for_range(date_range)
+        with self._lock.reading():
+            if self._use_columnar():
+                conflicts = [
+                    {
+                        "type": "overlap",
+                        "session1": int(i),
+                        "session2": int(j),
+                        "date": self.study_sessions[i]["date"],
+                    }
+                    for i, j in self.get_columns().overlapping_pairs()
+                ]
+                if start_date is not None or end_date is not None:
+                    conflicts = [
+                        c for c in conflicts if _date_in_range(c["date"], start_date, end_date)
+                    ]
+            else:
+                conflicts = self._detect_overlaps(start_date, end_date)
+
+            # Check for multiple exams on same date
+            exam_dates = {}
+            for subject in self.subjects:
+                exam_date = subject["exam_date"]
+                if exam_date not in exam_dates:
+                    exam_dates[exam_date] = []
+                exam_dates[exam_date].append(subject["name"])
+
+            for date, subjects in exam_dates.items():
+                if len(subjects) > 1 and _date_in_range(date, start_date, end_date):
+                    conflicts.append({
+                        "type": "multiple_exams",
+                        "date": date,
+                        "subjects": subjects,
+                    })
+
+            if self.recurring_sessions or self.busy_events:
+                conflicts.extend(self._detect_fixed_overlaps(start_date, end_date))
+
+            return conflicts
+
+    def _detect_fixed_overlaps(self, start_date=None, end_date=None):
+        # Occurrences and busy blocks overlapping a session or each other on the same day
+        fixed = self._fixed_by_date(start_date, end_date)
+        sessions_by_date = {}
+        for idx, session in enumerate(self.study_sessions):
+            if session["date"] in fixed:
+                sessions_by_date.setdefault(session["date"], []).append((idx, session))
+
         conflicts = []
+        for date, day_fixed in sorted(fixed.items()):
+            others = [(None, item) for item in day_fixed] + sessions_by_date.get(date, [])
+            for i, item in enumerate(day_fixed):
+                start = time_to_minute(item["start_time"])
+                end = time_to_minute(item["end_time"])
+                # Pair each fixed item with the later ones and with every concrete session
+                for idx, other in others[i + 1:]:
+                    other_start = time_to_minute(other["start_time"])
+                    other_end = time_to_minute(other["end_time"])
+                    if not (start < other_end and end > other_start):
+                        continue
+
+                    # Busy blocks are only checked against the planner's own sessions
+                    item_busy = "summary" in item
+                    other_busy = "summary" in other
+                    if item_busy and other_busy:
+                        continue
+                    if item_busy or other_busy:
+                        conflicts.append({
+                            "type": "busy_overlap",
+                            "date": date,
+                            "event": item if item_busy else other,
+                            "other": other if item_busy else item,
+                            "session": idx,
+                        })
+                    else:
+                        conflicts.append({
+                            "type": "recurring_overlap",
+                            "date": date,
+                            "occurrence": item,
+                            "other": other,
+                            "session": idx,
+                        })
+        return conflicts
 
+    def _detect_overlaps(self, start_date=None, end_date=None):
         # Check for overlapping sessions
-        for i in range(len(self.study_sessions)):
-            for j in range(i + 1, len(self.study_sessions)):
+        conflicts = []
+        indices = [
+            idx for idx, session in enumerate(self.study_sessions)
+            if _date_in_range(session["date"], start_date, end_date)
+        ]
+        for pos, i in enumerate(indices):
+            for j in indices[pos + 1:]:
                 session1 = self.study_sessions[i]
                 session2 = self.study_sessions[j]
 
@@ -338,24 +1360,9 @@ class StudyPlannerLogic:
                             "date": session1["date"],
                         })
 
-        # Check for multiple exams on same date
-        exam_dates = {}
-        for subject in self.subjects:
-            exam_date = subject["exam_date"]
-            if exam_date not in exam_dates:
-                exam_dates[exam_date] = []
-            exam_dates[exam_date].append(subject["name"])
-
-        for date, subjects in exam_dates.items():
-            if len(subjects) > 1:
-                conflicts.append({
-                    "type": "multiple_exams",
-                    "date": date,
-                    "subjects": subjects,
-                })
-
         return conflicts
 
+    @read_locked
     def format_conflict_messages(self, conflicts):
         # Format conflict messages for display
         if not conflicts:
@@ -373,9 +1380,24 @@ class StudyPlannerLogic:
             elif c["type"] == "multiple_exams":
                 subjects = ", ".join(c["subjects"])
                 msg_lines.append(f"Multiple exams on {c['date']}: {subjects}")
+            elif c["type"] == "recurring_overlap":
+                s1, s2 = c["occurrence"], c["other"]
+                msg_lines.append(
+                    f"Overlap on {c['date']}: recurring {s1['subject']} "
+                    f"({s1['start_time']}-{s1['end_time']}) "
+                    f"and {s2['subject']} ({s2['start_time']}-{s2['end_time']})"
+                )
+            elif c["type"] == "busy_overlap":
+                event, other = c["event"], c["other"]
+                msg_lines.append(
+                    f"Busy on {c['date']}: {event['summary'] or 'calendar event'} "
+                    f"({event['start_time']}-{event['end_time']}) "
+                    f"overlaps {other['subject']} ({other['start_time']}-{other['end_time']})"
+                )
 
         return msg_lines
 
+    @write_locked
     def auto_resolve_conflict(self, conflict):
         # Automatically resolve scheduling conflicts
         if conflict["type"] == "overlap":
@@ -385,13 +1407,272 @@ class StudyPlannerLogic:
             )
             new_date = old_date + timedelta(days=1)
             self.study_sessions[session2_idx]["date"] = new_date.strftime("%Y-%m-%d")
-            self.save_data()
+            self._commit()
             return True
         return False
 
+    @write_locked
+    def resolve_all_conflicts(self, day_start=RESOLVE_DAY_START, day_end=RESOLVE_DAY_END):
+        """
+        Move sessions so that no two overlap, in one pass and one save.
+        On every day with overlaps the largest set of compatible sessions
+        stays put (completed sessions never move); the rest go to the
+        nearest free slot that respects the weekly availability, blackout
+        and exam days, the day before each exam and daily_study_hours.
+        """
+        self.load_all()
+        conflicting = set()
+        for c in self.detect_conflicts():
+            if c["type"] == "overlap":
+                conflicting.update((c["session1"], c["session2"]))
+            elif c["type"] in ("recurring_overlap", "busy_overlap") and c["session"] is not None:
+                conflicting.add(c["session"])
+        if not conflicting:
+            return True, {"moved": 0, "unresolved": []}
+
+        # Recurring occurrences and busy blocks never move; they only take up time
+        fixed = self._fixed_by_date()
+        movers = self._pick_sessions_to_move(conflicting, fixed)
+        moving = set(movers)
+
+        # Free-slot index: busy intervals per day, and hours per subject per day
+        busy = {}
+        hours_by_day = {}
+        for idx, session in enumerate(self.study_sessions):
+            if idx in moving:
+                continue
+            self._book(
+                busy,
+                hours_by_day,
+                session["date"],
+                session["subject"],
+                time_to_minute(session["start_time"]),
+                time_to_minute(session["end_time"]),
+            )
+        for day, day_fixed in fixed.items():
+            for item in day_fixed:
+                self._book(
+                    busy,
+                    hours_by_day,
+                    day,
+                    item.get("subject"),
+                    time_to_minute(item["start_time"]),
+                    time_to_minute(item["end_time"]),
+                )
+
+        blocked = set(self.blackout_dates)
+        blocked.update(subject["exam_date"] for subject in self.subjects)
+        window = (time_to_minute(day_start), time_to_minute(day_end))
+
+        moved = 0
+        unresolved = []
+        for idx in movers:
+            session = self.study_sessions[idx]
+            slot = self._find_free_slot(session, busy, hours_by_day, blocked, window)
+            if slot is None:
+                # It keeps its place, and its time and hours stay taken
+                unresolved.append(idx)
+                slot = (
+                    session["date"],
+                    time_to_minute(session["start_time"]),
+                    time_to_minute(session["end_time"]),
+                )
+                self._book(busy, hours_by_day, slot[0], session["subject"], *slot[1:])
+                continue
+
+            day, start, end = slot
+            self._book(busy, hours_by_day, day, session["subject"], start, end)
+            session["date"] = day
+            session["start_time"] = f"{start // 60:02d}:{start % 60:02d}"
+            session["end_time"] = f"{end // 60:02d}:{end % 60:02d}"
+            moved += 1
+
+        if moved:
+            self._commit()
+        return True, {"moved": moved, "unresolved": unresolved}
+
+    def _pick_sessions_to_move(self, conflicting, fixed):
+        # Per day keep the most sessions that fit together (earliest end first); return the rest
+        by_day = {}
+        for idx in conflicting:
+            session = self.study_sessions[idx]
+            interval = (time_to_minute(session["start_time"]), time_to_minute(session["end_time"]))
+            by_day.setdefault(session["date"], []).append((idx, interval))
+
+        movers = []
+        for day in sorted(by_day):
+            # Completed sessions are history and stay where they are, as does fixed time
+            kept = [
+                interval for idx, interval in by_day[day]
+                if self.study_sessions[idx].get("completed", False)
+            ]
+            kept.extend(
+                (time_to_minute(o["start_time"]), time_to_minute(o["end_time"]))
+                for o in fixed.get(day, ())
+            )
+            open_sessions = sorted(
+                (
+                    (idx, interval) for idx, interval in by_day[day]
+                    if not self.study_sessions[idx].get("completed", False)
+                ),
+                key=lambda item: (item[1][1], item[0]),
+            )
+            for idx, (start, end) in open_sessions:
+                if all(start >= kept_end or end <= kept_start for kept_start, kept_end in kept):
+                    kept.append((start, end))
+                else:
+                    movers.append(idx)
+
+        sessions = self.study_sessions
+        movers.sort(key=lambda idx: (sessions[idx]["date"], sessions[idx]["start_time"]))
+        return movers
+
+    @staticmethod
+    def _book(busy, hours_by_day, day, subject, start, end):
+        # Record a session in the free-slot index
+        bisect.insort(busy.setdefault(day, []), (start, end))
+        by_subject = hours_by_day.setdefault(day, {})
+        by_subject[subject] = by_subject.get(subject, 0.0) + (end - start) / 60
+
+    def _find_free_slot(self, session, busy, hours_by_day, blocked, window):
+        # Nearest free (day, start, end) for a session, searching forward from its own day
+        start = time_to_minute(session["start_time"])
+        duration = time_to_minute(session["end_time"]) - start
+        hours = duration / 60
+
+        subject = self.get_subject_by_name(session["subject"])
+        daily_limit = subject.get("daily_study_hours") if subject else None
+
+        first_day = max(
+            datetime.strptime(session["date"], "%Y-%m-%d").date(), datetime.now().date()
+        )
+        last_day = first_day + timedelta(days=RESOLVE_HORIZON_DAYS)
+        if subject is not None:
+            # Same rule as auto-scheduling: nothing on the day before the exam or later
+            exam_day = datetime.strptime(subject["exam_date"], "%Y-%m-%d").date()
+            last_day = min(last_day, exam_day - timedelta(days=2))
+
+        for offset in range((last_day - first_day).days + 1):
+            day = first_day + timedelta(days=offset)
+            date_str = day.strftime("%Y-%m-%d")
+            if date_str in blocked:
+                continue
+            hours_today = hours_by_day.get(date_str, {}).get(session["subject"], 0.0)
+            if daily_limit is not None and hours_today + hours > daily_limit:
+                continue
+
+            windows = self.get_weekday_availability(day.weekday())
+            if windows is None:
+                windows = [window]
+            else:
+                windows = [(time_to_minute(a), time_to_minute(b)) for a, b in windows]
+
+            best = None
+            for window_start, window_end in windows:
+                gaps = _free_gaps(busy.get(date_str, []), window_start, window_end)
+                for gap_start, gap_end in gaps:
+                    if gap_end - gap_start < duration:
+                        continue
+                    # Closest start to the original time within the gap
+                    candidate = min(max(start, gap_start), gap_end - duration)
+                    if best is None or abs(candidate - start) < abs(best - start):
+                        best = candidate
+            if best is not None:
+                return date_str, best, best + duration
+        return None
+
+    # Availability
+
+    def parse_availability_windows(self, text):
+        # Parse "09:00-12:00, 14:00-18:00" into normalized windows
+        text = text.strip()
+        if not text or text.lower() == "closed":
+            return True, None, []
+        if text.lower() == "any":
+            return True, None, None
+
+        windows = []
+        for part in text.split(","):
+            bounds = part.strip().split("-")
+            if len(bounds) != 2:
+                return False, f"Invalid window '{part.strip()}'. Use HH:MM-HH:MM", None
+            is_valid, error, start, end = self.validate_time_format(
+                bounds[0].strip(), bounds[1].strip()
+            )
+            if not is_valid:
+                return False, error, None
+            windows.append([start.strftime("%H:%M"), end.strftime("%H:%M")])
+
+        windows.sort()
+        return True, None, windows
+
+    def format_availability_windows(self, windows):
+        # Format windows back into the text form used by the settings dialog
+        if windows is None:
+            return "any"
+        if not windows:
+            return "closed"
+        return ", ".join(f"{start}-{end}" for start, end in windows)
+
+    def get_weekday_availability(self, weekday):
+        # Get the windows for a weekday (None means the whole availability window)
+        return self.weekly_availability.get(str(weekday))
+
+    @write_locked
+    def set_weekly_availability(self, availability):
+        # Replace the weekly template, mapping weekday number to windows or None
+        self.weekly_availability = {
+            str(weekday): windows
+            for weekday, windows in availability.items()
+            if windows is not None
+        }
+        self._commit()
+
+    @write_locked
+    def set_blackout_dates(self, dates):
+        # Replace the blackout calendar (holidays and other unavailable days)
+        self.blackout_dates = sorted(set(dates))
+        self._commit()
+
+    def _compile_weekday_masks(self, time_slots):
+        # Bitmask of usable slots for each weekday, bit i set for time_slots[i]
+        weekday_masks = []
+        for weekday in range(7):
+            windows = self.get_weekday_availability(weekday)
+            mask = 0
+            for slot_idx, (slot_start, slot_end) in enumerate(time_slots):
+                if windows is None or any(
+                        start <= slot_start and slot_end <= end for start, end in windows
+                ):
+                    mask |= 1 << slot_idx
+            weekday_masks.append(mask)
+        return weekday_masks
+
+    def _iter_day_masks(self, time_slots, start_date, num_days):
+        # (date, slot bitmask) per day from the weekly template, blackout dates and exam days,
+        # computed one day at a time so an early stop skips the rest of the horizon
+        weekday_masks = self._compile_weekday_masks(time_slots)
+
+        blocked = set(self.blackout_dates)
+        blocked.update(subject["exam_date"] for subject in self.subjects)
+        blocked_ordinals = set()
+        for date_str in blocked:
+            try:
+                blocked_ordinals.add(datetime.strptime(date_str, "%Y-%m-%d").toordinal())
+            except ValueError:
+                continue
+
+        for offset in range(num_days):
+            day = start_date + timedelta(days=offset)
+            if day.toordinal() in blocked_ordinals:
+                yield day, 0
+            else:
+                yield day, weekday_masks[day.weekday()]
+
     # Auto-scheduling
 
-    def auto_schedule(self, start_time, end_time, session_duration, break_time):
+    @write_locked
+    def auto_schedule(self, start_time, end_time, session_duration, break_time, preview=False):
         # Automatically generate study schedule respecting daily study hour limits
         if not self.subjects:
             return False, "No subjects available"
@@ -410,18 +1691,136 @@ class StudyPlannerLogic:
         if not subjects_to_schedule:
             return False, "All subjects complete or exams passed"
 
-        # Clear existing sessions
-        self.study_sessions = []
+        # The new schedule replaces every stored session, so diff against all of them
+        self.load_all()
 
-        # Schedule sessions
-        scheduled_count, incomplete_subjects = self._schedule_sessions(
-            subjects_to_schedule, time_slots, session_duration
-        )
+        # Same subjects, settings and day as a recent run give the same plan
+        fingerprint = self._schedule_fingerprint(start_time, end_time, session_duration, break_time)
+        cached = self._schedule_cache.get(fingerprint)
+        if cached is not None:
+            sessions = [Session.from_dict(row) for row in cached["sessions"]]
+            incomplete_subjects = list(cached["incomplete_subjects"])
+        else:
+            sessions, incomplete_subjects = self._schedule_sessions(
+                subjects_to_schedule, time_slots, session_duration
+            )
+            # A preview writes nothing; its plan reaches the cache file once applied
+            self._schedule_cache.put(
+                fingerprint,
+                {
+                    "sessions": [s.to_dict() for s in sessions],
+                    "incomplete_subjects": incomplete_subjects,
+                },
+                persist=not preview,
+            )
 
-        self.save_data()
-        return True, {
-            "scheduled_count": scheduled_count,
+        result = {
+            "scheduled_count": len(sessions),
             "incomplete_subjects": incomplete_subjects,
+            "cached": cached is not None,
+        }
+
+        # A preview leaves the current schedule and the data file untouched
+        if preview:
+            result["sessions"] = sessions
+            result["diff"] = self.diff_schedule(sessions)
+            return True, result
+
+        # A reused plan that is already in place needs no rewrite
+        if cached is not None and self._is_current_schedule(sessions):
+            return True, result
+
+        # Replace existing sessions
+        self.apply_schedule(sessions)
+        return True, result
+
+    def _schedule_fingerprint(self, start_time, end_time, session_duration, break_time):
+        # Hash of everything auto_schedule reads, including today's date
+        inputs = {
+            "today": datetime.now().date().isoformat(),
+            "window": [start_time, end_time, float(session_duration), float(break_time)],
+            "subjects": [
+                [
+                    s["name"],
+                    s["exam_date"],
+                    s["recommended_hours"],
+                    s["hours_completed"],
+                    s.get("daily_study_hours", 2),
+                ]
+                for s in self.subjects
+            ],
+            "weekly_availability": self.weekly_availability,
+            "blackout_dates": sorted(self.blackout_dates),
+            "recurring_sessions": [r.to_dict() for r in self.recurring_sessions],
+            "busy_events": self.busy_events,
+        }
+        text = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _is_current_schedule(self, sessions):
+        # Whether the stored sessions are exactly this plan, in order
+        if len(sessions) != len(self.study_sessions):
+            return False
+        return all(
+            a.to_dict() == b.to_dict() for a, b in zip(sessions, self.study_sessions)
+        )
+
+    @write_locked
+    def apply_schedule(self, sessions):
+        # Replace the current schedule with a generated one in a single write
+        self.load_all()
+        self.study_sessions = list(sessions)
+        self._schedule_cache.save()
+        self._commit()
+
+    @read_locked
+    def diff_schedule(self, proposed_sessions):
+        # Compare a proposed schedule against the current one
+        def key(session):
+            return (
+                session["subject"],
+                session["date"],
+                session["start_time"],
+                session["end_time"],
+            )
+
+        current_by_key = {}
+        for session in self.study_sessions:
+            current_by_key.setdefault(key(session), []).append(session)
+
+        added = []
+        unchanged = 0
+        for session in proposed_sessions:
+            matches = current_by_key.get(key(session))
+            if matches:
+                matches.pop()
+                unchanged += 1
+            else:
+                added.append(session)
+
+        removed = [s for matches in current_by_key.values() for s in matches]
+
+        # Pair removed and added sessions of the same subject as moves
+        removed_by_subject = {}
+        for session in removed:
+            removed_by_subject.setdefault(session["subject"], []).append(session)
+
+        moved = []
+        still_added = []
+        for session in added:
+            candidates = removed_by_subject.get(session["subject"])
+            if candidates:
+                moved.append((candidates.pop(0), session))
+            else:
+                still_added.append(session)
+
+        still_removed = [s for matches in removed_by_subject.values() for s in matches]
+
+        return {
+            "added": still_added,
+            "removed": still_removed,
+            "moved": moved,
+            "unchanged": unchanged,
         }
 
     def _generate_time_slots(self, start_time, end_time, session_duration, break_time):
@@ -473,33 +1872,75 @@ class StudyPlannerLogic:
 
     def _schedule_sessions(self, subjects_to_schedule, time_slots, session_duration):
         # Schedule sessions for subjects
-        daily_hours_tracker = {}
-        scheduled_count = 0
+        sessions = list(
+            self.iter_schedule(subjects_to_schedule, time_slots, session_duration)
+        )
         incomplete_subjects = []
 
-        today = datetime.now()
-        today_date = today.date()
+        # Check for incomplete subjects
+        for subject in subjects_to_schedule:
+            if subject["hours_scheduled"] < subject["remaining_hours"]:
+                incomplete_subjects.append(
+                    f"{subject['name']} (scheduled {subject['hours_scheduled']:.1f}h / "
+                    f"{subject['remaining_hours']:.1f}h needed)"
+                )
+
+        return sessions, incomplete_subjects
+
+    def iter_schedule(self, subjects_to_schedule, time_slots, session_duration):
+        """
+        Lazily yield auto-scheduled sessions, one day at a time.
+        Stops as soon as every subject's remaining hours are placed or the
+        last exam has passed; days after that are never looked at.
+        """
+        daily_hours_tracker = {}
+        booked = {}
+
+        today_date = datetime.now().date()
         max_days = max(s["days_until_exam"] for s in subjects_to_schedule)
 
-        for day_offset in range(max_days):
-            schedule_date_obj = today_date + timedelta(days=day_offset)
+        # Imported busy times by date; recurring occurrences are expanded per day below
+        busy_by_date = {}
+        for block in self.busy_events:
+            busy_by_date.setdefault(block["date"], []).append(block)
+
+        for schedule_date_obj, day_mask in self._iter_day_masks(time_slots, today_date, max_days):
+            # Stop once all demand is met
+            pending = [
+                s for s in subjects_to_schedule
+                if s["hours_scheduled"] < s["remaining_hours"]
+            ]
+            if not pending:
+                return
+
             schedule_date = datetime.combine(schedule_date_obj, datetime.min.time())
-            date_str = schedule_date.strftime("%Y-%m-%d")
 
-            # Skip weekends
-            if schedule_date.weekday() >= 5:
+            # Stop once every pending subject's exam is too close to study for
+            if all(schedule_date >= s["exam_date"] - timedelta(days=1) for s in pending):
+                return
+
+            # Skip closed days, blackout dates and exam days
+            if not day_mask:
                 continue
 
-            if date_str not in daily_hours_tracker:
-                daily_hours_tracker[date_str] = {}
+            date_str = schedule_date.strftime("%Y-%m-%d")
+            hours_by_subject = daily_hours_tracker.setdefault(date_str, {})
+            # Recurring sessions and imported busy times that day stay blocked
+            booked_today = booked.setdefault(
+                date_str,
+                list(self.iter_occurrences(date_str, date_str)) + busy_by_date.get(date_str, []),
+            )
 
             # Schedule sessions for this day
-            for slot_start, slot_end in time_slots:
-                if not self._is_slot_available(date_str, slot_start, slot_end):
+            for slot_idx, (slot_start, slot_end) in enumerate(time_slots):
+                if not day_mask >> slot_idx & 1:
+                    continue
+
+                if not self._is_slot_available(date_str, slot_start, slot_end, booked_today):
                     continue
 
                 # Find a subject to schedule
-                for subject in subjects_to_schedule:
+                for subject in pending:
                     if subject["hours_scheduled"] >= subject["remaining_hours"]:
                         continue
 
@@ -507,7 +1948,7 @@ class StudyPlannerLogic:
                         continue
 
                     subject_name = subject["name"]
-                    hours_today = daily_hours_tracker[date_str].get(subject_name, 0)
+                    hours_today = hours_by_subject.get(subject_name, 0)
 
                     if hours_today >= subject["daily_limit"]:
                         continue
@@ -529,31 +1970,28 @@ class StudyPlannerLogic:
                     end_dt = start_dt + timedelta(hours=actual_session_hours)
                     actual_end_time = end_dt.strftime("%H:%M")
 
-                    self.add_session(
-                        subject_name, date_str, slot_start, actual_end_time, "Auto-scheduled"
+                    session = Session(
+                        subject=subject_name,
+                        date=date_str,
+                        start_time=slot_start,
+                        end_time=actual_end_time,
+                        notes="Auto-scheduled",
+                        completed=False,
                     )
-                    scheduled_count += 1
+                    booked_today.append(session)
 
                     # Update trackers
                     subject["hours_scheduled"] += actual_session_hours
-                    daily_hours_tracker[date_str][subject_name] = (
-                            hours_today + actual_session_hours
-                    )
-                    break
-
-        # Check for incomplete subjects
-        for subject in subjects_to_schedule:
-            if subject["hours_scheduled"] < subject["remaining_hours"]:
-                incomplete_subjects.append(
-                    f"{subject['name']} (scheduled {subject['hours_scheduled']:.1f}h / "
-                    f"{subject['remaining_hours']:.1f}h needed)"
-                )
+                    hours_by_subject[subject_name] = hours_today + actual_session_hours
 
-        return scheduled_count, incomplete_subjects
+                    yield session
+                    break
 
-    def _is_slot_available(self, date_str, slot_start, slot_end):
+    def _is_slot_available(self, date_str, slot_start, slot_end, sessions=None):
         # Check if a time slot is available
-        for existing_session in self.study_sessions:
+        if sessions is None:
+            sessions = self.study_sessions
+        for existing_session in sessions:
             if existing_session["date"] == date_str:
                 existing_start = datetime.strptime(existing_session["start_time"], "%H:%M")
                 existing_end = datetime.strptime(existing_session["end_time"], "%H:%M")
@@ -566,15 +2004,29 @@ class StudyPlannerLogic:
 
     # Statistics
 
+    @read_locked
     def get_statistics(self):
         """Calculate dashboard statistics"""
         total_subjects = len(self.subjects)
         total_hours_needed = sum(s["recommended_hours"] for s in self.subjects)
         total_hours_completed = sum(s["hours_completed"] for s in self.subjects)
         total_sessions = len(self.study_sessions)
-        completed_sessions = sum(
-            1 for s in self.study_sessions if s.get("completed", False)
-        )
+        if self._use_columnar():
+            completed_sessions = self.get_columns().completed_count()
+        else:
+            completed_sessions = sum(
+                1 for s in self.study_sessions if s.get("completed", False)
+            )
+
+        # Months that are still on disk count towards the totals too
+        if self._store is not None:
+            stored_total, stored_completed = self._store.unloaded_totals(self._loaded_months)
+            total_sessions += stored_total
+            completed_sessions += stored_completed
+
+        # Archived sessions are all completed
+        total_sessions += self.archive_rollup["sessions"]
+        completed_sessions += self.archive_rollup["sessions"]
 
         return {
             "total_subjects": total_subjects,
@@ -584,6 +2036,92 @@ class StudyPlannerLogic:
             "completed_sessions": completed_sessions,
         }
 
+    def get_hours_by_subject(self, completed_only=False):
+        # Total scheduled (or completed) session hours per subject
+        if self._store is not None:
+            # Months on disk count through their manifest rollups; older manifests lack them
+            missing = self._store.months_without_rollups()
+            if missing:
+                with self._lock.writing():
+                    self._load_months(missing)
+
+        with self._lock.reading():
+            if self._use_columnar():
+                hours_by_subject = self.get_columns().hours_by_subject(completed_only)
+            else:
+                hours_by_subject = {}
+                for session in self.study_sessions:
+                    hours_by_subject.setdefault(session["subject"], 0.0)
+                    if completed_only and not session.get("completed", False):
+                        continue
+                    start = datetime.strptime(session["start_time"], "%H:%M")
+                    end = datetime.strptime(session["end_time"], "%H:%M")
+                    hours_by_subject[session["subject"]] += (end - start).seconds / 3600
+
+            if self._store is not None:
+                stored = self._store.unloaded_hours(self._loaded_months, completed_only)
+                for name, hours in stored.items():
+                    hours_by_subject[name] = hours_by_subject.get(name, 0.0) + hours
+
+            # Archived sessions count as completed hours
+            for name, rollup in self.archive_rollup["by_subject"].items():
+                hours_by_subject[name] = hours_by_subject.get(name, 0.0) + rollup["hours"]
+            return hours_by_subject
+
+    def get_daily_hours(self, start_date=None, end_date=None):
+        """
+        Scheduled hours per day and subject, {date: {subject: hours}},
+        including archived sessions. Built once per data version, so
+        calendar views can redraw a whole term without scanning sessions.
+        """
+        if start_date is not None and end_date is not None:
+            self.load_range(start_date, end_date)
+
+        with self._lock.reading():
+            with self._cache_lock:
+                cached = self._daily_hours
+                if cached is None or cached[0] != self.data_version:
+                    cached = (self.data_version, self._build_daily_hours())
+                    self._daily_hours = cached
+
+            daily = cached[1]
+            if start_date is None and end_date is None:
+                return daily
+            return {
+                day: hours
+                for day, hours in daily.items()
+                if (start_date is None or day >= start_date) and (end_date is None or day <= end_date)
+            }
+
+    def _build_daily_hours(self):
+        # Aggregate live sessions per day and subject, then fold in the archive rollup
+        daily = {}
+        if self._use_columnar():
+            columns = self.get_columns()
+            ordinals, subjects, totals = columns.hours_by_day_and_subject()
+            date_strings = {}
+            for ordinal, subject, hours in zip(ordinals.tolist(), subjects.tolist(), totals.tolist()):
+                day = date_strings.get(ordinal)
+                if day is None:
+                    day = datetime.fromordinal(ordinal).strftime("%Y-%m-%d")
+                    date_strings[ordinal] = day
+                daily.setdefault(day, {})[columns.subject_names[subject]] = hours
+        else:
+            for session in self.study_sessions:
+                day = daily.setdefault(session["date"], {})
+                day[session["subject"]] = day.get(session["subject"], 0.0) + archive.session_hours(session)
+
+        for occurrence in self.iter_occurrences():
+            day = daily.setdefault(occurrence["date"], {})
+            hours = archive.session_hours(occurrence)
+            day[occurrence["subject"]] = day.get(occurrence["subject"], 0.0) + hours
+
+        for day, by_subject in self.archive_rollup["by_day"].items():
+            totals = daily.setdefault(day, {})
+            for subject, hours in by_subject.items():
+                totals[subject] = totals.get(subject, 0.0) + hours
+        return daily
+
     def calculate_subject_progress(self, subject):
         # Calculate progress percentage for a subject
         progress = (subject["hours_completed"] / subject["recommended_hours"]) * 100
@@ -600,9 +2138,16 @@ class StudyPlannerLogic:
 
     # Reminder system
 
+    @read_locked
     def get_upcoming_sessions_today(self):
         # Get upcoming sessions for today
         now = datetime.now()
+        if self._use_columnar():
+            return [
+                (int(idx), self.study_sessions[idx])
+                for idx in self.get_columns().reminder_candidates(now)
+            ]
+
         today = now.strftime("%Y-%m-%d")
         upcoming = []
 
@@ -619,11 +2164,15 @@ class StudyPlannerLogic:
 
         return upcoming
 
+    @write_locked
     def mark_session_reminded(self, idx):
         # Mark a session as reminded
         if 0 <= idx < len(self.study_sessions):
-            self.study_sessions[idx]["reminded"] = True
-            self.save_data()
+            session = self.study_sessions[idx]
+            session["reminded"] = True
+            self._commit(
+                flag_row=(idx, REMINDED), event=SESSION_UPDATED, index=idx, session=session
+            )
 
     # Utility functions
 
@@ -643,4 +2192,111 @@ class StudyPlannerLogic:
             date_obj = datetime.strptime(date_str, "%Y-%m-%d")
             return date_obj.strftime("%A, %B %d, %Y")
         except Exception:
-            return date_str
\ No newline at end of file
+            return date_str
+
+
+def _write_json(path, subject_rows, session_rows, settings):
+    # Write a pretty-printed JSON data file from plain dict rows
+    data = {
+        "subjects": subject_rows,
+        "study_sessions": session_rows,
+    }
+    data.update(settings)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def _text(value):
+    # A raw input value as the stripped string the validators expect
+    return "" if value is None else str(value).strip()
+
+
+def _duration_error(session_hours, daily_hours, subject_name):
+    return (
+        f"Session duration ({session_hours:.1f}h) exceeds daily study hours ({daily_hours}h) "
+        f"for {subject_name}.\n\nPlease schedule a session of {daily_hours}h or less."
+    )
+
+
+def _exam_conflict_error(date_str, subject_names):
+    return (
+        f"Cannot schedule study sessions on {date_str}.\n\n"
+        f"Exam(s) scheduled on this date: {', '.join(subject_names)}\n\n"
+        "Please choose a different date for studying."
+    )
+
+
+def _date_in_range(date_str, start_date, end_date):
+    # Whether a YYYY-MM-DD date lies in a range whose ends may be None
+    return (start_date is None or date_str >= start_date) and (end_date is None or date_str <= end_date)
+
+
+def _file_stamp(path):
+    # (mtime, size) of a file, or None if it does not exist
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _record_key(row):
+    # Hashable, key-order independent identity of a record's contents
+    key = tuple(sorted(row.items()))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        return json.dumps(row, sort_keys=True, default=str)
+
+
+def _disk_state(subject_rows, session_rows, settings):
+    # What a JSON data file holds, in a form that is cheap to compare
+    return {
+        "subjects": {row["name"]: _record_key(row) for row in subject_rows},
+        "sessions": Counter(_record_key(row) for row in session_rows),
+        "settings": json.dumps(settings, sort_keys=True, default=str),
+    }
+
+
+def _disk_state_of_file(data):
+    settings = {k: v for k, v in data.items() if k not in ("subjects", "study_sessions")}
+    return _disk_state(data.get("subjects", []), data.get("study_sessions", []), settings)
+
+
+# Fitted (scaler, model) pair for predict_study_hours, built on first use
+_hours_model = None
+
+
+def _get_hours_model():
+    # scikit-learn is slow to import, so it is only loaded once a prediction is needed
+    global _hours_model
+    if _hours_model is None:
+        from sklearn.linear_model import LinearRegression
+        from sklearn.preprocessing import StandardScaler
+
+        X_train = np.array([[row[0], row[1], row[2]] for row in HOURS_TRAINING_DATA])
+        y_train = np.array([row[3] for row in HOURS_TRAINING_DATA])
+
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+
+        model = LinearRegression()
+        model.fit(X_train_scaled, y_train)
+        _hours_model = scaler, model
+    return _hours_model
+
+
+def _free_gaps(intervals, window_start, window_end):
+    # Gaps between sorted busy (start, end) minute intervals inside a window
+    cursor = window_start
+    for start, end in intervals:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            yield cursor, start
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        yield cursor, window_end
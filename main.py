@@ -1,11 +1,30 @@
+import time
+
+# Startup is timed from here, before the UI modules are imported
+STARTED_AT = time.perf_counter()
+
+import argparse
 import tkinter as tk
 from ui import IntelligentStudyPlannerUI
 
 
 def main():
 
+    parser = argparse.ArgumentParser(description="Intelligent Study Planner")
+    parser.add_argument(
+        "--timing", action="store_true", help="print time to first paint and to data ready"
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="show peak and retained memory of loading, scheduling and each tab once loaded",
+    )
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = IntelligentStudyPlannerUI(root)
+    app = IntelligentStudyPlannerUI(
+        root, started_at=STARTED_AT, report_timing=args.timing, report_memory=args.memory
+    )
     root.mainloop()
 
 
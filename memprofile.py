@@ -0,0 +1,156 @@
+import gc
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+
+# Frames kept per traced allocation, enough to reach planner code from inside json or tkinter
+TRACE_FRAMES = 25
+
+# Call sites listed per operation
+TOP_SITES = 8
+
+# Auto-schedule settings profiled, the defaults of the settings dialog
+SCHEDULE_SETTINGS = ("09:00", "21:00", 2.0, 0.0)
+
+PLANNER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _call_site(traceback, ours):
+    # The innermost frame in the planner's own modules, else the innermost frame
+    for frame in reversed(traceback):
+        filename = frame.filename
+        if filename not in ours:
+            ours[filename] = os.path.dirname(os.path.abspath(filename)) == PLANNER_DIR
+        if ours[filename]:
+            break
+    else:
+        frame = traceback[-1]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+def _by_call_site(stats, top):
+    # (site, bytes, blocks) sorted by bytes, summing statistics that share a site
+    sites = {}
+    ours = {}
+    for stat in stats:
+        if stat.traceback[-1].filename == tracemalloc.__file__:
+            # The snapshots themselves
+            continue
+        size = getattr(stat, "size_diff", stat.size)
+        count = getattr(stat, "count_diff", stat.count)
+        site = _call_site(stat.traceback, ours)
+        total_size, total_count = sites.get(site, (0, 0))
+        sites[site] = (total_size + size, total_count + count)
+    ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)
+    return [(site, size, count) for site, (size, count) in ranked[:top] if size > 0]
+
+
+def measure(label, operation, sessions=0, top=TOP_SITES):
+    """
+    Run operation() under tracemalloc and report what it allocated:
+    the peak while it ran, what is still allocated once it returns
+    (with its result kept alive), what only the cycle collector freed,
+    and the call sites holding the most retained memory. tracemalloc
+    has no per-site peak, and memory Tk keeps outside Python is not
+    traced.
+    """
+    own_trace = not tracemalloc.is_tracing()
+    gc.collect()
+    if own_trace:
+        tracemalloc.start(TRACE_FRAMES)
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_size, _ = tracemalloc.get_traced_memory()
+
+        result = operation()
+
+        end_size, peak_size = tracemalloc.get_traced_memory()
+        gc.collect()
+        retained_size, _ = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if own_trace:
+            tracemalloc.stop()
+
+    diff = after.compare_to(before, "traceback")
+    del result
+    return {
+        "label": label,
+        "sessions": sessions,
+        "peak": peak_size - start_size,
+        "retained": retained_size - start_size,
+        "cyclic": end_size - retained_size,
+        "sites": _by_call_site(diff, top),
+    }
+
+
+def _size(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+
+def format_report(reports):
+    # Plain-text table of measure() results, one block per operation
+    lines = []
+    for report in reports:
+        lines.append(f"{report['label']}")
+        lines.append(
+            f"  peak {_size(report['peak']):>10}   retained {_size(report['retained']):>10}"
+            f"   collected {_size(report['cyclic']):>10}"
+        )
+        if report["sessions"]:
+            lines.append(
+                f"  per session: peak {report['peak'] / report['sessions']:8.1f} B"
+                f"   retained {report['retained'] / report['sessions']:8.1f} B"
+                f"   ({report['sessions']} sessions)"
+            )
+        for site, size, count in report["sites"]:
+            lines.append(f"    {_size(size):>10} {count:>9} blocks  {site}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def profile_planner(data_file, top=TOP_SITES):
+    """
+    Memory reports for loading a data file, detecting conflicts and
+    auto-scheduling. They run on a temporary copy of the file, so the
+    data file and its schedule cache are left as they are.
+    """
+    from logic import StudyPlannerLogic
+
+    reports = []
+    with tempfile.TemporaryDirectory() as directory:
+        copy = os.path.join(directory, os.path.basename(data_file.rstrip("/\\")))
+        if os.path.isdir(data_file):
+            shutil.copytree(data_file, copy)
+        elif os.path.exists(data_file):
+            shutil.copy2(data_file, copy)
+
+        loaded = []
+        reports.append(measure("load_data", lambda: loaded.append(StudyPlannerLogic(copy)), top=top))
+        logic = loaded.pop()
+        logic.load_all()
+        sessions = len(logic.study_sessions)
+        reports[0]["sessions"] = sessions
+
+        reports.append(measure("detect_conflicts", logic.detect_conflicts, sessions, top))
+        reports.append(measure("auto_schedule", lambda: logic.auto_schedule(*SCHEDULE_SETTINGS), sessions, top))
+        logic.close()
+    return reports
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Study planner memory report")
+    parser.add_argument("data_file", nargs="?", default="study_planner_data.json")
+    parser.add_argument("--top", type=int, default=TOP_SITES, help="call sites listed per operation")
+    args = parser.parse_args()
+
+    print(format_report(profile_planner(args.data_file, args.top)))
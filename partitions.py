@@ -0,0 +1,142 @@
+import json
+import os
+
+import archive
+import snapshot
+from persistence import replace_atomically
+
+
+MANIFEST_FILE = "manifest.json"
+PARTITIONED_EXTENSION = ".planner"
+
+
+def is_partitioned_path(path):
+    # Whether a data path is (or should become) a month-partitioned directory
+    path = str(path)
+    return path.endswith(PARTITIONED_EXTENSION) or os.path.isdir(path)
+
+
+def month_key(date_str):
+    # Partition key for a session date, e.g. "2025-12"
+    return date_str[:7]
+
+
+def months_between(start_date, end_date):
+    # Month keys from start_date to end_date inclusive
+    months = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _write_manifest(path, manifest):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+class PartitionStore:
+    """
+    Sessions stored one snapshot file per month, plus a manifest with the
+    subjects, settings and per-month session counts and hours. Only the
+    months a caller asks for are ever read.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = {"version": 1, "subjects": [], "settings": {}, "partitions": {}}
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def read_manifest(self):
+        # Load the manifest, or start empty for a new directory
+        path = self._path(MANIFEST_FILE)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        return self.manifest
+
+    def months(self):
+        # All month keys that have sessions on disk
+        return sorted(self.manifest["partitions"])
+
+    def months_in_range(self, start_date, end_date):
+        # Stored month keys that overlap a date range
+        wanted = set(months_between(start_date, end_date))
+        return [key for key in self.months() if key in wanted]
+
+    def load_month(self, key):
+        # Read one month's sessions from its memory-mapped snapshot
+        partition = self.manifest["partitions"].get(key)
+        if partition is None:
+            return []
+        return snapshot.read_snapshot(self._path(partition["file"]))["study_sessions"]
+
+    def unloaded_totals(self, loaded_months):
+        # Session and completed counts of the months that are not in memory
+        total = completed = 0
+        for key, partition in self.manifest["partitions"].items():
+            if key not in loaded_months:
+                total += partition["count"]
+                completed += partition["completed"]
+        return total, completed
+
+    def unloaded_hours(self, loaded_months, completed_only=False):
+        # Scheduled (or completed) hours per subject in the months that are not in memory
+        field = "completed_hours" if completed_only else "hours"
+        hours_by_subject = {}
+        for key, partition in self.manifest["partitions"].items():
+            if key in loaded_months:
+                continue
+            for name, hours in partition.get(field, {}).items():
+                hours_by_subject[name] = hours_by_subject.get(name, 0.0) + hours
+        return hours_by_subject
+
+    def months_without_rollups(self):
+        # Months written before the manifest kept hours per subject
+        return [key for key, partition in self.manifest["partitions"].items() if "hours" not in partition]
+
+    def write(self, subjects, settings, sessions, loaded_months):
+        # Rewrite the loaded months and the manifest; other months stay untouched
+        os.makedirs(self.directory, exist_ok=True)
+
+        by_month = {key: [] for key in loaded_months}
+        for session in sessions:
+            by_month.setdefault(month_key(session["date"]), []).append(session)
+
+        partitions = self.manifest["partitions"]
+        for key, month_sessions in by_month.items():
+            file_name = f"sessions-{key}{snapshot.SNAPSHOT_EXTENSION}"
+            path = self._path(file_name)
+
+            if not month_sessions:
+                partitions.pop(key, None)
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+
+            replace_atomically(path, lambda temp: snapshot.write_snapshot(temp, [], month_sessions))
+            hours = {}
+            completed_hours = {}
+            for session in month_sessions:
+                name = session["subject"]
+                hours[name] = hours.get(name, 0.0) + archive.session_hours(session)
+                completed_hours.setdefault(name, 0.0)
+                if session.get("completed", False):
+                    completed_hours[name] += archive.session_hours(session)
+            partitions[key] = {
+                "file": file_name,
+                "count": len(month_sessions),
+                "completed": sum(1 for s in month_sessions if s.get("completed", False)),
+                "hours": hours,
+                "completed_hours": completed_hours,
+            }
+
+        self.manifest["subjects"] = [dict(s.items()) for s in subjects]
+        self.manifest["settings"] = settings
+
+        # The manifest goes last so it never points at a half-written month
+        path = self._path(MANIFEST_FILE)
+        replace_atomically(path, lambda temp: _write_manifest(temp, self.manifest))
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def replace_atomically(path, write):
+    """
+    Call write(temp_path) for a temporary file next to path, flush it
+    to disk, then swap it in with os.replace, so path holds either the
+    old contents or the new ones even after a crash. The temporary
+    file is removed if anything fails, and the error is raised.
+    """
+    temp_path = path + ".tmp"
+    try:
+        write(temp_path)
+        with open(temp_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+class WriteBehindSaver:
+    """
+    Coalesces bursts of changes into one background save. Every change
+    restarts a short idle timer; the save runs on a worker thread once
+    no change has arrived for `delay` seconds. flush() saves right away.
+    """
+
+    def __init__(self, save, delay=0.5):
+        self._save = save
+        self.delay = delay
+        self.last_error = None
+
+        self._cond = threading.Condition()
+        self._saving = threading.Lock()
+        self._dirty = False
+        self._last_change = 0.0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="planner-save", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self):
+        # Note a change; the save happens after the idle delay
+        with self._cond:
+            self._dirty = True
+            self._last_change = time.monotonic()
+            self._cond.notify()
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def _run(self):
+        with self._cond:
+            while not self._closed:
+                if not self._dirty:
+                    self._cond.wait()
+                    continue
+
+                remaining = self._last_change + self.delay - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+                self._dirty = False
+                self._cond.release()
+                try:
+                    self._write()
+                finally:
+                    self._cond.acquire()
+
+    def _write(self):
+        # Run one save; a failed save stays dirty and is retried after the delay
+        with self._saving:
+            result = self._save()
+
+        if result is True:
+            self.last_error = None
+            return True
+
+        self.last_error = result[1] if isinstance(result, tuple) else result
+        self.mark_dirty()
+        return result
+
+    def flush(self):
+        # Save pending changes now and wait for any save already in progress
+        with self._cond:
+            dirty = self._dirty
+            self._dirty = False
+
+        if dirty:
+            return self._write()
+
+        with self._saving:
+            return True
+
+    def close(self):
+        # Flush and stop the worker thread
+        result = self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        return result
+
+
+class ScheduleCache:
+    """
+    Small least-recently-used cache of generated schedules, keyed by a
+    fingerprint of everything the scheduler reads. It lives in one JSON
+    file next to the data file (or only in memory without a path), holds
+    at most max_entries plans and is replaced atomically when stored to.
+    Plans put with persist=False stay in memory until the next save().
+    """
+
+    def __init__(self, path=None, max_entries=8):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = None
+        self._unsaved = False
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for key, value in json.load(f):
+                    self._entries[key] = value
+        except (OSError, ValueError, TypeError):
+            # A damaged cache is only a missed shortcut
+            self._entries = OrderedDict()
+
+    def get(self, key):
+        self._load()
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value, persist=True):
+        self._load()
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._unsaved = True
+        if persist:
+            self.save()
+
+    def save(self):
+        # Write plans that were only kept in memory so far
+        if self._unsaved and self.path is not None:
+            self._write()
+        self._unsaved = False
+
+    def _write(self):
+        # The cache can always be rebuilt, so a failed write is not an error
+        entries = list(self._entries.items())
+        try:
+            replace_atomically(self.path, lambda temp: _write_json(temp, entries))
+        except OSError:
+            pass
@@ -0,0 +1,168 @@
+import sys
+from collections.abc import MutableMapping
+
+
+_MISSING = object()
+
+
+class Record(MutableMapping):
+    """
+    Compact slotted record that still reads and writes like a dict,
+    so the UI can keep using record["field"] and record.get("field").
+    Unset slots behave like missing keys. Unknown keys are kept in a
+    small side dict so nothing is lost when the data file is rewritten.
+    """
+
+    __slots__ = ("_extra",)
+    _fields = ()
+    _interned = frozenset()
+
+    def __init__(self, data=None, **fields):
+        self._extra = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        # Build a record from a plain dict (e.g. a JSON object)
+        return cls(data)
+
+    def to_dict(self):
+        # Plain dict copy, used when writing the data file
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._fields:
+            # Dates, times and names repeat across thousands of records
+            if key in self._interned and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._fields:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in self._fields:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        if key in self._fields:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        if key in self._fields:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return (
+                    all(getattr(self, key, _MISSING) == getattr(other, key, _MISSING)
+                        for key in self._fields)
+                    and (self._extra or None) == (other._extra or None)
+            )
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def copy(self):
+        return type(self)(self.to_dict())
+
+
+class Session(Record):
+    # A study session
+
+    __slots__ = ("subject", "date", "start_time", "end_time", "notes", "completed", "reminded")
+    _fields = __slots__
+    _interned = frozenset(("subject", "date", "start_time", "end_time", "notes"))
+
+    @classmethod
+    def from_row(cls, subject, date, start_time, end_time, notes, completed, reminded=False):
+        # Fast constructor for trusted, already-interned column values
+        session = cls.__new__(cls)
+        session._extra = None
+        session.subject = subject
+        session.date = date
+        session.start_time = start_time
+        session.end_time = end_time
+        session.notes = notes
+        session.completed = completed
+        if reminded:
+            session.reminded = True
+        return session
+
+
+class Subject(Record):
+    # A subject with its exam and study targets
+
+    __slots__ = (
+        "name",
+        "exam_date",
+        "difficulty",
+        "past_score",
+        "recommended_hours",
+        "hours_completed",
+        "daily_study_hours",
+    )
+    _fields = __slots__
+    _interned = frozenset(("name", "exam_date"))
+
+
+class Recurrence(Record):
+    # A repeating session rule, expanded into sessions only when queried
+
+    __slots__ = (
+        "subject",
+        "start_date",
+        "end_date",
+        "frequency",
+        "interval",
+        "weekdays",
+        "start_time",
+        "end_time",
+        "notes",
+        "exceptions",
+    )
+    _fields = __slots__
+    _interned = frozenset(
+        ("subject", "start_date", "end_date", "frequency", "start_time", "end_time")
+    )
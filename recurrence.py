@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from records import Session
+
+
+DAILY = "daily"
+WEEKLY = "weekly"
+FREQUENCIES = (DAILY, WEEKLY)
+
+
+def _parse(date_str):
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def iter_dates(rule, start_date=None, end_date=None):
+    """
+    Occurrence dates (YYYY-MM-DD) of a rule, optionally clipped to a
+    date range. Jumps straight to the first occurrence in range, so
+    the cost only depends on how many occurrences fall inside it.
+    """
+    first_day = _parse(rule["start_date"])
+    last_day = _parse(rule["end_date"])
+    from_day = max(first_day, _parse(start_date)) if start_date else first_day
+    to_day = min(last_day, _parse(end_date)) if end_date else last_day
+    if from_day > to_day:
+        return
+
+    interval = rule.get("interval") or 1
+    exceptions = set(rule.get("exceptions") or ())
+
+    if rule["frequency"] == DAILY:
+        offset = (from_day - first_day).days
+        day = first_day + timedelta(days=offset + (-offset) % interval)
+        step = timedelta(days=interval)
+        while day <= to_day:
+            date_str = day.isoformat()
+            if date_str not in exceptions:
+                yield date_str
+            day += step
+        return
+
+    # Weekly: every interval-th week counted from the week of start_date
+    weekdays = sorted(set(rule.get("weekdays") or [first_day.weekday()]))
+    first_week = first_day - timedelta(days=first_day.weekday())
+    weeks = (from_day - first_week).days // 7
+    week = first_week + timedelta(weeks=weeks - weeks % interval)
+    step = timedelta(weeks=interval)
+    while week <= to_day:
+        for weekday in weekdays:
+            day = week + timedelta(days=weekday)
+            if from_day <= day <= to_day:
+                date_str = day.isoformat()
+                if date_str not in exceptions:
+                    yield date_str
+        week += step
+
+
+def expand(rule, rule_index, start_date=None, end_date=None):
+    # Occurrences of a rule as sessions; `recurrence` points back at the rule
+    for date_str in iter_dates(rule, start_date, end_date):
+        yield Session(
+            subject=rule["subject"],
+            date=date_str,
+            start_time=rule["start_time"],
+            end_time=rule["end_time"],
+            notes=rule.get("notes", ""),
+            completed=False,
+            recurrence=rule_index,
+        )
+
+
+def describe(rule):
+    # Short human description, e.g. "every 2 weeks on Mon, Wed until 2026-12-18"
+    interval = rule.get("interval") or 1
+    if rule["frequency"] == DAILY:
+        every = "daily" if interval == 1 else f"every {interval} days"
+    else:
+        every = "weekly" if interval == 1 else f"every {interval} weeks"
+        weekdays = rule.get("weekdays") or [_parse(rule["start_date"]).weekday()]
+        names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        every += " on " + ", ".join(names[d] for d in sorted(set(weekdays)))
+    return f"{every} until {rule['end_date']}"
@@ -0,0 +1,169 @@
+import copy
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+
+from logic import StudyPlannerLogic
+from records import Session, Subject
+
+
+# Read-only copy of the planner data, set once per worker process
+_worker_data = None
+
+
+def _init_worker(data):
+    # Receive the data snapshot once per worker instead of once per scenario
+    global _worker_data
+    _worker_data = data
+
+
+def build_grid(durations, breaks, windows):
+    # Build every combination of session duration, break and availability window
+    return [
+        {
+            "start_time": start_time,
+            "end_time": end_time,
+            "session_duration": float(duration),
+            "break_time": float(break_time),
+        }
+        for (start_time, end_time), duration, break_time in product(windows, durations, breaks)
+    ]
+
+
+def _evaluate(params):
+    # Run auto-scheduling for one parameter combination on an in-memory planner
+    logic = StudyPlannerLogic(data_file=None)
+    logic.subjects = [Subject.from_dict(s) for s in _worker_data["subjects"]]
+    logic.study_sessions = [Session.from_dict(s) for s in _worker_data["study_sessions"]]
+
+    # Availability, blackout dates, repeating sessions and busy times the plan must respect
+    logic._apply_settings(copy.deepcopy(_worker_data))
+
+    needed_hours = sum(
+        s["remaining_hours"] for s in logic._prepare_subjects_for_scheduling()
+    )
+
+    row = dict(params)
+    row.update({
+        "scheduled_count": 0,
+        "coverage": 0.0,
+        "balance": 0.0,
+        "conflicts": 0,
+        "score": 0.0,
+        "error": None,
+    })
+
+    success, result = logic.auto_schedule(
+        params["start_time"],
+        params["end_time"],
+        params["session_duration"],
+        params["break_time"],
+    )
+    if not success:
+        row["error"] = result
+        return row
+
+    return score_schedule(logic, needed_hours, row, result["scheduled_count"])
+
+
+def score_schedule(logic, needed_hours, row, scheduled_count):
+    # Score a schedule by coverage, day-to-day load balance and conflicts
+    daily_hours = {}
+    for session in logic.study_sessions:
+        start = datetime.strptime(session["start_time"], "%H:%M")
+        end = datetime.strptime(session["end_time"], "%H:%M")
+        hours = (end - start).seconds / 3600
+        daily_hours[session["date"]] = daily_hours.get(session["date"], 0) + hours
+
+    scheduled_hours = sum(daily_hours.values())
+    coverage = min(scheduled_hours / needed_hours, 1.0) if needed_hours else 1.0
+
+    # Balance is 1 for perfectly even days and drops with the coefficient of variation
+    balance = 1.0
+    if daily_hours:
+        mean = scheduled_hours / len(daily_hours)
+        variance = sum((h - mean) ** 2 for h in daily_hours.values()) / len(daily_hours)
+        balance = 1 / (1 + (variance ** 0.5) / mean) if mean else 0.0
+
+    conflicts = len(logic.detect_conflicts())
+
+    row.update({
+        "scheduled_count": scheduled_count,
+        "coverage": round(coverage, 4),
+        "balance": round(balance, 4),
+        "conflicts": conflicts,
+        "score": round(0.7 * coverage + 0.3 * balance - 0.1 * conflicts, 4),
+    })
+    return row
+
+
+def run_sweep(data, grid, max_workers=None):
+    """
+    Evaluate every scenario in grid against a read-only copy of data
+    and return the rows ranked best first. Nothing is written to disk.
+    """
+    snapshot = copy.deepcopy(data)
+
+    if max_workers == 1 or len(grid) <= 1:
+        _init_worker(snapshot)
+        rows = [_evaluate(params) for params in grid]
+    else:
+        with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(snapshot,)
+        ) as executor:
+            rows = list(executor.map(_evaluate, grid))
+
+    rows.sort(key=lambda r: (r["error"] is not None, -r["score"], -r["coverage"]))
+    return rows
+
+
+def run_sweep_for_file(data_file, grid, max_workers=None):
+    # Sweep scenarios for a planner data file without modifying it
+    data = {}
+    if os.path.exists(data_file):
+        with open(data_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    return run_sweep(data, grid, max_workers)
+
+
+def format_table(rows):
+    # Render ranked scenario rows as a plain-text table
+    lines = [
+        f"{'#':>3}  {'Window':<13} {'Dur':>5} {'Break':>5} {'Sessions':>8} "
+        f"{'Coverage':>8} {'Balance':>7} {'Conflicts':>9} {'Score':>6}"
+    ]
+    for rank, r in enumerate(rows, 1):
+        window = f"{r['start_time']}-{r['end_time']}"
+        if r["error"]:
+            lines.append(
+                f"{rank:>3}  {window:<13} {r['session_duration']:>5.2f} "
+                f"{r['break_time']:>5.2f}  {r['error']}"
+            )
+            continue
+        lines.append(
+            f"{rank:>3}  {window:<13} {r['session_duration']:>5.2f} {r['break_time']:>5.2f} "
+            f"{r['scheduled_count']:>8} {r['coverage']:>8.0%} {r['balance']:>7.2f} "
+            f"{r['conflicts']:>9} {r['score']:>6.2f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare auto-schedule settings")
+    parser.add_argument("data_file", nargs="?", default="study_planner_data.json")
+    parser.add_argument("--durations", default="1,1.5,2,2.5,3")
+    parser.add_argument("--breaks", default="0,0.25,0.5")
+    parser.add_argument("--windows", default="09:00-21:00,08:00-18:00,13:00-22:00")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    scenario_grid = build_grid(
+        [float(d) for d in args.durations.split(",")],
+        [float(b) for b in args.breaks.split(",")],
+        [tuple(w.split("-")) for w in args.windows.split(",")],
+    )
+    print(format_table(run_sweep_for_file(args.data_file, scenario_grid, args.workers)))
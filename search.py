@@ -0,0 +1,163 @@
+import bisect
+import heapq
+import itertools
+import re
+import threading
+
+from logic import SESSION_ADDED, SESSION_REMOVED, SESSION_UPDATED
+
+
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    # Lower-case word tokens of a piece of text
+    return TOKEN.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """
+    Inverted index from words in session notes and subject names to the
+    sessions containing them. Each word's postings are kept in date and
+    start-time order, so a search walks the rarest word's postings from
+    the start of the date range and stops at the end of the range or
+    once it has `limit` hits.
+
+    The index follows the planner's change events: adding or deleting a
+    session updates just that session's postings, other changes mark it
+    stale and it is rebuilt on the next search. The last query word also
+    matches as a prefix, for search-as-you-type.
+    """
+
+    def __init__(self, logic):
+        self.logic = logic
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._postings = {}      # token -> sorted [(date, start_time, seq)]
+        self._members = {}       # token -> {seq}
+        self._entries = {}       # id(session) -> ((date, start_time, seq), tokens)
+        self._sessions = {}      # seq -> session
+        self._vocabulary = []    # sorted tokens, for prefix lookups
+        self._version = None     # planner data_version the index matches
+        logic.subscribe(self.on_data_changed)
+
+    def close(self):
+        self.logic.unsubscribe(self.on_data_changed)
+
+    def _entry(self, session):
+        key = (session["date"], session["start_time"], next(self._seq))
+        tokens = set(tokenize(session.get("notes", ""))) | set(tokenize(session["subject"]))
+        self._entries[id(session)] = (key, tokens)
+        self._sessions[key[2]] = session
+        return key, tokens
+
+    def _add(self, session):
+        key, tokens = self._entry(session)
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = []
+                self._members[token] = set()
+                bisect.insort(self._vocabulary, token)
+            bisect.insort(self._postings[token], key)
+            self._members[token].add(key[2])
+
+    def _remove(self, session):
+        entry = self._entries.pop(id(session), None)
+        if entry is None:
+            return
+        key, tokens = entry
+        del self._sessions[key[2]]
+        for token in tokens:
+            postings = self._postings[token]
+            del postings[bisect.bisect_left(postings, key)]
+            self._members[token].discard(key[2])
+            if not postings:
+                del self._postings[token]
+                del self._members[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def rebuild(self):
+        with self._lock:
+            self._postings = {}
+            self._members = {}
+            self._entries = {}
+            self._sessions = {}
+            for session in self.logic.study_sessions:
+                key, tokens = self._entry(session)
+                for token in tokens:
+                    self._postings.setdefault(token, []).append(key)
+            for token, postings in self._postings.items():
+                postings.sort()
+                self._members[token] = {key[2] for key in postings}
+            self._vocabulary = sorted(self._postings)
+            self._version = self.logic.data_version
+
+    def on_data_changed(self, event, details):
+        # Patch the postings of one added or removed session; anything else goes stale
+        with self._lock:
+            if self._version != details["previous_version"]:
+                return
+            if event == SESSION_ADDED:
+                self._add(details["session"])
+            elif event == SESSION_REMOVED:
+                self._remove(details["session"])
+            elif event != SESSION_UPDATED:
+                # Completion and reminder flags do not touch the indexed text
+                self._version = None
+                return
+            self._version = self.logic.data_version
+
+    def _words_for(self, token, prefix):
+        # Indexed words a query word stands for
+        if not prefix:
+            return [token] if token in self._postings else []
+        start = end = bisect.bisect_left(self._vocabulary, token)
+        while end < len(self._vocabulary) and self._vocabulary[end].startswith(token):
+            end += 1
+        return self._vocabulary[start:end]
+
+    def search(self, query, start_date=None, end_date=None, limit=None):
+        """
+        Sessions containing every word of query, optionally between two
+        YYYY-MM-DD dates, ordered by date and start time.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        if self._version != self.logic.data_version:
+            self.rebuild()
+
+        with self._lock:
+            groups = []
+            for i, word in enumerate(words):
+                prefix = i == len(words) - 1 and not query[-1:].isspace()
+                group = self._words_for(word, prefix)
+                if not group:
+                    return []
+                groups.append(group)
+
+            # Walk the group with the fewest postings; check the others by membership
+            groups.sort(key=lambda group: sum(len(self._members[t]) for t in group))
+            lead, rest = groups[0], [[self._members[t] for t in group] for group in groups[1:]]
+
+            first = (start_date,) if start_date is not None else ()
+            streams = [
+                self._postings[t][bisect.bisect_left(self._postings[t], first):] for t in lead
+            ]
+            ordered = streams[0] if len(streams) == 1 else heapq.merge(*streams)
+
+            results = []
+            previous = None
+            for key in ordered:
+                if end_date is not None and key[0] > end_date:
+                    break
+                if key is previous:
+                    # The same session under two words of a prefix
+                    continue
+                previous = key
+                seq = key[2]
+                if all(any(seq in members for members in group) for group in rest):
+                    results.append(self._sessions[seq])
+                    if limit is not None and len(results) >= limit:
+                        break
+            return results
@@ -0,0 +1,477 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from logic import StudyPlannerLogic
+
+logger = logging.getLogger(__name__)
+
+# Planners kept loaded at once; the least recently used idle one is written back and closed
+DEFAULT_CAPACITY = 64
+
+# Idle time before a changed planner is written in the background
+SAVE_DELAY = 0.5
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_LINES = 100
+
+STUDENT_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class _Entry:
+    __slots__ = ("lock", "planner", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.planner = None
+        self.users = 0
+
+
+class PlannerCache:
+    """
+    LRU cache of loaded planners, one per student data file. Requests
+    for the same student run one at a time; different students run in
+    parallel on worker threads. Changes are written behind, and a planner
+    is flushed to disk before it is evicted, so a later request always
+    reloads what was last written.
+    """
+
+    def __init__(self, directory, capacity=DEFAULT_CAPACITY, save_delay=SAVE_DELAY):
+        self.directory = directory
+        self.capacity = capacity
+        self.save_delay = save_delay
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        # Write-backs of evicted planners that must finish before the file is read again
+        self._closing = {}
+
+    def path_for(self, student):
+        return os.path.join(self.directory, f"{student}.json")
+
+    def exists(self, student):
+        # Whether the student has a planner, loaded, being written back or on disk
+        return (
+            student in self._entries
+            or student in self._closing
+            or os.path.exists(self.path_for(student))
+        )
+
+    def _open(self, student):
+        return StudyPlannerLogic(self.path_for(student), save_delay=self.save_delay)
+
+    @contextlib.asynccontextmanager
+    async def checkout(self, student):
+        # Exclusive use of one student's planner, loading it on a miss
+        entry = self._entries.get(student)
+        if entry is None:
+            entry = self._entries[student] = _Entry()
+        self._entries.move_to_end(student)
+        entry.users += 1
+
+        try:
+            async with entry.lock:
+                if entry.planner is None:
+                    self.misses += 1
+                    closing = self._closing.get(student)
+                    if closing is not None:
+                        await closing
+                    entry.planner = await asyncio.to_thread(self._open, student)
+                else:
+                    self.hits += 1
+                yield entry.planner
+        finally:
+            entry.users -= 1
+            self._evict()
+
+    def _evict(self):
+        # Close least recently used idle planners until back within capacity
+        for student, entry in list(self._entries.items()):
+            if len(self._entries) <= self.capacity:
+                break
+            if entry.users:
+                continue
+
+            del self._entries[student]
+            if entry.planner is not None:
+                self.evictions += 1
+                self._write_back(student, entry.planner)
+
+    def _write_back(self, student, planner):
+        previous = self._closing.get(student)
+
+        async def close():
+            if previous is not None:
+                await previous
+            result = await asyncio.to_thread(planner.close)
+            if result is not True:
+                logger.error("Could not save planner for %s: %s", student, result[1])
+
+        def forget(done):
+            if self._closing.get(student) is done:
+                del self._closing[student]
+
+        task = asyncio.ensure_future(close())
+        self._closing[student] = task
+        task.add_done_callback(forget)
+
+    async def close(self):
+        # Write back every loaded planner
+        for student, entry in list(self._entries.items()):
+            if entry.planner is not None:
+                async with entry.lock:
+                    self._write_back(student, entry.planner)
+        self._entries.clear()
+        if self._closing:
+            await asyncio.gather(*self._closing.values())
+
+    def stats(self):
+        return {
+            "loaded": sum(1 for e in self._entries.values() if e.planner is not None),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Request handlers: run on a worker thread with the student's planner checked out
+
+def _required(body, *fields):
+    missing = [f for f in fields if body.get(f) in (None, "")]
+    if missing:
+        raise HTTPError(400, f"Missing field(s): {', '.join(missing)}")
+    return [str(body[f]).strip() for f in fields]
+
+
+def _check(result):
+    # Raise the message of a failed (is_valid, error, ...) validation tuple
+    if not result[0]:
+        raise HTTPError(400, result[1])
+    return result
+
+
+def _index(value, items):
+    try:
+        idx = int(value)
+    except ValueError:
+        raise HTTPError(404, "No such item") from None
+    if not 0 <= idx < len(items):
+        raise HTTPError(404, "No such item")
+    return idx
+
+
+def list_subjects(planner, params, body, match):
+    return [
+        dict(subject.to_dict(), index=idx, days_until_exam=planner.get_days_until_exam(subject["exam_date"]))
+        for idx, subject in enumerate(planner.subjects)
+    ]
+
+
+def add_subject(planner, params, body, match):
+    # Same checks as the add-subject dialog
+    name, exam_date = _required(body, "name", "exam_date")
+    if planner.get_subject_by_name(name) is not None:
+        raise HTTPError(400, f"Subject '{name}' already exists")
+    _, _, difficulty = _check(planner.validate_difficulty(str(body.get("difficulty", ""))))
+    _, _, past_score = _check(planner.validate_past_score(str(body.get("past_score", ""))))
+    _, date_obj = _check(planner.validate_date_format(exam_date))
+    _check(planner.validate_future_date(date_obj))
+    _, _, daily_study_hours = _check(
+        planner.validate_daily_study_hours(str(body.get("daily_study_hours", "")))
+    )
+
+    recommended_hours = planner.add_subject(name, exam_date, difficulty, past_score, daily_study_hours)
+    return 201, {"name": name, "recommended_hours": recommended_hours}
+
+
+def delete_subject(planner, params, body, match):
+    planner.delete_subject(_index(match["idx"], planner.subjects))
+    return {"deleted": True}
+
+
+def list_sessions(planner, params, body, match):
+    start = params.get("start")
+    end = params.get("end")
+    if start or end:
+        for value in (start, end):
+            if value:
+                _check(planner.validate_date_format(value))
+        planner.load_range(start or "0001-01-01", end or "9999-12-31")
+    else:
+        planner.load_all()
+
+    return [
+        dict(session.to_dict(), index=idx)
+        for idx, session in enumerate(planner.study_sessions)
+        if (not start or session["date"] >= start) and (not end or session["date"] <= end)
+    ]
+
+
+def add_session(planner, params, body, match):
+    # Same checks as the add-session dialog
+    subject, date_str, start_time, end_time = _required(
+        body, "subject", "date", "start_time", "end_time"
+    )
+    if planner.get_subject_by_name(subject) is None:
+        raise HTTPError(400, f"Unknown subject '{subject}'")
+    _, date_obj = _check(planner.validate_date_format(date_str))
+    _check(planner.validate_date_not_past(date_obj))
+    _check(planner.check_exam_date_conflict(date_obj))
+    _, _, start, end = _check(planner.validate_time_format(start_time, end_time))
+    _check(planner.validate_session_duration(subject, (end - start).seconds / 3600))
+
+    planner.add_session(subject, date_str, start_time, end_time, str(body.get("notes", "")))
+    return 201, {"index": len(planner.study_sessions) - 1}
+
+
+def delete_session(planner, params, body, match):
+    planner.delete_session(_index(match["idx"], planner.study_sessions))
+    return {"deleted": True}
+
+
+def complete_session(planner, params, body, match):
+    hours, subject = planner.complete_session(_index(match["idx"], planner.study_sessions))
+    return {"hours": hours, "subject": subject}
+
+
+def auto_schedule(planner, params, body, match):
+    start_time = str(body.get("start_time", "09:00"))
+    end_time = str(body.get("end_time", "21:00"))
+    duration = str(body.get("session_duration", 2))
+    break_time = str(body.get("break_time", 0))
+    _check(planner.validate_auto_schedule_params(start_time, end_time, duration, break_time))
+    preview = body.get("preview", False)
+    if not isinstance(preview, bool):
+        raise HTTPError(400, "preview must be true or false")
+
+    success, result = planner.auto_schedule(
+        start_time, end_time, float(duration), float(break_time), preview=preview
+    )
+    if not success:
+        raise HTTPError(400, result)
+    if "sessions" in result:
+        result["sessions"] = [s.to_dict() for s in result["sessions"]]
+    return result
+
+
+def get_conflicts(planner, params, body, match):
+    conflicts = planner.detect_conflicts()
+    return {
+        "count": len(conflicts),
+        "messages": planner.format_conflict_messages(conflicts),
+    }
+
+
+def resolve_conflicts(planner, params, body, match):
+    success, result = planner.resolve_all_conflicts()
+    if not success:
+        raise HTTPError(400, result)
+    return result
+
+
+def get_stats(planner, params, body, match):
+    stats = planner.get_statistics()
+    stats["hours_by_subject"] = planner.get_hours_by_subject()
+    return stats
+
+
+STUDENT = r"/students/(?P<student>[^/]+)"
+
+ROUTES = [
+    ("GET", STUDENT + r"/subjects", list_subjects),
+    ("POST", STUDENT + r"/subjects", add_subject),
+    ("DELETE", STUDENT + r"/subjects/(?P<idx>[^/]+)", delete_subject),
+    ("GET", STUDENT + r"/sessions", list_sessions),
+    ("POST", STUDENT + r"/sessions", add_session),
+    ("DELETE", STUDENT + r"/sessions/(?P<idx>[^/]+)", delete_session),
+    ("POST", STUDENT + r"/sessions/(?P<idx>[^/]+)/complete", complete_session),
+    ("POST", STUDENT + r"/auto-schedule", auto_schedule),
+    ("GET", STUDENT + r"/conflicts", get_conflicts),
+    ("POST", STUDENT + r"/conflicts/resolve", resolve_conflicts),
+    ("GET", STUDENT + r"/stats", get_stats),
+]
+ROUTES = [(method, re.compile(pattern + r"/?$"), handler) for method, pattern, handler in ROUTES]
+
+
+def find_route(method, path):
+    # (handler, match) for a request, or an HTTPError for unknown paths and methods
+    allowed = False
+    for route_method, pattern, handler in ROUTES:
+        match = pattern.match(path)
+        if match is None:
+            continue
+        if route_method == method:
+            return handler, match
+        allowed = True
+    if allowed:
+        raise HTTPError(405, f"{method} is not allowed here")
+    raise HTTPError(404, "Not found")
+
+
+class PlannerServer:
+    """
+    JSON-over-HTTP front end for many planners in one process. Each
+    student is addressed as /students/<id>/... and backed by <id>.json
+    in the data directory.
+    """
+
+    def __init__(self, directory, capacity=DEFAULT_CAPACITY, save_delay=SAVE_DELAY):
+        os.makedirs(directory, exist_ok=True)
+        self.cache = PlannerCache(directory, capacity, save_delay)
+
+    async def dispatch(self, method, target, body):
+        # Route one request; returns (status, payload)
+        parts = urlsplit(target)
+        path = unquote(parts.path)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        if path in ("/", "/health"):
+            if method != "GET":
+                raise HTTPError(405, f"{method} is not allowed here")
+            return 200, {"status": "ok", "cache": self.cache.stats()}
+
+        handler, match = find_route(method, path)
+        student = match["student"]
+        if not STUDENT_ID.match(student):
+            raise HTTPError(400, "Student ids may only use letters, digits, '-' and '_'")
+        # Adding the first subject starts a planner; nothing is created for other requests
+        if handler is not add_subject and not self.cache.exists(student):
+            raise HTTPError(404, f"No planner for student '{student}'")
+
+        async with self.cache.checkout(student) as planner:
+            result = await asyncio.to_thread(handler, planner, params, body, match)
+
+        if isinstance(result, tuple):
+            return result
+        return 200, result
+
+    async def handle_connection(self, reader, writer):
+        # Serve requests on one connection until the client closes it
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body, error = request
+
+                if error is not None:
+                    status, payload = error.status, {"error": error.message}
+                else:
+                    try:
+                        status, payload = await self.dispatch(method, target, body)
+                    except HTTPError as e:
+                        status, payload = e.status, {"error": e.message}
+                    except Exception as e:
+                        status, payload = 500, {"error": str(e)}
+
+                keep_alive = headers.get("connection", "").lower() != "close" and error is None
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader):
+        # (method, target, headers, body, error) or None once the client is gone
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+
+        try:
+            method, target, _ = request_line.decode("latin-1").split()
+        except ValueError:
+            return "", "", {}, None, HTTPError(400, "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return method, target, headers, None, HTTPError(400, "Bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            return method, target, headers, None, HTTPError(413, "Request body too large")
+
+        body = {}
+        if length:
+            raw = await reader.readexactly(length)
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                return method, target, headers, None, HTTPError(400, "Body must be JSON")
+            if not isinstance(body, dict):
+                return method, target, headers, None, HTTPError(400, "Body must be a JSON object")
+
+        return method.upper(), target, headers, body, None
+
+    async def _write_response(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload, default=str).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Serving planners from {self.cache.directory} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.cache.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve many study planners over HTTP")
+    parser.add_argument("directory", help="Directory with one planner JSON file per student")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(PlannerServer(args.directory, args.capacity).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
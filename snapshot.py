@@ -0,0 +1,252 @@
+import gc
+import json
+import mmap
+import struct
+import sys
+from datetime import date
+
+import numpy as np
+
+from columnar import COMPLETED, REMINDED, SessionColumns, time_to_minute
+from records import Session, Subject
+
+
+MAGIC = b"SPSNAP01"
+SNAPSHOT_EXTENSION = ".snap"
+
+# Column name and little-endian dtype, in file order
+COLUMNS = [
+    ("subject", "<u4"),
+    ("date", "<u4"),
+    ("start_time", "<u2"),
+    ("end_time", "<u2"),
+    ("notes", "<u4"),
+    ("flags", "u1"),
+]
+
+# Rows that do not fit the fixed columns are kept verbatim in the header
+IRREGULAR = 4
+
+def is_snapshot_path(path):
+    # Whether a data file path should be written as a binary snapshot
+    return str(path).endswith(SNAPSHOT_EXTENSION)
+
+
+def is_snapshot_file(path):
+    # Whether an existing file starts with the snapshot magic bytes
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_snapshot(path, subjects, sessions, settings=None):
+    """
+    Write subjects and sessions as a compact columnar snapshot:
+    magic, header length, a JSON header with the string tables and
+    column layout, then one fixed-width array per column.
+    """
+    subject_codes, date_codes, time_codes, note_codes = {}, {}, {}, {}
+    values = {name: [] for name, _ in COLUMNS}
+    irregular = []
+
+    subject_column = values["subject"]
+    date_column = values["date"]
+    start_column = values["start_time"]
+    end_column = values["end_time"]
+    notes_column = values["notes"]
+    flags_column = values["flags"]
+
+    for session in sessions:
+        # Rows that do not fit the fixed columns exactly are stored verbatim
+        try:
+            subject = session.subject
+            day = session.date
+            start = session.start_time
+            end = session.end_time
+            note = session.notes
+            completed = session.completed
+            reminded = getattr(session, "reminded", None)
+            regular = (
+                    not session._extra
+                    and type(subject) is str and type(day) is str
+                    and type(start) is str and type(end) is str and type(note) is str
+                    and type(completed) is bool and reminded in (None, True)
+            )
+        except AttributeError:
+            regular = False
+
+        if not regular:
+            irregular.append(dict(session.items()))
+            subject_column.append(0)
+            date_column.append(0)
+            start_column.append(0)
+            end_column.append(0)
+            notes_column.append(0)
+            flags_column.append(IRREGULAR)
+            continue
+
+        subject_column.append(subject_codes.setdefault(subject, len(subject_codes)))
+        date_column.append(date_codes.setdefault(day, len(date_codes)))
+        start_column.append(time_codes.setdefault(start, len(time_codes)))
+        end_column.append(time_codes.setdefault(end, len(time_codes)))
+        notes_column.append(note_codes.setdefault(note, len(note_codes)))
+        flags_column.append((COMPLETED if completed else 0) | (REMINDED if reminded else 0))
+
+    if len(time_codes) > 0xFFFF:
+        raise ValueError("Too many distinct session times for a snapshot")
+
+    arrays = {name: np.array(values[name], dtype=dtype) for name, dtype in COLUMNS}
+
+    layout = []
+    offset = 0
+    for name, dtype in COLUMNS:
+        nbytes = arrays[name].nbytes
+        layout.append([name, dtype, offset, nbytes])
+        offset += (nbytes + 7) & ~7
+
+    header = json.dumps({
+        "version": 1,
+        "count": len(sessions),
+        "subjects": [dict(s.items()) for s in subjects],
+        "settings": settings or {},
+        "tables": {
+            "subject": list(subject_codes),
+            "date": list(date_codes),
+            "time": list(time_codes),
+            "notes": list(note_codes),
+        },
+        "irregular": irregular,
+        "columns": layout,
+    }, separators=(",", ":")).encode("utf-8")
+
+    # Pad so the column block starts 8-byte aligned
+    prefix_len = len(MAGIC) + 4 + len(header)
+    padding = (-prefix_len) % 8
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * padding)
+        for name, dtype, _, nbytes in layout:
+            f.write(arrays[name].tobytes())
+            f.write(b"\0" * ((-nbytes) % 8))
+
+
+def read_snapshot(path):
+    """
+    Open a snapshot and return its subjects, sessions and settings, plus
+    ready-made analytics columns. Column data is read through a memory
+    map, so nothing but the header is parsed.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a study planner snapshot")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len))
+
+        prefix_len = len(MAGIC) + 4 + header_len
+        base = prefix_len + (-prefix_len) % 8
+        count = header["count"]
+
+        sessions = []
+        session_columns = None
+        if count:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            columns = {
+                name: np.frombuffer(buffer, dtype=dtype, count=count, offset=base + offset)
+                for name, dtype, offset, nbytes in header["columns"]
+            }
+            # Records form no reference cycles, so skip collector passes while bulk-allocating
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                sessions = _build_sessions(header, columns)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            session_columns = _build_session_columns(header, columns)
+
+            # Release the views before unmapping so the file can be replaced
+            del columns
+            buffer.close()
+
+    return {
+        "subjects": [Subject.from_dict(s) for s in header["subjects"]],
+        "study_sessions": sessions,
+        "settings": header["settings"],
+        "session_columns": session_columns,
+    }
+
+
+def _build_sessions(header, columns):
+    # Turn the code columns back into Session records
+    tables = header["tables"]
+    subject_names = [sys.intern(s) for s in tables["subject"]]
+    dates = [sys.intern(s) for s in tables["date"]]
+    times = [sys.intern(s) for s in tables["time"]]
+    notes = [sys.intern(s) for s in tables["notes"]]
+
+    irregular = iter(header["irregular"])
+    from_row = Session.from_row
+    sessions = []
+    for subject, day, start, end, note, flags in zip(
+            columns["subject"].tolist(),
+            columns["date"].tolist(),
+            columns["start_time"].tolist(),
+            columns["end_time"].tolist(),
+            columns["notes"].tolist(),
+            columns["flags"].tolist(),
+    ):
+        if flags & IRREGULAR:
+            sessions.append(Session.from_dict(next(irregular)))
+            continue
+        sessions.append(from_row(
+            subject_names[subject],
+            dates[day],
+            times[start],
+            times[end],
+            notes[note],
+            bool(flags & COMPLETED),
+            bool(flags & REMINDED),
+        ))
+    return sessions
+
+
+def _build_session_columns(header, columns):
+    # Analytics columns straight from the code columns, without a per-row pass
+    if header["irregular"]:
+        return None
+
+    tables = header["tables"]
+    date_ordinals = np.array(
+        [date.fromisoformat(d).toordinal() for d in tables["date"]],
+        dtype=np.int32,
+    )
+    minutes = np.array([time_to_minute(t) for t in tables["time"]], dtype=np.int16)
+
+    return SessionColumns.from_arrays(
+        date=date_ordinals[columns["date"]],
+        start=minutes[columns["start_time"]],
+        end=minutes[columns["end_time"]],
+        subject=columns["subject"].astype(np.int32),
+        flags=columns["flags"].copy(),
+        subject_names=list(tables["subject"]),
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from logic import StudyPlannerLogic
+
+    parser = argparse.ArgumentParser(description="Convert between planner data formats")
+    parser.add_argument("source", help="JSON file, .snap snapshot or .planner directory")
+    parser.add_argument("target", help="JSON file, .snap snapshot or .planner directory")
+    args = parser.parse_args()
+
+    planner = StudyPlannerLogic(args.source)
+    planner.write_data_file(args.target)
+    print(f"Wrote {len(planner.study_sessions)} sessions to {args.target}")
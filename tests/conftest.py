@@ -0,0 +1,27 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+# The planner modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import StudyPlannerLogic  # noqa: E402
+
+
+def days_from_today(n):
+    return (date.today() + timedelta(days=n)).isoformat()
+
+
+@pytest.fixture
+def planner():
+    # In-memory planner with one subject whose exam is a month away
+    logic = StudyPlannerLogic(None)
+    logic.add_subject("Math", days_from_today(30), 3, 70, 4)
+    return logic
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    return str(tmp_path / "planner.json")
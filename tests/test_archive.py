@@ -0,0 +1,46 @@
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def archived(planner):
+    return [(s["subject"], s["date"]) for s in planner.iter_archived_sessions()]
+
+
+def completed_planner(data_file):
+    planner = StudyPlannerLogic(data_file)
+    planner.add_subject("Math", days_from_today(30), 3, 70, 4)
+    planner.add_session("Math", days_from_today(1), "09:00", "10:00")
+    planner.complete_session(0)
+    return planner
+
+
+def test_archiving_again_after_a_failed_save_counts_sessions_once(data_file, monkeypatch):
+    planner = completed_planner(data_file)
+    monkeypatch.setattr(planner, "save_data", lambda: (False, "disk full"))
+    assert planner.archive_completed(before=days_from_today(2)) == (True, 1)
+
+    # The data file still has the session and no record of that run
+    reopened = StudyPlannerLogic(data_file)
+    assert archived(reopened) == []
+    assert reopened.archive_completed(before=days_from_today(2)) == (True, 1)
+
+    reopened = StudyPlannerLogic(data_file)
+    assert archived(reopened) == [("Math", days_from_today(1))]
+    assert reopened.get_statistics()["total_sessions"] == 1
+    assert reopened.get_hours_by_subject() == {"Math": 1.0}
+
+
+def test_rows_of_a_deleted_subject_stay_hidden_when_its_name_is_reused(data_file):
+    planner = completed_planner(data_file)
+    planner.archive_completed(before=days_from_today(2))
+    planner.delete_subject(0)
+    assert archived(planner) == []
+
+    planner.add_subject("Math", days_from_today(30), 3, 70, 4)
+    planner.add_session("Math", days_from_today(1), "14:00", "15:00")
+    planner.complete_session(0)
+    planner.archive_completed(before=days_from_today(2))
+
+    reopened = StudyPlannerLogic(data_file)
+    assert [s["start_time"] for s in reopened.iter_archived_sessions()] == ["14:00"]
+    assert reopened.get_hours_by_subject() == {"Math": 1.0}
@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+
+from conftest import days_from_today
+
+
+def test_weekday_masks_follow_the_template(planner):
+    planner.set_weekly_availability({0: [["09:00", "11:00"]], 1: None, 2: []})
+    slots = [("09:00", "10:00"), ("10:00", "11:00"), ("11:00", "12:00")]
+
+    masks = planner._compile_weekday_masks(slots)
+
+    # Monday's window holds the first two slots, Tuesday has no template, Wednesday is closed
+    assert masks[:3] == [0b011, 0b111, 0]
+    assert planner.format_availability_windows(planner.get_weekday_availability(0)) == "09:00-11:00"
+
+
+def test_availability_windows_parse_and_reject_bad_ranges(planner):
+    assert planner.parse_availability_windows("14:00-18:00, 09:00-12:00") == (
+        True, None, [["09:00", "12:00"], ["14:00", "18:00"]]
+    )
+    assert planner.parse_availability_windows("closed") == (True, None, [])
+    assert planner.parse_availability_windows("12:00-09:00")[0] is False
+
+
+def test_scheduler_keeps_to_open_days_windows_and_skips_blackouts(planner):
+    # Next Monday is a holiday
+    blackout = date.today() + timedelta(days=7 - date.today().weekday())
+    planner.set_weekly_availability({day: [["09:00", "11:00"]] if day in (0, 2) else [] for day in range(7)})
+    planner.set_blackout_dates([blackout.isoformat(), blackout.isoformat()])
+    assert planner.blackout_dates == [blackout.isoformat()]
+
+    success, result = planner.auto_schedule("08:00", "12:00", 1, 0)
+
+    assert success and result["scheduled_count"] > 0
+    for session in planner.study_sessions:
+        day = date.fromisoformat(session["date"])
+        assert day.weekday() in (0, 2) and day != blackout
+        assert "09:00" <= session["start_time"] and session["end_time"] <= "11:00"
+    assert all(s["date"] < days_from_today(30) for s in planner.study_sessions)
@@ -0,0 +1,35 @@
+import csv
+
+import batch
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def test_cohort_run_reports_every_student_and_leaves_no_side_files(tmp_path):
+    cohort = tmp_path / "cohort"
+    cohort.mkdir()
+    for student in ("ada", "bob"):
+        planner = StudyPlannerLogic(str(cohort / f"{student}.json"))
+        planner.add_subject("Math", days_from_today(30), 3, 70, 4)
+        planner._file_lock.discard()
+    report = tmp_path / "report.csv"
+
+    assert batch.run_cohort(str(cohort), str(report), max_workers=1) == 2
+
+    with open(report, newline="", encoding="utf-8") as f:
+        rows = sorted(csv.DictReader(f), key=lambda row: row["student"])
+    assert [(row["student"], row["status"]) for row in rows] == [("ada", "ok"), ("bob", "ok")]
+    assert all(int(row["scheduled_count"]) > 0 for row in rows)
+    assert sorted(path.name for path in cohort.iterdir()) == ["ada.json", "bob.json"]
+    assert len(StudyPlannerLogic(str(cohort / "ada.json")).study_sessions) > 0
+
+
+def test_an_existing_lock_file_is_left_for_its_owner(tmp_path):
+    data_file = str(tmp_path / "ada.json")
+    planner = StudyPlannerLogic(data_file)
+    planner.add_subject("Math", days_from_today(30), 3, 70, 4)
+
+    row = batch.schedule_student(data_file, "09:00", "21:00", 2.0, 0.0)
+
+    assert row["status"] == "ok"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["ada.json", "ada.json.lock"]
@@ -0,0 +1,67 @@
+import random
+
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+from records import Session, Subject
+
+
+def pair(seed=7, count=400):
+    # The same random schedule on the dict backend and on the columnar one
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        start = rng.randrange(8 * 60, 20 * 60, 15)
+        end = start + rng.choice((30, 60, 90, 120))
+        rows.append({
+            "subject": rng.choice(("Math", "Physics", "History")),
+            "date": days_from_today(rng.randrange(1, 15)),
+            "start_time": f"{start // 60:02d}:{start % 60:02d}",
+            "end_time": f"{end // 60:02d}:{end % 60:02d}",
+            "notes": "",
+            "completed": rng.random() < 0.3,
+        })
+    planners = []
+    for columnar in (False, True):
+        planner = StudyPlannerLogic(None, columnar=columnar)
+        for name in ("Math", "Physics", "History"):
+            planner.subjects.append(Subject(
+                name=name, exam_date=days_from_today(30), difficulty=3, past_score=70,
+                recommended_hours=40, hours_completed=0, daily_study_hours=4,
+            ))
+        planner.study_sessions = [Session.from_dict(row) for row in rows]
+        planners.append(planner)
+    return planners
+
+
+def overlaps(planner, date_range=None):
+    return sorted(
+        (c["session1"], c["session2"], c["date"])
+        for c in planner.detect_conflicts(date_range) if c["type"] == "overlap"
+    )
+
+
+def test_columnar_queries_match_the_dict_backend():
+    dicts, columns = pair()
+
+    assert overlaps(columns) == overlaps(dicts) != []
+    window = (days_from_today(3), days_from_today(5))
+    assert overlaps(columns, window) == overlaps(dicts, window)
+    assert columns.get_statistics() == dicts.get_statistics()
+    for completed_only in (False, True):
+        expected = dicts.get_hours_by_subject(completed_only)
+        actual = columns.get_hours_by_subject(completed_only)
+        assert actual.keys() == expected.keys()
+        assert all(abs(actual[name] - expected[name]) < 1e-9 for name in expected)
+    assert columns.get_daily_hours() == dicts.get_daily_hours()
+
+
+def test_flag_changes_patch_the_columns_in_place():
+    dicts, columns = pair()
+    built = columns.get_columns()
+    pending = next(idx for idx, s in enumerate(columns.study_sessions) if not s["completed"])
+
+    dicts.complete_session(pending)
+    columns.complete_session(pending)
+
+    assert columns.get_columns() is built
+    assert columns.get_statistics() == dicts.get_statistics()
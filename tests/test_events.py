@@ -0,0 +1,130 @@
+import pytest
+
+from conftest import days_from_today
+from logic import DATA_RESET, SESSION_ADDED, SESSION_REMOVED, SESSION_UPDATED, SUBJECT_CHANGED
+
+
+def record_events(planner):
+    # Every (event, details) the planner announces, with the data_version when heard
+    heard = []
+    planner.subscribe(lambda event, details: heard.append((event, details, planner.data_version)))
+    return heard
+
+
+def test_each_change_bumps_data_version_once(planner):
+    heard = record_events(planner)
+    changes = [
+        lambda: planner.add_subject("Physics", days_from_today(20), 2, 60, 3),
+        lambda: planner.add_session("Math", days_from_today(1), "09:00", "10:00"),
+        lambda: planner.complete_session(0),
+        lambda: planner.mark_session_reminded(0),
+        lambda: planner.delete_session(0),
+        lambda: planner.delete_subject(1),
+    ]
+
+    for change in changes:
+        version = planner.data_version
+        change()
+        assert planner.data_version == version + 1
+        _, details, heard_version = heard[-1]
+        assert details["previous_version"] == version
+        assert heard_version == version + 1
+    assert len(heard) == len(changes)
+
+
+def test_rejected_changes_leave_the_version_alone(planner):
+    heard = record_events(planner)
+    version = planner.data_version
+
+    assert not planner.delete_session(5)
+    assert not planner.delete_subject(5)
+    assert planner.complete_session(5) == (0, None)
+    planner.mark_session_reminded(5)
+    planner.get_daily_hours()
+    planner.detect_conflicts()
+
+    assert planner.data_version == version
+    assert heard == []
+
+
+def test_session_events_carry_the_row_and_its_index(planner):
+    planner.add_session("Math", days_from_today(1), "09:00", "10:00")
+    heard = record_events(planner)
+
+    planner.add_session("Math", days_from_today(2), "14:00", "16:00")
+    event, details, _ = heard[-1]
+    assert event == SESSION_ADDED
+    assert details["index"] == 1
+    assert details["session"] is planner.study_sessions[1]
+
+    planner.complete_session(1)
+    event, details, _ = heard[-1]
+    assert event == SESSION_UPDATED
+    assert details["index"] == 1
+    assert details["session"] is planner.study_sessions[1]
+    assert details["session"]["completed"]
+
+    planner.mark_session_reminded(0)
+    event, details, _ = heard[-1]
+    assert event == SESSION_UPDATED
+    assert details["index"] == 0
+    assert details["session"]["reminded"]
+
+    removed = planner.study_sessions[0]
+    planner.delete_session(0)
+    event, details, _ = heard[-1]
+    assert event == SESSION_REMOVED
+    assert details["index"] == 0
+    assert details["session"] is removed
+    assert removed not in planner.study_sessions
+
+
+def test_subject_events_name_the_subject(planner):
+    heard = record_events(planner)
+
+    planner.add_subject("Physics", days_from_today(20), 2, 60, 3)
+    event, details, _ = heard[-1]
+    assert event == SUBJECT_CHANGED
+    assert details["name"] == "Physics"
+    assert details["subject"] is planner.get_subject_by_name("Physics")
+
+    # Deleting a subject drops its sessions too, so views rebuild
+    planner.add_session("Physics", days_from_today(1), "09:00", "10:00")
+    planner.delete_subject(1)
+    event, details, _ = heard[-1]
+    assert event == DATA_RESET
+    assert set(details) == {"previous_version"}
+
+
+def expected_daily_hours(planner):
+    daily = {}
+    for session in planner.study_sessions:
+        hours = int(session["end_time"][:2]) - int(session["start_time"][:2])
+        day = daily.setdefault(session["date"], {})
+        day[session["subject"]] = day.get(session["subject"], 0.0) + hours
+    return daily
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_daily_hours_follow_each_change(planner, columnar):
+    planner.columnar = columnar
+    planner.add_subject("Physics", days_from_today(20), 2, 60, 3)
+    tomorrow = days_from_today(1)
+    changes = [
+        lambda: planner.add_session("Math", tomorrow, "09:00", "11:00"),
+        lambda: planner.add_session("Physics", tomorrow, "13:00", "14:00"),
+        lambda: planner.add_session("Math", tomorrow, "15:00", "16:00"),
+        lambda: planner.add_session("Math", days_from_today(2), "09:00", "12:00"),
+        lambda: planner.complete_session(0),
+        lambda: planner.delete_session(2),
+        lambda: planner.delete_subject(1),
+    ]
+
+    planner.get_daily_hours()
+    for change in changes:
+        change()
+        assert planner.get_daily_hours() == expected_daily_hours(planner)
+    assert planner.get_daily_hours() == {tomorrow: {"Math": 2.0}, days_from_today(2): {"Math": 3.0}}
+
+    # Unchanged data is answered from the cache
+    assert planner.get_daily_hours() is planner.get_daily_hours()
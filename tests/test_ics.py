@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import ics
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def stamp(date_str, time_str):
+    return date_str.replace("-", "") + "T" + time_str.replace(":", "") + "00"
+
+
+def test_export_reads_back_event_for_event(tmp_path, planner):
+    day = days_from_today(3)
+    planner.add_session("Math", day, "09:00", "10:30", "Chapter 4")
+    planner.add_recurring_session("Math", day, days_from_today(24), "18:00", "19:00")
+    planner.skip_occurrence(0, days_from_today(10))
+    path = str(tmp_path / "out.ics")
+
+    assert planner.export_ics(path) == (True, 3)
+
+    session, exam, series = ics.iter_events(path)
+    assert session["summary"] == "Study: Math"
+    assert session["start"] == datetime.strptime(day + " 09:00", "%Y-%m-%d %H:%M")
+    assert session["end"] - session["start"] == timedelta(minutes=90)
+
+    assert exam["all_day"] and exam["summary"] == "Exam: Math"
+    assert exam["start"].date().isoformat() == planner.subjects[0]["exam_date"]
+
+    expanded = [e["start"].date().isoformat() for e in ics.expand_event(series, datetime.max.date())]
+    assert expanded == [s["date"] for s in planner.iter_occurrences()]
+    assert days_from_today(10) not in expanded
+
+
+def test_description_survives_escaping_and_folding(tmp_path, planner):
+    notes = "Ch. 4; proofs, lemmas\\n\nthen a long tail: " + "é" * 60
+    planner.add_session("Math", days_from_today(3), "09:00", "10:00", notes)
+    path = str(tmp_path / "out.ics")
+    planner.export_ics(path)
+
+    with open(path, "rb") as f:
+        raw_lines = f.read().split(b"\r\n")
+    assert all(len(line) <= 75 for line in raw_lines)
+
+    with open(path, "r", encoding="utf-8") as f:
+        unfolded = list(ics._unfolded_lines(f))
+    [description] = [line for line in unfolded if line.startswith("DESCRIPTION:")]
+    assert ics._unescape(ics._parse_property(description)[2]) == notes
+
+
+def write_calendar(path, events):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    for properties in events:
+        lines += ["BEGIN:VEVENT", *properties, "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+
+def test_import_keeps_only_busy_time_as_per_day_blocks(tmp_path, planner):
+    day, next_day = days_from_today(2), days_from_today(3)
+    path = str(tmp_path / "in.ics")
+    write_calendar(path, [
+        # Overnight shift: split at midnight
+        ["SUMMARY:Shift", f"DTSTART:{stamp(day, '22:00')}", f"DTEND:{stamp(next_day, '02:00')}"],
+        # Weekly class, three times, with a DURATION instead of DTEND
+        ["SUMMARY:Class", f"DTSTART:{stamp(day, '09:00')}", "DURATION:PT1H30M",
+         "RRULE:FREQ=WEEKLY;COUNT=3"],
+        ["SUMMARY:Free", f"DTSTART:{stamp(day, '12:00')}", f"DTEND:{stamp(day, '13:00')}",
+         "TRANSP:TRANSPARENT"],
+        ["SUMMARY:Called off", f"DTSTART:{stamp(day, '14:00')}", f"DTEND:{stamp(day, '15:00')}",
+         "STATUS:CANCELLED"],
+        # Long ago: outside the import horizon
+        ["SUMMARY:Old", "DTSTART:20000101T090000", "DTEND:20000101T100000"],
+    ])
+
+    assert planner.import_ics(path) == (True, 5)
+
+    blocks = [(b["date"], b["start_time"], b["end_time"], b["summary"]) for b in planner.busy_events]
+    assert blocks == [
+        (day, "09:00", "10:30", "Class"),
+        (day, "22:00", ics.END_OF_DAY, "Shift"),
+        (next_day, "00:00", "02:00", "Shift"),
+        (days_from_today(9), "09:00", "10:30", "Class"),
+        (days_from_today(16), "09:00", "10:30", "Class"),
+    ]
+
+
+def test_imported_blocks_are_conflicts_the_resolver_avoids(tmp_path, planner):
+    day = days_from_today(2)
+    path = str(tmp_path / "in.ics")
+    write_calendar(path, [["SUMMARY:Lab", f"DTSTART:{stamp(day, '08:00')}", f"DTEND:{stamp(day, '12:00')}"]])
+    planner.import_ics(path)
+    planner.set_weekly_availability({})
+    planner.add_session("Math", day, "10:00", "11:00")
+
+    [conflict] = planner.detect_conflicts()
+    assert conflict["type"] == "busy_overlap" and conflict["session"] == 0
+
+    assert planner.resolve_all_conflicts()[1]["moved"] == 1
+    session = planner.study_sessions[0]
+    assert (session["date"], session["start_time"]) == (day, "12:00")
+    assert planner.detect_conflicts() == []
+
+
+def test_import_replaces_the_previous_calendar(tmp_path, planner):
+    path = str(tmp_path / "in.ics")
+    write_calendar(path, [["SUMMARY:A", f"DTSTART:{stamp(days_from_today(2), '09:00')}", "DURATION:PT1H"]])
+    planner.import_ics(path)
+    write_calendar(path, [])
+    assert planner.import_ics(path) == (True, 0)
+    assert planner.busy_events == []
+
+    success, message = planner.import_ics(str(tmp_path / "missing.ics"))
+    assert not success and "Could not read calendar" in message
+
+
+def test_empty_planner_exports_an_empty_calendar(tmp_path):
+    path = str(tmp_path / "empty.ics")
+    assert StudyPlannerLogic(None).export_ics(path) == (True, 0)
+    assert list(ics.iter_events(path)) == []
@@ -0,0 +1,196 @@
+import threading
+
+import pytest
+
+from conftest import days_from_today
+from locking import RWLock, read_locked, write_locked
+from logic import StudyPlannerLogic
+
+# Long enough for a blocked thread to show it is blocked
+WAIT = 0.2
+
+
+def in_thread(work):
+    # Start work() on a thread; the returned event is set once it has finished
+    finished = threading.Event()
+
+    def run():
+        work()
+        finished.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    return finished
+
+
+def read_once(lock):
+    with lock.reading():
+        pass
+
+
+def write_once(lock):
+    with lock.writing():
+        pass
+
+
+def test_readers_share_the_lock():
+    lock = RWLock()
+    both_reading = threading.Barrier(2, timeout=5)
+
+    def read():
+        with lock.reading():
+            both_reading.wait()
+
+    other = in_thread(read)
+    read()
+    assert other.wait(5)
+
+
+def test_writer_excludes_readers_and_writers():
+    lock = RWLock()
+    with lock.writing():
+        reader = in_thread(lambda: read_once(lock))
+        writer = in_thread(lambda: write_once(lock))
+        assert not reader.wait(WAIT)
+        assert not writer.wait(WAIT)
+    assert reader.wait(5)
+    assert writer.wait(5)
+
+
+def test_waiting_writer_blocks_new_readers():
+    lock = RWLock()
+    order = []
+    lock.acquire_read()
+
+    def write():
+        with lock.writing():
+            order.append("write")
+
+    def read():
+        with lock.reading():
+            order.append("read")
+
+    writer = in_thread(write)
+    assert not writer.wait(WAIT)
+    reader = in_thread(read)
+    assert not reader.wait(WAIT)
+
+    lock.release_read()
+    assert writer.wait(5) and reader.wait(5)
+    assert order == ["write", "read"]
+
+
+def test_nested_locks_are_reentrant():
+    lock = RWLock()
+    with lock.reading():
+        with lock.reading():
+            pass
+    with lock.writing():
+        with lock.writing():
+            with lock.reading():
+                pass
+
+    # Fully released: another thread can write
+    assert in_thread(lambda: write_once(lock)).wait(5)
+
+
+def test_reader_cannot_upgrade():
+    lock = RWLock()
+    with lock.reading():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+
+    # The failed upgrade left nothing behind
+    assert in_thread(lambda: write_once(lock)).wait(5)
+
+
+def test_decorators_hold_the_instance_lock():
+    class Counter:
+        def __init__(self):
+            self._lock = RWLock()
+            self.value = 0
+
+        @write_locked
+        def bump(self):
+            self.value += 1
+            return self.value
+
+        @read_locked
+        def read(self):
+            return self.value
+
+    counter = Counter()
+    counter._lock.acquire_read()
+    bumped = in_thread(counter.bump)
+    assert not bumped.wait(WAIT)
+    assert counter.read() == 0
+    counter._lock.release_read()
+    assert bumped.wait(5)
+    assert counter.read() == 1
+
+
+def test_after_write_runs_once_the_writer_lets_go():
+    lock = RWLock()
+    ran = []
+
+    def callback():
+        # Another thread can take the lock, so it is really released
+        ran.append(in_thread(lambda: write_once(lock)).wait(5))
+
+    with lock.writing():
+        with lock.writing():
+            lock.after_write(callback)
+        assert ran == []
+    assert ran == [True]
+
+    # Without the lock held it runs straight away
+    lock.after_write(lambda: ran.append("now"))
+    assert ran == [True, "now"]
+
+
+def test_planner_listeners_run_outside_the_lock(planner):
+    heard = []
+
+    def listener(event, details):
+        # A reader on another thread would block if the write lock were still held
+        heard.append(in_thread(planner.get_statistics).wait(5))
+
+    planner.subscribe(listener)
+    planner.add_session("Math", days_from_today(1), "09:00", "10:00")
+    assert heard == [True]
+
+
+def test_planner_survives_concurrent_reads_and_writes(planner):
+    errors = []
+    writers_done = threading.Event()
+
+    def write(n):
+        try:
+            for i in range(25):
+                planner.add_session("Math", days_from_today(1 + i % 20), "09:00", "10:00", f"writer {n}")
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            while not writers_done.is_set():
+                planner.get_statistics()
+                planner.get_daily_hours()
+                planner.search("writer")
+                planner.detect_conflicts()
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read, daemon=True) for _ in range(3)]
+    writers = [threading.Thread(target=write, args=(n,), daemon=True) for n in range(3)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join(60)
+    writers_done.set()
+    for thread in readers:
+        thread.join(60)
+
+    assert errors == []
+    assert len(planner.study_sessions) == 75
+    assert len(planner.search("writer")) == 75
+    assert sum(sum(day.values()) for day in planner.get_daily_hours().values()) == 75.0
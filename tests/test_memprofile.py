@@ -0,0 +1,42 @@
+import memprofile
+
+
+def test_measure_reports_peak_retained_and_cyclic_memory():
+    def allocate():
+        kept = [bytearray(10_000) for _ in range(20)]
+        scratch = bytearray(1_000_000)
+        del scratch
+        for _ in range(200):
+            cycle = [bytearray(1_000)]
+            cycle.append(cycle)
+        return kept
+
+    report = memprofile.measure("allocate", allocate, sessions=20)
+
+    assert report["label"] == "allocate" and report["sessions"] == 20
+    assert report["retained"] >= 200_000
+    assert report["peak"] >= report["retained"] + 1_000_000
+    assert report["cyclic"] >= 200_000
+    # Tests are not planner modules, so allocations are charged to measure()'s call
+    site, size, blocks = report["sites"][0]
+    assert site.startswith("memprofile.py:") and size >= 200_000 and blocks >= 20
+
+
+def test_format_report_lists_totals_per_session_figures_and_sites():
+    report = {
+        "label": "load_data",
+        "sessions": 4,
+        "peak": 4096,
+        "retained": 2048,
+        "cyclic": 0,
+        "sites": [("logic.py:42", 1536, 12)],
+    }
+
+    lines = memprofile.format_report([report, dict(report, label="tab", sessions=0)]).splitlines()
+
+    assert lines[0] == "load_data"
+    assert "peak     4.0 KB" in lines[1] and "retained     2.0 KB" in lines[1]
+    assert "per session: peak   1024.0 B" in lines[2] and "(4 sessions)" in lines[2]
+    assert lines[3].split() == ["1.5", "KB", "12", "blocks", "logic.py:42"]
+    # No per-session line without sessions
+    assert lines[5] == "tab" and "per session" not in lines[7]
@@ -0,0 +1,42 @@
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def test_whole_schedule_queries_see_months_still_on_disk(tmp_path, planner):
+    # Two overlapping sessions half a year out, far beyond the months loaded at startup
+    far = days_from_today(200)
+    planner.add_session("Math", far, "09:00", "11:00")
+    planner.add_session("Math", far, "10:00", "12:00")
+    planner.add_session("Math", days_from_today(1), "09:00", "10:00")
+    path = str(tmp_path / "study.planner")
+    planner.write_data_file(path)
+
+    reopened = StudyPlannerLogic(path)
+    assert len(reopened.study_sessions) == 1
+
+    assert [c["date"] for c in reopened.detect_conflicts() if c["type"] == "overlap"] == [far]
+    assert len(reopened.get_sessions_by_date()[far]) == 2
+    assert reopened.get_hours_by_subject()["Math"] == 5.0
+
+
+def test_ranged_queries_and_totals_leave_other_months_on_disk(tmp_path, planner):
+    far = days_from_today(200)
+    near = days_from_today(1)
+    planner.add_session("Math", far, "09:00", "11:00")
+    planner.add_session("Math", far, "10:00", "12:00")
+    planner.add_session("Math", near, "09:00", "10:00")
+    planner.complete_session(2)
+    path = str(tmp_path / "study.planner")
+    planner.write_data_file(path)
+
+    reopened = StudyPlannerLogic(path)
+    # Hours of months still on disk come from the manifest's per-month rollups
+    assert reopened.get_hours_by_subject() == {"Math": 5.0}
+    assert reopened.get_hours_by_subject(completed_only=True) == {"Math": 1.0}
+    assert reopened.detect_conflicts((near, near)) == []
+    assert list(reopened.get_sessions_by_date(date_range=reopened.active_window())) == [near]
+    assert len(reopened.study_sessions) == 1
+
+    # A range reaching the far month loads just that month
+    assert [c["date"] for c in reopened.detect_conflicts((far, far))] == [far]
+    assert len(reopened.study_sessions) == 3
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+
+import pytest
+
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+from persistence import WriteBehindSaver, replace_atomically
+
+
+def test_bursts_of_changes_are_coalesced_into_one_save():
+    saves = []
+    saved = threading.Event()
+
+    def save():
+        saves.append(time.monotonic())
+        saved.set()
+        return True
+
+    saver = WriteBehindSaver(save, delay=0.1)
+    for _ in range(20):
+        saver.mark_dirty()
+    assert saved.wait(5)
+    time.sleep(0.3)
+
+    assert len(saves) == 1 and not saver.dirty
+    assert saver.close() is True
+    assert len(saves) == 1
+
+
+def test_failed_saves_stay_dirty_and_close_flushes():
+    results = [(False, "disk full"), True]
+    saver = WriteBehindSaver(lambda: results.pop(0), delay=60)
+
+    saver.mark_dirty()
+    assert saver.flush() == (False, "disk full")
+    assert saver.dirty and saver.last_error == "disk full"
+
+    assert saver.close() is True
+    assert results == [] and saver.last_error is None
+
+
+def test_planner_writes_pending_changes_on_close(data_file):
+    planner = StudyPlannerLogic(data_file, save_delay=60)
+    planner.add_subject("Math", days_from_today(30), 3, 70, 4)
+    for hour in (9, 11, 13):
+        planner.add_session("Math", days_from_today(1), f"{hour:02d}:00", f"{hour + 1:02d}:00")
+    assert not os.path.exists(data_file)
+
+    assert planner.close() is True
+    assert len(StudyPlannerLogic(data_file).study_sessions) == 3
+    assert [name for name in os.listdir(os.path.dirname(data_file)) if name.endswith(".tmp")] == []
+
+
+def test_replace_atomically_keeps_the_old_file_when_a_write_fails(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.json")
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (synced.append(fd), real_fsync(fd)))
+
+    def write(text):
+        def run(temp):
+            with open(temp, "w", encoding="utf-8") as f:
+                f.write(text)
+        return run
+
+    def fail(temp):
+        write("half")(temp)
+        raise OSError("disk full")
+
+    replace_atomically(path, write("old"))
+    with pytest.raises(OSError):
+        replace_atomically(path, fail)
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "old"
+    assert os.listdir(tmp_path) == ["data.json"]
+    assert len(synced) == 1
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from logic import StudyPlannerLogic
+from records import Recurrence, Session, Subject
+
+ROW = {
+    "subject": "Math",
+    "date": "2030-01-07",
+    "start_time": "09:00",
+    "end_time": "10:00",
+    "notes": "chapter 3",
+    "completed": False,
+}
+
+
+def test_records_round_trip_through_dicts_and_the_data_file(data_file):
+    session = Session.from_dict(dict(ROW, source="import"))
+    assert session.to_dict() == dict(ROW, source="import")
+    assert session == dict(ROW, source="import") and session.copy() == session
+
+    planner = StudyPlannerLogic(data_file)
+    planner.subjects.append(Subject(name="Math", exam_date="2030-02-01", difficulty=3))
+    planner.study_sessions.append(session)
+    planner.save_data()
+    with open(data_file, encoding="utf-8") as f:
+        assert json.load(f)["study_sessions"] == [dict(ROW, source="import")]
+
+    reopened = StudyPlannerLogic(data_file)
+    assert reopened.study_sessions == [session]
+    assert reopened.subjects[0].to_dict() == {"name": "Math", "exam_date": "2030-02-01", "difficulty": 3}
+
+
+def test_records_read_like_dicts_but_have_no_room_for_new_attributes():
+    session = Session.from_dict(ROW)
+    rule = Recurrence(subject="Math", frequency="weekly")
+
+    # Unset slots behave like missing keys
+    assert "reminded" not in session and session.get("reminded") is None
+    with pytest.raises(KeyError):
+        session["reminded"]
+    with pytest.raises(KeyError):
+        del rule["weekdays"]
+    assert list(rule) == ["subject", "frequency"]
+
+    # Slotted: no per-record __dict__, so a misspelt attribute cannot be written
+    assert not hasattr(session, "__dict__")
+    with pytest.raises(AttributeError):
+        session.complete = True
+
+    # Repeated strings are shared between records, however they were built
+    other = Session.from_dict(dict(ROW, date="-".join(["2030", "01", "07"])))
+    assert other["date"] is session["date"]
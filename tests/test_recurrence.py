@@ -0,0 +1,101 @@
+import random
+from datetime import date, timedelta
+
+import recurrence
+from logic import StudyPlannerLogic
+
+MONDAY = date(2030, 1, 7)
+
+
+def rule(**fields):
+    base = {
+        "subject": "Math",
+        "start_date": MONDAY.isoformat(),
+        "end_date": (MONDAY + timedelta(days=27)).isoformat(),
+        "frequency": recurrence.WEEKLY,
+        "interval": 1,
+        "weekdays": [],
+        "start_time": "18:00",
+        "end_time": "19:00",
+        "exceptions": [],
+    }
+    base.update(fields)
+    return base
+
+
+def day(offset):
+    return (MONDAY + timedelta(days=offset)).isoformat()
+
+
+def test_weekly_rule_with_interval_and_weekdays():
+    dates = list(recurrence.iter_dates(rule(interval=2, weekdays=[0, 2])))
+    assert dates == [day(0), day(2), day(14), day(16)]
+
+
+def test_daily_rule_clipped_to_a_range_keeps_its_phase():
+    dates = list(recurrence.iter_dates(rule(frequency=recurrence.DAILY, interval=3), day(4), day(12)))
+    assert dates == [day(6), day(9), day(12)]
+
+
+def test_clipped_expansion_matches_the_full_expansion():
+    randomizer = random.Random(7)
+    for _ in range(300):
+        r = rule(
+            frequency=randomizer.choice(recurrence.FREQUENCIES),
+            interval=randomizer.randint(1, 4),
+            weekdays=randomizer.sample(range(7), randomizer.randint(0, 3)),
+            end_date=day(randomizer.randint(0, 90)),
+            exceptions=[day(randomizer.randint(0, 90)) for _ in range(3)],
+        )
+        start, end = sorted(day(randomizer.randint(-10, 100)) for _ in range(2))
+        full = list(recurrence.iter_dates(r))
+        assert list(recurrence.iter_dates(r, start, end)) == [d for d in full if start <= d <= end]
+        assert not set(full) & set(r["exceptions"])
+
+
+def make_planner(data_file=None):
+    planner = StudyPlannerLogic(data_file)
+    planner.add_subject("Math", day(60), 3, 70, 4)
+    planner.add_recurring_session("Math", day(0), day(27), "18:00", "19:00", weekdays=[0])
+    return planner
+
+
+def occurrence_dates(planner):
+    return [s["date"] for s in planner.iter_occurrences()]
+
+
+def test_skipped_occurrence_disappears():
+    planner = make_planner()
+    assert planner.skip_occurrence(0, day(7))
+    assert occurrence_dates(planner) == [day(0), day(14), day(21)]
+    assert day(7) not in planner.get_sessions_by_date()
+
+
+def test_completing_an_occurrence_turns_it_into_a_session():
+    planner = make_planner()
+
+    assert planner.complete_occurrence(0, day(14)) == (1.0, "Math")
+
+    assert occurrence_dates(planner) == [day(0), day(7), day(21)]
+    [session] = planner.study_sessions
+    assert (session["date"], session["start_time"], session["completed"]) == (day(14), "18:00", True)
+    assert session.get("recurrence") is None
+    assert planner.get_subject_by_name("Math")["hours_completed"] == 1.0
+    # The day still shows exactly one session
+    assert len(planner.get_sessions_by_date()[day(14)]) == 1
+
+    # Neither a completed nor a skipped occurrence can be completed again
+    assert planner.complete_occurrence(0, day(14)) == (0, None)
+    planner.skip_occurrence(0, day(21))
+    assert planner.complete_occurrence(0, day(21)) == (0, None)
+    assert planner.get_subject_by_name("Math")["hours_completed"] == 1.0
+
+
+def test_rules_and_exceptions_survive_a_save(data_file):
+    planner = make_planner(data_file)
+    planner.skip_occurrence(0, day(7))
+    planner.complete_occurrence(0, day(14))
+
+    reopened = StudyPlannerLogic(data_file)
+    assert occurrence_dates(reopened) == [day(0), day(21)]
+    assert [s["date"] for s in reopened.study_sessions] == [day(14)]
@@ -0,0 +1,85 @@
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def make_planner(exam_in_days=30, daily_hours=4):
+    # Every weekday open, so results do not depend on what day the tests run
+    planner = StudyPlannerLogic(None)
+    planner.add_subject("Math", days_from_today(exam_in_days), 3, 70, daily_hours)
+    planner.set_weekly_availability({})
+    return planner
+
+
+def times(planner):
+    return sorted((s["date"], s["start_time"], s["end_time"]) for s in planner.study_sessions)
+
+
+def test_overlap_moves_to_the_nearest_free_time_the_same_day():
+    planner = make_planner()
+    day = days_from_today(5)
+    planner.add_session("Math", day, "09:00", "10:00")
+    planner.add_session("Math", day, "09:30", "10:30")
+    version = planner.data_version
+
+    success, result = planner.resolve_all_conflicts()
+
+    assert success and result == {"moved": 1, "unresolved": []}
+    assert times(planner) == [(day, "09:00", "10:00"), (day, "10:00", "11:00")]
+    assert planner.detect_conflicts() == []
+    # One commit for the whole pass
+    assert planner.data_version == version + 1
+
+
+def test_daily_limit_pushes_a_session_to_the_next_day():
+    planner = make_planner(daily_hours=2)
+    day, next_day = days_from_today(5), days_from_today(6)
+    planner.add_session("Math", day, "09:00", "11:00")
+    planner.add_session("Math", day, "10:00", "12:00")
+
+    success, result = planner.resolve_all_conflicts()
+
+    assert success and result["moved"] == 1
+    assert times(planner) == [(day, "09:00", "11:00"), (next_day, "10:00", "12:00")]
+
+
+def test_completed_sessions_stay_put():
+    planner = make_planner()
+    day = days_from_today(5)
+    planner.add_session("Math", day, "09:30", "10:30")
+    planner.add_session("Math", day, "09:00", "10:00")
+    planner.complete_session(1)
+
+    planner.resolve_all_conflicts()
+
+    completed = [s for s in planner.study_sessions if s["completed"]]
+    assert [(s["start_time"], s["end_time"]) for s in completed] == [("09:00", "10:00")]
+    assert planner.detect_conflicts() == []
+
+
+def test_no_free_slot_before_the_exam_leaves_the_session_in_place():
+    # Nothing may go on the day before the exam, so only tomorrow is usable
+    planner = make_planner(exam_in_days=3, daily_hours=2)
+    day = days_from_today(1)
+    planner.add_session("Math", day, "09:00", "11:00")
+    planner.add_session("Math", day, "10:00", "12:00")
+    before = times(planner)
+    version = planner.data_version
+
+    success, result = planner.resolve_all_conflicts()
+
+    assert success and result["moved"] == 0
+    assert len(result["unresolved"]) == 1
+    assert times(planner) == before
+    assert planner.data_version == version
+
+
+def test_blackout_days_are_skipped():
+    planner = make_planner(exam_in_days=30, daily_hours=2)
+    day = days_from_today(5)
+    planner.set_blackout_dates([days_from_today(6)])
+    planner.add_session("Math", day, "09:00", "11:00")
+    planner.add_session("Math", day, "10:00", "12:00")
+
+    planner.resolve_all_conflicts()
+
+    assert times(planner)[1][0] == days_from_today(7)
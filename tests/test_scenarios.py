@@ -0,0 +1,37 @@
+import scenarios
+from conftest import days_from_today
+
+
+def test_sweep_ranks_settings_by_coverage_and_balance(planner):
+    data = {
+        "subjects": [s.to_dict() for s in planner.subjects],
+        "study_sessions": [],
+    }
+    grid = scenarios.build_grid([1, 2], [0], [("09:00", "11:00"), ("09:00", "09:30")])
+
+    rows = scenarios.run_sweep(data, grid, max_workers=1)
+
+    assert len(rows) == 4
+    # A window too short for any session sorts last with its error
+    assert [r["error"] is not None for r in rows] == [False, False, True, True]
+    assert rows[0]["score"] >= rows[1]["score"]
+    assert rows[0]["conflicts"] == 0
+    assert rows[0]["score"] == round(0.7 * rows[0]["coverage"] + 0.3 * rows[0]["balance"], 4)
+    assert planner.study_sessions == []
+
+
+def test_sweep_keeps_clear_of_repeating_sessions(planner):
+    # A daily class fills the whole window, so no scenario can place anything in it
+    planner.add_recurring_session(
+        "Math", days_from_today(0), days_from_today(40), "09:00", "11:00", frequency="daily"
+    )
+    data = {
+        "subjects": [s.to_dict() for s in planner.subjects],
+        "study_sessions": [],
+        "recurring_sessions": [r.to_dict() for r in planner.recurring_sessions],
+    }
+    grid = scenarios.build_grid([1, 2], [0], [("09:00", "11:00")])
+
+    rows = scenarios.run_sweep(data, grid, max_workers=1)
+
+    assert [(r["scheduled_count"], r["conflicts"]) for r in rows] == [(0, 0), (0, 0)]
@@ -0,0 +1,24 @@
+import os
+
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def test_preview_writes_nothing_until_applied(data_file):
+    planner = StudyPlannerLogic(data_file)
+    planner.add_subject("Math", days_from_today(10), 3, 70, 4)
+    before = sorted(os.listdir(os.path.dirname(data_file)))
+
+    success, result = planner.auto_schedule("09:00", "13:00", 2, 0, preview=True)
+    assert success and result["scheduled_count"] > 0
+    assert sorted(os.listdir(os.path.dirname(data_file))) == before
+    assert planner.study_sessions == []
+
+    planner.apply_schedule(result["sessions"])
+    assert os.path.exists(data_file + ".schedules")
+
+    # A fresh planner finds the applied plan in the cache file
+    reopened = StudyPlannerLogic(data_file)
+    success, again = reopened.auto_schedule("09:00", "13:00", 2, 0)
+    assert success and again["cached"]
+    assert again["scheduled_count"] == result["scheduled_count"]
@@ -0,0 +1,44 @@
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def test_scheduler_stops_once_demand_is_met(planner, monkeypatch):
+    # A year-long horizon with two hours of demand only looks at the first days
+    planner.subjects[0]["exam_date"] = days_from_today(365)
+    planner.subjects[0]["recommended_hours"] = 2
+    seen = []
+    iter_day_masks = planner._iter_day_masks
+
+    def counting(*args):
+        for day, mask in iter_day_masks(*args):
+            seen.append(day)
+            yield day, mask
+
+    monkeypatch.setattr(planner, "_iter_day_masks", counting)
+    success, _ = planner.auto_schedule("09:00", "21:00", 2.0, 0.0, preview=True)
+
+    assert success
+    assert 0 < len(seen) < 10
+
+
+def test_preview_changes_nothing_and_diffs_against_the_schedule(data_file):
+    planner = StudyPlannerLogic(data_file)
+    planner.add_subject("Math", days_from_today(10), 3, 70, 4)
+    planner.add_session("Math", days_from_today(1), "18:00", "19:00")
+    with open(data_file, "rb") as f:
+        saved = f.read()
+    version = planner.data_version
+    events = []
+    planner.subscribe(lambda event, details: events.append(event))
+
+    success, result = planner.auto_schedule("09:00", "13:00", 2, 0, preview=True)
+
+    assert success and result["sessions"]
+    assert events == [] and planner.data_version == version
+    assert [s["start_time"] for s in planner.study_sessions] == ["18:00"]
+    with open(data_file, "rb") as f:
+        assert f.read() == saved
+    diff = result["diff"]
+    assert [old["start_time"] for old, new in diff["moved"]] == ["18:00"]
+    assert len(diff["added"]) + len(diff["moved"]) == result["scheduled_count"]
+    assert diff["removed"] == [] and diff["unchanged"] == 0
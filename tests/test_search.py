@@ -0,0 +1,88 @@
+import random
+
+from conftest import days_from_today
+from search import tokenize
+
+
+def add(planner, day, start, notes):
+    planner.add_session("Math", days_from_today(day), start, start[:3] + "59", notes)
+
+
+def found(planner, query, **kwargs):
+    return [(s["date"], s["start_time"], s["notes"]) for s in planner.search(query, **kwargs)]
+
+
+def test_every_word_must_match_and_the_last_may_be_a_prefix(planner):
+    add(planner, 2, "09:00", "Integrals review")
+    add(planner, 1, "14:00", "Integral practice")
+    add(planner, 1, "09:00", "Limits practice")
+
+    assert [n for _, _, n in found(planner, "practice")] == ["Limits practice", "Integral practice"]
+    assert [n for _, _, n in found(planner, "INTEGRAL practice")] == ["Integral practice"]
+    assert [n for _, _, n in found(planner, "integ")] == ["Integral practice", "Integrals review"]
+    # A finished word (followed by a space) is not a prefix any more
+    assert found(planner, "integ ") == []
+    assert [n for _, _, n in found(planner, "math prac")] == ["Limits practice", "Integral practice"]
+    assert found(planner, "limits review") == []
+    assert found(planner, "   ") == []
+
+
+def test_date_range_and_limit(planner):
+    for day in range(1, 6):
+        add(planner, day, "09:00", f"Chapter {day}")
+
+    dates = [d for d, _, _ in found(planner, "chapter", date_range=(days_from_today(2), days_from_today(4)))]
+    assert dates == [days_from_today(2), days_from_today(3), days_from_today(4)]
+    assert [d for d, _, _ in found(planner, "chapter", limit=2)] == [days_from_today(1), days_from_today(2)]
+    assert len(found(planner, "chapter", date_range=(days_from_today(4), None))) == 2
+
+
+def test_deleted_sessions_leave_the_index(planner):
+    add(planner, 1, "09:00", "Eigenvalues")
+    add(planner, 2, "09:00", "Eigenvectors")
+    assert len(found(planner, "eigen")) == 2
+
+    planner.delete_session(0)
+
+    assert found(planner, "eigenvalues") == []
+    assert [n for _, _, n in found(planner, "eigen")] == ["Eigenvectors"]
+    planner.delete_session(0)
+    assert found(planner, "eigen") == []
+    assert found(planner, "math") == []
+
+
+def test_moved_and_completed_sessions_are_found_where_they_are_now(planner):
+    planner.set_weekly_availability({})
+    add(planner, 3, "09:00", "Series")
+    add(planner, 3, "09:30", "Sequences")
+    planner.search("series")
+    planner.complete_session(0)
+
+    assert planner.resolve_all_conflicts()[1]["moved"] == 1
+
+    assert found(planner, "sequences") == [(days_from_today(3), "09:59", "Sequences")]
+    assert [s["completed"] for s in planner.search("series")] == [True]
+
+
+def test_matches_a_scan_through_random_edits(planner):
+    randomizer = random.Random(3)
+    words = ["alpha", "beta", "gamma", "delta", "alps", "bet"]
+
+    def scan(query):
+        terms = tokenize(query)
+        matches = []
+        for s in planner.study_sessions:
+            tokens = set(tokenize(s["notes"])) | set(tokenize(s["subject"]))
+            if all(t in tokens for t in terms[:-1]) and any(t.startswith(terms[-1]) for t in tokens):
+                matches.append(s)
+        return sorted(matches, key=lambda s: (s["date"], s["start_time"]))
+
+    for step in range(300):
+        if planner.study_sessions and randomizer.random() < 0.3:
+            planner.delete_session(randomizer.randrange(len(planner.study_sessions)))
+        else:
+            notes = " ".join(randomizer.sample(words, 2))
+            add(planner, randomizer.randint(1, 20), f"{randomizer.randint(8, 20):02d}:00", notes)
+        if step % 10 == 0:
+            query = " ".join(randomizer.sample(words, randomizer.randint(1, 2)))[:-1]
+            assert [id(s) for s in planner.search(query)] == [id(s) for s in scan(query)]
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import logging
+
+from conftest import days_from_today
+from server import PlannerServer
+
+MATH = {
+    "name": "Math",
+    "exam_date": days_from_today(30),
+    "difficulty": "3",
+    "past_score": "70",
+    "daily_study_hours": "4",
+}
+
+
+async def send(server, method, target, body=None):
+    # One HTTP request on its own connection; returns (status, payload)
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+        + data
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    payload = json.loads(await reader.read())
+    writer.close()
+    await writer.wait_closed()
+    return int(status_line.split()[1]), payload
+
+
+def run(tmp_path, scenario, **options):
+    # Serve tmp_path on a free port for the length of scenario(planners, server)
+    async def main():
+        planners = PlannerServer(str(tmp_path), **options)
+        server = await asyncio.start_server(planners.handle_connection, "127.0.0.1", 0)
+        try:
+            async with server:
+                return await scenario(planners, server)
+        finally:
+            await planners.cache.close()
+
+    return asyncio.run(main())
+
+
+def test_unknown_students_get_404_and_leave_no_files(tmp_path):
+    async def scenario(planners, server):
+        assert (await send(server, "GET", "/students/nobody/subjects"))[0] == 404
+        assert (await send(server, "POST", "/students/nobody/auto-schedule", {}))[0] == 404
+
+    run(tmp_path, scenario)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_students_are_created_by_adding_a_subject(tmp_path):
+    async def scenario(planners, server):
+        assert (await send(server, "POST", "/students/ada/subjects", MATH))[0] == 201
+        status, subjects = await send(server, "GET", "/students/ada/subjects")
+        assert status == 200
+        assert [s["name"] for s in subjects] == ["Math"]
+
+    run(tmp_path, scenario)
+    assert (tmp_path / "ada.json").exists()
+
+
+def test_auto_schedule_preview_writes_nothing(tmp_path):
+    async def scenario(planners, server):
+        await send(server, "POST", "/students/ada/subjects", MATH)
+
+        status, result = await send(server, "POST", "/students/ada/auto-schedule", {"preview": True})
+        assert status == 200 and result["sessions"]
+        assert (await send(server, "GET", "/students/ada/sessions"))[1] == []
+
+        status, result = await send(server, "POST", "/students/ada/auto-schedule", {"preview": "false"})
+        assert status == 400 and "preview" in result["error"]
+
+        status, result = await send(server, "POST", "/students/ada/auto-schedule", {})
+        assert status == 200
+        return result["scheduled_count"]
+
+    scheduled = run(tmp_path, scenario)
+    with open(tmp_path / "ada.json", encoding="utf-8") as f:
+        assert len(json.load(f)["study_sessions"]) == scheduled > 0
+
+
+def test_evicted_planners_are_written_back_and_reloaded(tmp_path):
+    async def scenario(planners, server):
+        await send(server, "POST", "/students/ada/subjects", MATH)
+        await send(server, "POST", "/students/bob/subjects", MATH)
+        stats = planners.cache.stats()
+        assert (stats["loaded"], stats["evictions"]) == (1, 1)
+
+        status, subjects = await send(server, "GET", "/students/ada/subjects")
+        assert status == 200 and [s["name"] for s in subjects] == ["Math"]
+        assert planners.cache.stats()["misses"] == 3
+
+    run(tmp_path, scenario, capacity=1, save_delay=60)
+
+
+def test_failed_write_back_is_logged(tmp_path, caplog):
+    async def scenario(planners, server):
+        await send(server, "POST", "/students/ada/subjects", MATH)
+        planners.cache._entries["ada"].planner.close = lambda: (False, "disk full")
+        await send(server, "POST", "/students/bob/subjects", MATH)
+        await asyncio.gather(*planners.cache._closing.values())
+
+    with caplog.at_level(logging.ERROR, logger="server"):
+        run(tmp_path, scenario, capacity=1)
+    assert "Could not save planner for ada: disk full" in caplog.text
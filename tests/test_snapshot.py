@@ -0,0 +1,44 @@
+import snapshot
+from conftest import days_from_today
+from logic import StudyPlannerLogic
+
+
+def contents(planner):
+    return (
+        [s.to_dict() for s in planner.subjects],
+        [s.to_dict() for s in planner.study_sessions],
+        planner._get_settings(),
+    )
+
+
+def test_snapshot_export_load_and_save_round_trip(tmp_path, data_file):
+    planner = StudyPlannerLogic(data_file)
+    planner.add_subject("Math", days_from_today(30), 3, 70, 4)
+    planner.add_subject("Physics", days_from_today(40), 2, 60, 3)
+    planner.add_session("Math", days_from_today(1), "09:00", "10:30", "chapter 3")
+    planner.add_session("Physics", days_from_today(2), "14:00", "15:00")
+    planner.add_session("Math", days_from_today(2), "14:30", "16:00")
+    planner.complete_session(1)
+    planner.mark_session_reminded(0)
+    planner.study_sessions[2]["source"] = "import"
+    planner.set_blackout_dates([days_from_today(5)])
+    planner.add_recurring_session("Math", days_from_today(0), days_from_today(20), "18:00", "19:00")
+    planner.save_data()
+
+    path = str(tmp_path / "planner.snap")
+    planner.export_snapshot(path)
+    assert snapshot.is_snapshot_file(path) and not snapshot.is_snapshot_file(data_file)
+
+    loaded = StudyPlannerLogic(path)
+    assert contents(loaded) == contents(planner)
+    assert loaded.get_statistics() == planner.get_statistics()
+    assert loaded.detect_conflicts() == planner.detect_conflicts()
+
+    # Saving keeps the snapshot format; with only regular rows the columns come ready-made
+    del loaded.study_sessions[2]["source"]
+    loaded.add_session("Physics", days_from_today(3), "09:00", "10:00")
+    reloaded = StudyPlannerLogic(path)
+    assert snapshot.is_snapshot_file(path)
+    assert contents(reloaded) == contents(loaded)
+    assert reloaded._columns is not None
+    assert reloaded.get_statistics() == loaded.get_statistics()
@@ -0,0 +1,244 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import logic
+from conftest import days_from_today
+from locking import FileLock
+from logic import DATA_RESET, StudyPlannerLogic
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+def saved_sessions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["study_sessions"]
+
+
+def test_merge_in_background_save_is_announced_on_the_callers_thread(data_file):
+    other = StudyPlannerLogic(data_file)
+    other.add_subject("Math", days_from_today(30), 3, 70, 4)
+    planner = StudyPlannerLogic(data_file, save_delay=0.01)
+
+    heard = []
+    planner.subscribe(lambda event, details: heard.append((event, threading.current_thread())))
+
+    other.add_session("Math", days_from_today(1), "09:00", "10:00")
+    planner.add_session("Math", days_from_today(2), "11:00", "12:00")
+
+    # The saver thread finds the other edit on disk and merges it in
+    wait_for(lambda: len(saved_sessions(data_file)) == 2)
+    assert len(planner.study_sessions) == 2
+    assert all(thread is threading.current_thread() for _, thread in heard)
+
+    assert planner.reload_changes() is True
+    assert heard[-1] == (DATA_RESET, threading.current_thread())
+    assert planner.reload_changes() is False
+    planner.close()
+
+
+def open_pair(data_file):
+    # Two planners on one file, as if in two processes; the second keeps its edits unsaved
+    first = StudyPlannerLogic(data_file)
+    first.add_subject("Math", days_from_today(30), 3, 70, 4)
+    first.add_session("Math", days_from_today(1), "09:00", "10:00")
+    second = StudyPlannerLogic(data_file, save_delay=60)
+    return first, second
+
+
+def slots(planner):
+    return sorted((s["date"], s["start_time"], s["completed"]) for s in planner.study_sessions)
+
+
+def test_save_merges_sessions_both_sides_added(data_file):
+    first = StudyPlannerLogic(data_file)
+    first.add_subject("Math", days_from_today(30), 3, 70, 4)
+    second = StudyPlannerLogic(data_file)
+
+    first.add_session("Math", days_from_today(1), "09:00", "10:00")
+    second.add_session("Math", days_from_today(2), "09:00", "10:00")
+
+    expected = [(days_from_today(1), "09:00", False), (days_from_today(2), "09:00", False)]
+    assert slots(second) == expected
+    assert slots(StudyPlannerLogic(data_file)) == expected
+
+
+@pytest.mark.parametrize("name", ["planner.snap", "study.planner"])
+def test_snapshot_and_partitioned_saves_merge_both_sides(tmp_path, name):
+    path = str(tmp_path / name)
+    first = StudyPlannerLogic(path)
+    first.add_subject("Math", days_from_today(30), 3, 70, 4)
+    second = StudyPlannerLogic(path)
+
+    first.add_session("Math", days_from_today(1), "09:00", "10:00")
+    second.add_session("Math", days_from_today(2), "09:00", "10:00")
+
+    expected = [(days_from_today(1), "09:00", False), (days_from_today(2), "09:00", False)]
+    assert slots(second) == expected
+    assert slots(StudyPlannerLogic(path)) == expected
+
+
+@pytest.mark.parametrize("name", ["planner.snap", "study.planner"])
+def test_snapshot_and_partitioned_reload_keeps_unsaved_changes(tmp_path, name):
+    first, second = open_pair(str(tmp_path / name))
+    second.add_session("Math", days_from_today(3), "09:00", "10:00")
+    first.add_session("Math", days_from_today(2), "14:00", "15:00")
+
+    assert second.disk_changed() is True
+    assert second.reload_changes() is True
+    assert slots(second) == [
+        (days_from_today(1), "09:00", False),
+        (days_from_today(2), "14:00", False),
+        (days_from_today(3), "09:00", False),
+    ]
+
+    assert second.flush() is True
+    assert slots(StudyPlannerLogic(str(tmp_path / name))) == slots(second)
+    second.close()
+
+
+def test_reload_patches_their_changes_and_keeps_unsaved_ones(data_file):
+    first, second = open_pair(data_file)
+    events = []
+    second.subscribe(lambda event, details: events.append(event))
+
+    second.add_session("Math", days_from_today(3), "09:00", "10:00")
+    first.delete_session(0)
+    first.add_session("Math", days_from_today(2), "14:00", "15:00")
+    first.add_subject("Physics", days_from_today(40), 2, 60, 3)
+    del events[:]
+
+    assert second.reload_changes() is True
+    assert sorted(events) == ["session_added", "session_removed", "subject_changed"]
+    assert slots(second) == [(days_from_today(2), "14:00", False), (days_from_today(3), "09:00", False)]
+    assert second.get_subject_names() == ["Math", "Physics"]
+
+    assert second.flush() is True
+    assert slots(StudyPlannerLogic(data_file)) == slots(second)
+    second.close()
+
+
+def test_the_same_edit_on_both_sides_is_applied_once(data_file):
+    first, second = open_pair(data_file)
+    first.complete_session(0)
+    second.complete_session(0)
+
+    second.reload_changes()
+
+    assert slots(second) == [(days_from_today(1), "09:00", True)]
+    assert second.get_subject_by_name("Math")["hours_completed"] == 1.0
+    second.close()
+
+
+def test_their_edit_wins_over_our_delete(data_file):
+    first, second = open_pair(data_file)
+    first.complete_session(0)
+    second.delete_session(0)
+
+    second.reload_changes()
+
+    assert slots(second) == [(days_from_today(1), "09:00", True)]
+    second.close()
+
+
+def test_too_many_changes_reload_as_one_reset(data_file, monkeypatch):
+    monkeypatch.setattr(logic, "RELOAD_EVENT_LIMIT", 2)
+    first, second = open_pair(data_file)
+    events = []
+    second.subscribe(lambda event, details: events.append(event))
+    for hour in (10, 11, 12):
+        first.add_session("Math", days_from_today(1), f"{hour}:00", f"{hour}:30")
+
+    second.reload_changes()
+
+    assert events == [DATA_RESET]
+    assert len(second.study_sessions) == 4
+    second.close()
+
+
+ADD_SESSIONS = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from logic import StudyPlannerLogic
+planner = StudyPlannerLogic(sys.argv[2])
+for i in range(int(sys.argv[4])):
+    planner.add_session("Math", "2030-01-01", f"{i // 60:02d}:{i % 60:02d}", "23:59", sys.argv[3])
+"""
+
+
+def test_processes_saving_at_once_lose_nothing(data_file):
+    StudyPlannerLogic(data_file).add_subject("Math", days_from_today(30), 3, 70, 4)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    workers = [
+        subprocess.Popen([sys.executable, "-c", ADD_SESSIONS, root, data_file, f"worker {n}", "40"])
+        for n in range(3)
+    ]
+    assert [worker.wait(timeout=120) for worker in workers] == [0, 0, 0]
+
+    notes = [s["notes"] for s in StudyPlannerLogic(data_file).study_sessions]
+    assert sorted(notes) == sorted(f"worker {n}" for n in range(3) for _ in range(40))
+
+
+def test_file_lock_excludes_other_holders_and_refuses_upgrades(data_file):
+    lock, other = FileLock(data_file), FileLock(data_file)
+    acquired = threading.Event()
+
+    def take_shared():
+        with other.shared():
+            acquired.set()
+
+    with lock.exclusive():
+        # Re-entrant for the holding thread
+        with lock.shared():
+            pass
+        waiter = threading.Thread(target=take_shared, daemon=True)
+        waiter.start()
+        assert not acquired.wait(0.2)
+    assert acquired.wait(5)
+    waiter.join()
+
+    with lock.shared():
+        with pytest.raises(RuntimeError):
+            with lock.exclusive():
+                pass
+
+
+def test_discarded_file_lock_still_excludes_waiting_holders(data_file):
+    lock, waiting, late = FileLock(data_file), FileLock(data_file), FileLock(data_file)
+    holding, release = threading.Event(), threading.Event()
+
+    def hold():
+        with waiting.exclusive():
+            holding.set()
+            release.wait(5)
+
+    with lock.exclusive():
+        waiter = threading.Thread(target=hold, daemon=True)
+        waiter.start()
+        assert not holding.wait(0.2)
+        lock.discard()
+
+    # The waiter moved on to a fresh side file, which newcomers lock too
+    assert holding.wait(5)
+    acquired = threading.Event()
+
+    def take():
+        with late.exclusive():
+            acquired.set()
+
+    threading.Thread(target=take, daemon=True).start()
+    assert not acquired.wait(0.2)
+    release.set()
+    assert acquired.wait(5)
+    waiter.join()
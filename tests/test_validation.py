@@ -0,0 +1,66 @@
+from itertools import product
+
+from conftest import days_from_today
+
+
+def dialog_errors(planner, row):
+    # The add-session dialog's checks, in its order; it stops at the first failure
+    is_valid, date_obj = planner.validate_date_format(row["date"])
+    if not is_valid:
+        return [date_obj]
+    for is_valid, error in (
+        planner.validate_date_not_past(date_obj),
+        planner.check_exam_date_conflict(date_obj),
+    ):
+        if not is_valid:
+            return [error]
+    is_valid, error, start, end = planner.validate_time_format(row["start_time"], row["end_time"])
+    if not is_valid:
+        return [error]
+    is_valid, error = planner.validate_session_duration(row["subject"], (end - start).seconds / 3600)
+    return [] if is_valid else [error]
+
+
+def test_validate_sessions_agrees_with_the_single_validators(planner):
+    planner.add_subject("Physics", days_from_today(10), 2, 60, 1)
+    dates = [days_from_today(1), days_from_today(-1), days_from_today(30), "2030-13-01", "tomorrow"]
+    times = [("09:00", "10:00"), ("09:00", "12:00"), ("11:00", "10:00"), ("9am", "10:00")]
+    rows = [
+        {"subject": subject, "date": date, "start_time": start, "end_time": end}
+        for subject, date, (start, end) in product(("Math", "Physics"), dates, times)
+    ]
+
+    results = planner.validate_sessions(rows)
+
+    for row, errors in zip(rows, results):
+        expected = dialog_errors(planner, row)
+        # The batch reports every problem; the dialog shows the first one
+        assert errors[:1] == expected, row
+    assert planner.validate_sessions([{"subject": "Art", "date": days_from_today(1),
+                                        "start_time": "09:00", "end_time": "10:00"}])[0] != []
+
+
+def test_validate_subjects_agrees_with_the_single_validators(planner):
+    rows = [
+        {"name": "Chemistry", "exam_date": days_from_today(20), "difficulty": "3",
+         "past_score": "70", "daily_study_hours": "4"},
+        {"name": "Math", "exam_date": days_from_today(20), "difficulty": "3",
+         "past_score": "70", "daily_study_hours": "4"},
+        {"name": "Biology", "exam_date": days_from_today(0), "difficulty": "9",
+         "past_score": "abc", "daily_study_hours": "0"},
+        {"name": "Chemistry", "exam_date": "soon", "difficulty": "1",
+         "past_score": "100", "daily_study_hours": "2"},
+    ]
+
+    results = planner.validate_subjects(rows)
+
+    assert results[0] == []
+    assert results[1] == ["Subject 'Math' already exists"]
+    _, date_obj = planner.validate_date_format(rows[2]["exam_date"])
+    assert results[2] == [
+        planner.validate_difficulty("9")[1],
+        planner.validate_past_score("abc")[1],
+        planner.validate_daily_study_hours("0")[1],
+        planner.validate_future_date(date_obj)[1],
+    ]
+    assert results[3] == ["Subject 'Chemistry' already exists", planner.validate_date_format("soon")[1]]
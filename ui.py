@@ -1,33 +1,174 @@
+import calendar
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime
-from logic import StudyPlannerLogic
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, filedialog, messagebox
+from datetime import date, datetime, timedelta
+from logic import (
+    StudyPlannerLogic,
+    WEEKDAY_NAMES,
+    DATA_RESET,
+    SESSION_ADDED,
+    SESSION_REMOVED,
+    SESSION_UPDATED,
+    SUBJECT_CHANGED,
+)
+import memprofile
+import recurrence
+import scenarios
+
+
+# Idle seconds before edits are written to disk in the background
+SAVE_DELAY = 0.5
+
+# How often the window checks whether background loading has finished
+LOAD_POLL_MS = 50
+
+# How often the settings comparison checks whether its sweep has finished
+SWEEP_POLL_MS = 100
+
+# How often the data file is checked for changes saved by other programs
+WATCH_POLL_MS = 1000
+
+# Pause after the last keystroke before the schedule search runs, and cards shown per search
+SEARCH_DELAY_MS = 150
+SEARCH_LIMIT = 200
+
+# Colors given to subjects in the calendar, in subject order
+SUBJECT_COLORS = [
+    "#8B008B", "#38b2ac", "#ed8936", "#667eea", "#e53e3e",
+    "#48bb78", "#d69e2e", "#3182ce", "#b83280", "#718096",
+]
+
+# Calendar heat scale from an empty day to the busiest day in view
+HEAT_EMPTY = (245, 245, 245)
+HEAT_FULL = (139, 0, 139)
 
 
 class IntelligentStudyPlannerUI:
 
-    def __init__(self, root):
+    def __init__(self, root, started_at=None, report_timing=False, report_memory=False):
         self.root = root
         self.root.title("Intelligent Study Planner")
         self.root.geometry("1200x800")
         self.root.configure(bg="#f0f4ff")
 
-        # Initialize logic layer
-        self.logic = StudyPlannerLogic()
+        # Seconds from startup to first paint and to data ready
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.startup_metrics = {}
+        self.report_timing = report_timing
+
+        # Open the memory report window once the data is loaded
+        self.report_memory = report_memory
+
+        # Off while tabs are rebuilt for profiling, so no modal alert pauses the measurement
+        self.alerts_enabled = True
+
+        # The logic layer is created on a background thread
+        self.logic = None
+        self.load_results = queue.Queue()
+
+        # Pending saves must reach the disk before the window goes away
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Create main container
         self.create_widgets()
+        self.show_loading()
+
+        # Idle callbacks run after the skeleton is drawn
+        self.root.after_idle(self.record_first_paint)
+
+        threading.Thread(target=self.load_in_background, daemon=True).start()
+        self.root.after(LOAD_POLL_MS, self.finish_loading)
+
+    # Startup
+
+    def show_loading(self):
+        # Placeholder shown in the content area until the data is loaded
+        self.loading_frame = tk.Frame(self.content_frame, bg="#f0f4ff")
+        self.loading_frame.pack(expand=True)
+
+        tk.Label(
+            self.loading_frame,
+            text="⏳ Loading your study plan...",
+            font=("Arial", 14),
+            bg="#f0f4ff",
+            fg="#4a5568",
+        ).pack(pady=(0, 10))
+
+        progress = ttk.Progressbar(self.loading_frame, mode="indeterminate", length=250)
+        progress.pack()
+        progress.start(15)
+
+        for btn in self.tab_buttons():
+            btn.config(state="disabled")
+
+    def record_first_paint(self):
+        self.startup_metrics["first_paint"] = time.perf_counter() - self.started_at
+
+    def load_in_background(self):
+        # Read the data file and warm up the ML model off the UI thread
+        try:
+            logic = StudyPlannerLogic(save_delay=SAVE_DELAY)
+            logic.prepare_predictions()
+            self.load_results.put((True, logic))
+        except Exception as e:
+            self.load_results.put((False, str(e)))
+
+    def finish_loading(self):
+        # Poll for the background load and populate the tabs once it is done
+        try:
+            success, result = self.load_results.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self.finish_loading)
+            return
+
+        if not success:
+            messagebox.showerror("Loading Failed", f"Could not load your study plan:\n{result}")
+            self.root.destroy()
+            return
+
+        self.logic = result
+        self.startup_metrics["data_ready"] = time.perf_counter() - self.started_at
+
+        # Built tabs are patched in place as the data changes
+        self.logic.subscribe(self.on_data_changed)
+
+        self.loading_frame.destroy()
+        for btn in self.tab_buttons():
+            btn.config(state="normal")
 
         # Start reminder checks
         self.check_reminders()
 
+        # Pick up edits other planner windows or scripts save to the same file
+        self.root.after(WATCH_POLL_MS, self.watch_data_file)
+
         # Show subjects tab by default
         self.show_subjects_tab()
 
+        if self.report_timing:
+            print(
+                f"first paint: {self.startup_metrics.get('first_paint', 0) * 1000:.0f} ms, "
+                f"data ready: {self.startup_metrics['data_ready'] * 1000:.0f} ms"
+            )
+
+        if self.report_memory:
+            self.root.after_idle(self.show_memory_report)
+
     # UI setup
 
     def create_widgets(self):
         # Create main UI structure
+        # Menu bar
+        menubar = tk.Menu(self.root)
+        debug_menu = tk.Menu(menubar, tearoff=0)
+        debug_menu.add_command(label="Memory Report...", command=self.show_memory_report)
+        menubar.add_cascade(label="Debug", menu=debug_menu)
+        self.root.config(menu=menubar)
+
         # Header
         header_frame = tk.Frame(self.root, bg="#8B008B", height=100)
         header_frame.pack(fill="x", pady=(0, 20))
@@ -78,35 +219,95 @@ class IntelligentStudyPlannerUI:
         )
         self.dashboard_btn.pack(side="left", padx=5)
 
+        self.calendar_btn = tk.Button(
+            tab_frame, text="🗓️ Calendar", command=self.show_calendar_tab, **btn_style
+        )
+        self.calendar_btn.pack(side="left", padx=5)
+
         # Content frame
         self.content_frame = tk.Frame(self.root, bg="#f0f4ff")
         self.content_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
+        # Built tab frames and the data version each was built from
+        self.tab_frames = {}
+        self.current_tab = None
+
+        # Widgets of each built tab that change events patch directly
+        self.tab_views = {}
+
+        # First month and number of months shown in the calendar
+        self.calendar_start = date.today().replace(day=1)
+        self.calendar_months = 3
+
+        # Text in the schedule search box and its pending (debounced) search
+        self.schedule_query = ""
+        self.search_job = None
+
+        # Runs settings comparisons in the background, created on first use
+        self.sweep_executor = None
+
+    def tab_buttons(self):
+        return [self.subjects_btn, self.schedule_btn, self.dashboard_btn, self.calendar_btn]
+
     def highlight_tab(self, active_btn):
         # Highlight the active tab button
-        for btn in [self.subjects_btn, self.schedule_btn, self.dashboard_btn]:
+        for btn in self.tab_buttons():
             btn.config(bg="#D8B9FF", fg="#8B008B")
         active_btn.config(bg="#8B008B", fg="white")
 
-    def clear_content(self):
-        # Clear the content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+    def show_tab(self, name, button, build):
+        # Show a tab's cached frame, rebuilding it only if the data changed since
+        self.highlight_tab(button)
+
+        frame, version = self.tab_frames.get(name, (None, None))
+        if frame is None or version != self.logic.data_version:
+            if frame is not None:
+                if frame is self.current_tab:
+                    self.current_tab = None
+                frame.destroy()
+            frame = tk.Frame(self.content_frame, bg="#f0f4ff")
+            build(frame)
+            self.tab_frames[name] = (frame, self.logic.data_version)
+
+        if self.current_tab is not None and self.current_tab is not frame:
+            self.current_tab.pack_forget()
+        frame.pack(fill="both", expand=True)
+        self.current_tab = frame
+
+    def on_data_changed(self, event, details):
+        # Patch built tabs in place; a tab that cannot be patched is rebuilt when shown
+        patchers = {
+            "subjects": self.patch_subjects_tab,
+            "schedule": self.patch_schedule_tab,
+            "dashboard": self.patch_dashboard_tab,
+            "calendar": self.patch_calendar_tab,
+        }
+        for name, (frame, version) in list(self.tab_frames.items()):
+            if event == DATA_RESET or version != details["previous_version"]:
+                continue
+            if patchers[name](event, details):
+                self.tab_frames[name] = (frame, self.logic.data_version)
+
+        # The visible tab cannot wait for the next switch
+        for name, (frame, version) in list(self.tab_frames.items()):
+            if frame is self.current_tab and version != self.logic.data_version:
+                getattr(self, f"show_{name}_tab")()
 
     # Subjects Tab
 
     def show_subjects_tab(self):
         # Display subjects tab
-        self.highlight_tab(self.subjects_btn)
-        self.clear_content()
+        self.show_tab("subjects", self.subjects_btn, self.build_subjects_tab)
 
-        # Check for conflicts
-        conflicts = self.logic.detect_conflicts()
+    def build_subjects_tab(self, frame):
+        # Build the subjects tab into its cached frame
+        # Check for conflicts in the dates the tabs show
+        conflicts = self.logic.detect_conflicts(self.logic.active_window())
         if conflicts:
             self.show_conflict_alert(conflicts)
 
         # Header with Add button
-        header = tk.Frame(self.content_frame, bg="#f0f4ff")
+        header = tk.Frame(frame, bg="#f0f4ff")
         header.pack(fill="x", pady=(0, 20))
 
         tk.Label(
@@ -131,9 +332,9 @@ class IntelligentStudyPlannerUI:
         ).pack(side="right")
 
         # Subjects grid
-        canvas = tk.Canvas(self.content_frame, bg="#f0f4ff", highlightthickness=0)
+        canvas = tk.Canvas(frame, bg="#f0f4ff", highlightthickness=0)
         scrollbar = ttk.Scrollbar(
-            self.content_frame, orient="vertical", command=canvas.yview
+            frame, orient="vertical", command=canvas.yview
         )
         scrollable_frame = tk.Frame(canvas, bg="#f0f4ff")
 
@@ -145,14 +346,18 @@ class IntelligentStudyPlannerUI:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
+        view = {"grid": scrollable_frame, "cards": {}, "empty": None}
+        self.tab_views["subjects"] = view
+
         if not self.logic.subjects:
-            tk.Label(
+            view["empty"] = tk.Label(
                 scrollable_frame,
                 text="No subjects added yet. Click 'Add Subject' to get started!",
                 font=("Arial", 12),
                 bg="#f0f4ff",
                 fg="#718096",
-            ).pack(pady=50)
+            )
+            view["empty"].pack(pady=50)
         else:
             row, col = 0, 0
             for idx, subject in enumerate(self.logic.subjects):
@@ -170,6 +375,7 @@ class IntelligentStudyPlannerUI:
         card = tk.Frame(parent, bg="#ECD9FF", relief="solid", bd=1)
         card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
         parent.columnconfigure(col, weight=1)
+        self.tab_views["subjects"]["cards"][subject["name"]] = card
 
         # Header with delete button
         header = tk.Frame(card, bg="#ECD9FF")
@@ -245,6 +451,33 @@ class IntelligentStudyPlannerUI:
             fg="#4a5568",
         ).pack(pady=(5, 0))
 
+        return card
+
+    def patch_subjects_tab(self, event, details):
+        # Redraw only the card of the subject that changed
+        view = self.tab_views["subjects"]
+        if event == SUBJECT_CHANGED:
+            name = details["name"]
+        elif event == SESSION_UPDATED:
+            name = details["session"]["subject"]
+        else:
+            return event in (SESSION_ADDED, SESSION_REMOVED)
+
+        subject = self.logic.get_subject_by_name(name)
+        old_card = view["cards"].get(name)
+        if subject is None or (old_card is None and view["empty"] is not None):
+            return False
+
+        idx = self.logic.subjects.index(subject)
+        if old_card is not None:
+            grid = old_card.grid_info()
+            old_card.destroy()
+            row, col = int(grid["row"]), int(grid["column"])
+        else:
+            row, col = divmod(idx, 2)
+        self.create_subject_card(view["grid"], subject, idx, row, col)
+        return True
+
     def show_add_subject_dialog(self):
         # Dialog to add a new subject
         dialog = tk.Toplevel(self.root)
@@ -399,16 +632,17 @@ class IntelligentStudyPlannerUI:
 
     def show_schedule_tab(self):
         # Display schedule tab
-        self.highlight_tab(self.schedule_btn)
-        self.clear_content()
+        self.show_tab("schedule", self.schedule_btn, self.build_schedule_tab)
 
-        # Check for conflicts
-        conflicts = self.logic.detect_conflicts()
+    def build_schedule_tab(self, frame):
+        # Build the schedule tab into its cached frame
+        # Check for conflicts in the dates the tabs show
+        conflicts = self.logic.detect_conflicts(self.logic.active_window())
         if conflicts:
             self.show_conflict_alert(conflicts)
 
         # Header with buttons
-        header = tk.Frame(self.content_frame, bg="#f0f4ff")
+        header = tk.Frame(frame, bg="#f0f4ff")
         header.pack(fill="x", pady=(0, 20))
 
         tk.Label(
@@ -448,10 +682,80 @@ class IntelligentStudyPlannerUI:
             cursor="hand2",
         ).pack(side="left", padx=5)
 
+        tk.Button(
+            btn_container,
+            text="🗄️ Archive Past",
+            command=self.archive_past_sessions,
+            bg="#718096",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=15,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
+
+        tk.Button(
+            btn_container,
+            text="📥 Import .ics",
+            command=self.import_calendar,
+            bg="#4a5568",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=15,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
+
+        tk.Button(
+            btn_container,
+            text="📤 Export .ics",
+            command=self.export_calendar,
+            bg="#4a5568",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=15,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
+
+        # Search over session notes and subjects
+        search_bar = tk.Frame(frame, bg="#f0f4ff")
+        search_bar.pack(fill="x", pady=(0, 10))
+
+        tk.Label(
+            search_bar,
+            text="🔍 Search",
+            font=("Arial", 11, "bold"),
+            bg="#f0f4ff",
+            fg="#2d3748",
+        ).pack(side="left")
+
+        query_var = tk.StringVar(value=self.schedule_query)
+        search_entry = tk.Entry(search_bar, textvariable=query_var, font=("Arial", 11), width=40)
+        search_entry.pack(side="left", padx=10)
+        search_entry.bind("<KeyRelease>", lambda e: self.on_schedule_search(query_var.get()))
+
+        tk.Button(
+            search_bar,
+            text="✕",
+            command=lambda: (query_var.set(""), self.on_schedule_search("")),
+            bg="#e2e8f0",
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left")
+
+        search_status = tk.Label(
+            search_bar, text="", font=("Arial", 10), bg="#f0f4ff", fg="#718096"
+        )
+        search_status.pack(side="left", padx=10)
+
         # Sessions list
-        canvas = tk.Canvas(self.content_frame, bg="#f0f4ff", highlightthickness=0)
+        canvas = tk.Canvas(frame, bg="#f0f4ff", highlightthickness=0)
         scrollbar = ttk.Scrollbar(
-            self.content_frame, orient="vertical", command=canvas.yview
+            frame, orient="vertical", command=canvas.yview
         )
         scrollable_frame = tk.Frame(canvas, bg="#f0f4ff")
 
@@ -463,25 +767,83 @@ class IntelligentStudyPlannerUI:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
-        if not self.logic.study_sessions:
-            tk.Label(
-                scrollable_frame,
-                text="No study sessions scheduled. Click 'Add Session' or 'Auto-Schedule'!",
+        view = {
+            "list": scrollable_frame,
+            "sections": {},
+            "cards": {},
+            "empty": None,
+            "search_status": search_status,
+        }
+        self.tab_views["schedule"] = view
+        self.fill_schedule_list()
+
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+    def fill_schedule_list(self):
+        # (Re)fill the session list, showing only search matches while there is a query
+        view = self.tab_views["schedule"]
+        for child in view["list"].winfo_children():
+            child.destroy()
+        view["sections"].clear()
+        view["cards"].clear()
+        view["empty"] = None
+
+        query = self.schedule_query.strip()
+        if query:
+            sessions_by_date = {}
+            matches = self.logic.search(query, limit=SEARCH_LIMIT)
+            for session in matches:
+                sessions_by_date.setdefault(session["date"], []).append(session)
+            if len(matches) == SEARCH_LIMIT:
+                status = f"first {SEARCH_LIMIT} matches"
+            else:
+                status = f"{len(matches)} match{'es' if len(matches) != 1 else ''}"
+            empty_text = f"No sessions match '{query}'."
+        else:
+            sessions_by_date = (
+                self.logic.get_sessions_by_date(date_range=self.logic.active_window())
+                if self.logic.study_sessions else {}
+            )
+            status = ""
+            empty_text = "No study sessions scheduled. Click 'Add Session' or 'Auto-Schedule'!"
+        view["search_status"].config(text=status)
+
+        if not sessions_by_date:
+            view["empty"] = tk.Label(
+                view["list"],
+                text=empty_text,
                 font=("Arial", 12),
                 bg="#f0f4ff",
                 fg="#718096",
-            ).pack(pady=50)
-        else:
-            sessions_by_date = self.logic.get_sessions_by_date()
-            for date, sessions in sessions_by_date.items():
-                self.create_date_section(scrollable_frame, date, sessions)
+            )
+            view["empty"].pack(pady=50)
+            return
 
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        for date, sessions in sessions_by_date.items():
+            self.create_date_section(view["list"], date, sessions)
+
+    def on_schedule_search(self, query):
+        # Filter the schedule once typing pauses
+        if query == self.schedule_query:
+            return
+        self.schedule_query = query
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DELAY_MS, self.run_schedule_search)
+
+    def run_schedule_search(self):
+        self.search_job = None
+        if "schedule" in self.tab_views:
+            self.fill_schedule_list()
 
     def create_date_section(self, parent, date, sessions):
         # Create a section for a specific date
-        date_frame = tk.Frame(parent, bg="#f0f4ff")
+        section = tk.Frame(parent, bg="#f0f4ff")
+        section.pack(fill="x")
+        self.tab_views["schedule"]["sections"][date] = section
+
+        date_frame = tk.Frame(section, bg="#f0f4ff")
         date_frame.pack(fill="x", pady=(20, 10), padx=20)
 
         date_text = self.logic.format_date_display(date)
@@ -495,12 +857,15 @@ class IntelligentStudyPlannerUI:
         ).pack(side="left")
 
         for session in sessions:
-            self.create_session_card(parent, session, self.logic.get_session_index(session))
+            self.create_session_card(section, session)
+
+        return section
 
-    def create_session_card(self, parent, session, idx):
+    def create_session_card(self, parent, session):
         # Create a session card
         card = tk.Frame(parent, bg="white", relief="solid", bd=1)
         card.pack(fill="x", pady=5, padx=20)
+        self.tab_views["schedule"]["cards"][id(session)] = card
 
         # Left side
         left_frame = tk.Frame(card, bg="white")
@@ -532,6 +897,16 @@ class IntelligentStudyPlannerUI:
                 fg="#718096",
             ).pack(anchor="w", pady=(5, 0))
 
+        if session.get("recurrence") is not None:
+            rule = self.logic.recurring_sessions[session["recurrence"]]
+            tk.Label(
+                left_frame,
+                text=f"🔁 Repeats {recurrence.describe(rule)}",
+                font=("Arial", 10),
+                bg="white",
+                fg="#38b2ac",
+            ).pack(anchor="w", pady=(5, 0))
+
         # Right side
         right_frame = tk.Frame(card, bg="white")
         right_frame.pack(side="right", padx=15, pady=15)
@@ -540,7 +915,7 @@ class IntelligentStudyPlannerUI:
             tk.Button(
                 right_frame,
                 text="✓ Complete",
-                command=lambda: self.complete_session(idx),
+                command=lambda: self.complete_session(session),
                 bg="#48bb78",
                 fg="white",
                 font=("Arial", 10, "bold"),
@@ -563,7 +938,7 @@ class IntelligentStudyPlannerUI:
         tk.Button(
             right_frame,
             text="🗑️ Delete",
-            command=lambda: self.delete_session(idx),
+            command=lambda: self.delete_session(session),
             bg="#e53e3e",
             fg="white",
             font=("Arial", 10, "bold"),
@@ -574,6 +949,52 @@ class IntelligentStudyPlannerUI:
             width=12,
         ).pack(pady=2)
 
+        return card
+
+    def patch_schedule_tab(self, event, details):
+        # Add, redraw or remove the single session card that changed
+        view = self.tab_views["schedule"]
+        if self.schedule_query.strip() and event != SESSION_UPDATED:
+            # Whether a new session matches the search is the list's call to make
+            return False
+        if event not in (SESSION_ADDED, SESSION_UPDATED, SESSION_REMOVED):
+            return event == SUBJECT_CHANGED
+
+        session = details["session"]
+        if event == SESSION_ADDED:
+            if view["empty"] is not None:
+                view["empty"].destroy()
+                view["empty"] = None
+
+            date = session["date"]
+            section = view["sections"].get(date)
+            if section is not None:
+                self.create_session_card(section, session)
+                return True
+
+            section = self.create_date_section(view["list"], date, [session])
+            later = [d for d in view["sections"] if d > date]
+            if later:
+                section.pack(before=view["sections"][min(later)])
+            return True
+
+        old_card = view["cards"].pop(id(session), None)
+        if old_card is None:
+            return False
+        section = old_card.master
+
+        if event == SESSION_UPDATED:
+            self.create_session_card(section, session).pack(before=old_card)
+            old_card.destroy()
+            return True
+
+        old_card.destroy()
+        if len(section.winfo_children()) == 1:
+            section.destroy()
+            del view["sections"][session["date"]]
+        # The empty-schedule placeholder comes with a rebuild
+        return bool(self.logic.study_sessions)
+
     def show_add_session_dialog(self):
         # Dialog to add a new study session
         if not self.logic.subjects:
@@ -582,7 +1003,7 @@ class IntelligentStudyPlannerUI:
 
         dialog = tk.Toplevel(self.root)
         dialog.title("Add Study Session")
-        dialog.geometry("450x450")
+        dialog.geometry("450x580")
         dialog.configure(bg="white")
         dialog.transient(self.root)
         dialog.grab_set()
@@ -651,6 +1072,27 @@ class IntelligentStudyPlannerUI:
         notes_entry = tk.Entry(form_frame, bg="#f0f0f0", font=("Arial", 11), width=40)
         notes_entry.pack(fill="x")
 
+        # Repeat
+        repeat_options = {"Does not repeat": None, "Daily": recurrence.DAILY, "Weekly": recurrence.WEEKLY}
+        tk.Label(form_frame, text="Repeat:", font=("Arial", 10), bg="white").pack(
+            anchor="w", pady=(10, 5)
+        )
+        repeat_var = tk.StringVar(value="Does not repeat")
+        ttk.Combobox(
+            form_frame,
+            textvariable=repeat_var,
+            values=list(repeat_options),
+            font=("Arial", 11),
+            state="readonly",
+            style="Custom.TCombobox",
+        ).pack(fill="x")
+
+        tk.Label(
+            form_frame, text="Repeat Until (YYYY-MM-DD):", font=("Arial", 10), bg="white"
+        ).pack(anchor="w", pady=(10, 5))
+        until_entry = tk.Entry(form_frame, bg="#f0f0f0", font=("Arial", 11), width=40)
+        until_entry.pack(fill="x")
+
         btn_frame = tk.Frame(dialog, bg="white")
         btn_frame.pack(pady=20)
 
@@ -660,6 +1102,8 @@ class IntelligentStudyPlannerUI:
             start_time = start_time_entry.get().strip()
             end_time = end_time_entry.get().strip()
             notes = notes_entry.get().strip()
+            frequency = repeat_options[repeat_var.get()]
+            until = until_entry.get().strip()
 
             # Validate date format
             is_valid, date_obj_or_error = self.logic.validate_date_format(date)
@@ -694,9 +1138,27 @@ class IntelligentStudyPlannerUI:
                 messagebox.showerror("Invalid Session Duration", error)
                 return
 
-            self.logic.add_session(subject, date, start_time, end_time, notes)
+            if frequency is None:
+                self.logic.add_session(subject, date, start_time, end_time, notes)
+            else:
+                is_valid, error = self.logic.validate_date_format(until)
+                if not is_valid:
+                    messagebox.showerror("Invalid Repeat End Date", error)
+                    return
+
+                success, error = self.logic.add_recurring_session(
+                    subject, date, until, start_time, end_time, frequency=frequency, notes=notes
+                )
+                if not success:
+                    messagebox.showerror("Invalid Repeat", error)
+                    return
+
             dialog.destroy()
             self.show_schedule_tab()
+            # Only the new session's dates can have gained conflicts
+            self.show_conflict_alert(
+                self.logic.detect_conflicts((date, until if frequency is not None else date))
+            )
 
         tk.Button(
             btn_frame,
@@ -724,21 +1186,91 @@ class IntelligentStudyPlannerUI:
             cursor="hand2",
         ).pack(side="left", padx=5)
 
-    def complete_session(self, idx):
+    def complete_session(self, session):
         # Mark session as completed
-        hours, subject_name = self.logic.complete_session(idx)
+        if session.get("recurrence") is not None:
+            hours, subject_name = self.logic.complete_occurrence(
+                session["recurrence"], session["date"]
+            )
+        else:
+            idx = self.logic.get_session_index(session)
+            hours, subject_name = self.logic.complete_session(idx)
         if hours > 0:
-            self.show_schedule_tab()
             messagebox.showinfo(
                 "Session Completed",
                 f"Great job! {hours:.1f} hours added to {subject_name}",
             )
 
-    def delete_session(self, idx):
+    def delete_session(self, session):
         # Delete a study session
+        if session.get("recurrence") is not None:
+            answer = messagebox.askyesnocancel(
+                "Delete Recurring Session",
+                "Skip only this occurrence?\n\nChoose No to delete the whole series.",
+            )
+            if answer:
+                self.logic.skip_occurrence(session["recurrence"], session["date"])
+            elif answer is not None:
+                self.logic.delete_recurring_session(session["recurrence"])
+            return
+
         if messagebox.askyesno("Confirm Delete", "Delete this study session?"):
-            self.logic.delete_session(idx)
-            self.show_schedule_tab()
+            self.logic.remove_session(session)
+
+    def archive_past_sessions(self):
+        # Move completed past sessions into the compressed archive
+        if not messagebox.askyesno(
+                "Archive Sessions",
+                "Move completed sessions from before today into the archive?\n\n"
+                "Statistics and progress stay the same.",
+        ):
+            return
+
+        success, result = self.logic.archive_completed()
+        if not success:
+            messagebox.showerror("Archive Failed", result)
+            return
+
+        self.show_schedule_tab()
+        messagebox.showinfo("Archive Complete", f"Archived {result} completed sessions.")
+
+    def import_calendar(self):
+        # Block out busy times from another calendar
+        path = filedialog.askopenfilename(
+            title="Import Busy Times",
+            filetypes=[("iCalendar", "*.ics"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+
+        success, result = self.logic.import_ics(path)
+        if not success:
+            messagebox.showerror("Import Failed", result)
+            return
+
+        messagebox.showinfo(
+            "Import Complete",
+            f"Imported {result} busy time block(s). "
+            "Auto-scheduling and conflict checks will keep clear of them.",
+        )
+
+    def export_calendar(self):
+        # Write the schedule to an .ics file for other calendar apps
+        path = filedialog.asksaveasfilename(
+            title="Export Schedule",
+            defaultextension=".ics",
+            initialfile="study_schedule.ics",
+            filetypes=[("iCalendar", "*.ics")],
+        )
+        if not path:
+            return
+
+        success, result = self.logic.export_ics(path)
+        if not success:
+            messagebox.showerror("Export Failed", result)
+            return
+
+        messagebox.showinfo("Export Complete", f"Exported {result} event(s).")
 
     def show_auto_schedule_settings(self):
         # Show auto-schedule settings dialog
@@ -748,7 +1280,7 @@ class IntelligentStudyPlannerUI:
 
         dialog = tk.Toplevel(self.root)
         dialog.title("Auto-Schedule Settings")
-        dialog.geometry("450x500")
+        dialog.geometry("520x560")
         dialog.configure(bg="white")
         dialog.transient(self.root)
         dialog.grab_set()
@@ -798,6 +1330,17 @@ class IntelligentStudyPlannerUI:
         break_entry.insert(0, "0")
         break_entry.pack(fill="x")
 
+        tk.Button(
+            form_frame,
+            text="🗓️ Weekly Availability & Blackout Dates",
+            command=lambda: self.show_availability_dialog(dialog),
+            bg="#D8B9FF",
+            fg="#8B008B",
+            font=("Arial", 10, "bold"),
+            relief="flat",
+            cursor="hand2",
+        ).pack(anchor="w", pady=(15, 0))
+
         # Info label
         tk.Label(
             form_frame,
@@ -832,6 +1375,43 @@ class IntelligentStudyPlannerUI:
                 start_time, end_time, float(duration), float(break_time)
             )
 
+        def compare():
+            start_time = start_entry.get().strip()
+            end_time = end_entry.get().strip()
+
+            # Validate the window with a neutral duration and break
+            is_valid, error = self.logic.validate_auto_schedule_params(
+                start_time, end_time, "1", "0"
+            )
+            if not is_valid:
+                messagebox.showerror("Invalid Input", error)
+                return
+
+            def apply(row):
+                for entry, value in (
+                        (start_entry, row["start_time"]),
+                        (end_entry, row["end_time"]),
+                        (duration_entry, f"{row['session_duration']:g}"),
+                        (break_entry, f"{row['break_time']:g}"),
+                ):
+                    entry.delete(0, tk.END)
+                    entry.insert(0, value)
+
+            self.show_scenario_comparison(dialog, start_time, end_time, apply)
+
+        tk.Button(
+            btn_frame,
+            text="🔍 Compare",
+            command=compare,
+            bg="#38b2ac",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
+
         tk.Button(
             btn_frame,
             text="Generate Schedule",
@@ -858,70 +1438,394 @@ class IntelligentStudyPlannerUI:
             cursor="hand2",
         ).pack(side="left", padx=5)
 
-    def auto_schedule_with_settings(self, start_time, end_time, session_duration, break_time):
-        # Execute auto-scheduling with user settings
-        if self.logic.study_sessions:
-            if not messagebox.askyesno(
-                    "Auto-Schedule", "This will clear existing sessions. Continue?"
-            ):
+    def show_availability_dialog(self, parent):
+        # Edit per-weekday availability windows and the blackout calendar
+        dialog = tk.Toplevel(parent)
+        dialog.title("Weekly Availability")
+        dialog.geometry("480x560")
+        dialog.configure(bg="white")
+        dialog.transient(parent)
+        dialog.grab_set()
+
+        tk.Label(
+            dialog,
+            text="🗓️ Weekly Availability",
+            font=("Arial", 16, "bold"),
+            bg="white",
+            fg="#1a202c",
+        ).pack(pady=(20, 5))
+
+        tk.Label(
+            dialog,
+            text="Windows as HH:MM-HH:MM, comma separated. Use 'any' for the whole window or 'closed'.",
+            font=("Arial", 9),
+            bg="white",
+            fg="#718096",
+            wraplength=420,
+        ).pack()
+
+        form_frame = tk.Frame(dialog, bg="white")
+        form_frame.pack(padx=30, fill="both", expand=True, pady=(10, 0))
+
+        weekday_entries = []
+        for weekday, day_name in enumerate(WEEKDAY_NAMES):
+            row = tk.Frame(form_frame, bg="white")
+            row.pack(fill="x", pady=3)
+            tk.Label(row, text=f"{day_name}:", font=("Arial", 10), bg="white", width=11, anchor="w").pack(
+                side="left"
+            )
+            entry = tk.Entry(row, bg="#f0f0f0", font=("Arial", 11))
+            entry.insert(
+                0,
+                self.logic.format_availability_windows(
+                    self.logic.get_weekday_availability(weekday)
+                ),
+            )
+            entry.pack(side="left", fill="x", expand=True)
+            weekday_entries.append(entry)
+
+        tk.Label(
+            form_frame,
+            text="Blackout Dates (YYYY-MM-DD, comma separated):",
+            font=("Arial", 10),
+            bg="white",
+        ).pack(anchor="w", pady=(15, 5))
+        blackout_text = tk.Text(form_frame, bg="#f0f0f0", font=("Arial", 11), height=4)
+        blackout_text.insert("1.0", ", ".join(self.logic.blackout_dates))
+        blackout_text.pack(fill="x")
+
+        tk.Label(
+            form_frame,
+            text="Exam days are always blocked.",
+            font=("Arial", 9),
+            bg="white",
+            fg="#718096",
+        ).pack(anchor="w", pady=(5, 0))
+
+        btn_frame = tk.Frame(dialog, bg="white")
+        btn_frame.pack(pady=20)
+
+        def save():
+            availability = {}
+            for weekday, entry in enumerate(weekday_entries):
+                is_valid, error, windows = self.logic.parse_availability_windows(entry.get())
+                if not is_valid:
+                    messagebox.showerror("Invalid Input", f"{WEEKDAY_NAMES[weekday]}: {error}")
+                    return
+                availability[weekday] = windows
+
+            blackout_dates = []
+            for date_str in blackout_text.get("1.0", tk.END).replace("\n", ",").split(","):
+                date_str = date_str.strip()
+                if not date_str:
+                    continue
+                is_valid, date_obj_or_error = self.logic.validate_date_format(date_str)
+                if not is_valid:
+                    messagebox.showerror("Invalid Date", f"{date_str}: {date_obj_or_error}")
+                    return
+                blackout_dates.append(date_str)
+
+            self.logic.set_weekly_availability(availability)
+            self.logic.set_blackout_dates(blackout_dates)
+            dialog.destroy()
+
+        tk.Button(
+            btn_frame,
+            text="Save",
+            command=save,
+            bg="#48bb78",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
+
+        tk.Button(
+            btn_frame,
+            text="Cancel",
+            command=dialog.destroy,
+            bg="#cbd5e0",
+            fg="#2d3748",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
+
+    def show_scenario_comparison(self, parent, start_time, end_time, on_select):
+        # Rank a grid of settings without touching the saved schedule
+        grid = scenarios.build_grid(
+            durations=[1, 1.5, 2, 2.5, 3],
+            breaks=[0, 0.25, 0.5],
+            windows=[(start_time, end_time)],
+        )
+
+        # The sweep works on plain rows and runs off the Tk thread so the window stays responsive
+        data = {
+            "subjects": [s.to_dict() for s in self.logic.subjects],
+            "study_sessions": [s.to_dict() for s in self.logic.study_sessions],
+            "weekly_availability": self.logic.weekly_availability,
+            "blackout_dates": self.logic.blackout_dates,
+            "recurring_sessions": [r.to_dict() for r in self.logic.recurring_sessions],
+            "busy_events": self.logic.busy_events,
+        }
+        if self.sweep_executor is None:
+            self.sweep_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="planner-sweep")
+        future = self.sweep_executor.submit(scenarios.run_sweep, data, grid)
+
+        dialog = tk.Toplevel(parent)
+        dialog.title("Compare Auto-Schedule Settings")
+        dialog.geometry("720x420")
+        dialog.configure(bg="white")
+        dialog.transient(parent)
+        dialog.grab_set()
+
+        busy_frame = tk.Frame(dialog, bg="white")
+        busy_frame.pack(expand=True)
+
+        tk.Label(
+            busy_frame,
+            text=f"⏳ Comparing {len(grid)} settings...",
+            font=("Arial", 14),
+            bg="white",
+            fg="#4a5568",
+        ).pack(pady=(0, 10))
+
+        progress = ttk.Progressbar(busy_frame, mode="indeterminate", length=250)
+        progress.pack()
+        progress.start(15)
+
+        def poll():
+            if not dialog.winfo_exists():
+                # Closed while running; the result is simply dropped
+                return
+            if not future.done():
+                self.root.after(SWEEP_POLL_MS, poll)
+                return
+
+            busy_frame.destroy()
+            try:
+                rows = future.result()
+            except Exception as e:
+                dialog.destroy()
+                messagebox.showerror("Comparison Failed", f"Could not compare settings:\n{e}")
+                return
+            self.show_scenario_rows(dialog, rows, on_select)
+
+        self.root.after(SWEEP_POLL_MS, poll)
+
+    def show_scenario_rows(self, dialog, rows, on_select):
+        # Fill the comparison dialog with the ranked sweep results
+        tk.Label(
+            dialog,
+            text="Ranked Settings (double-click to use)",
+            font=("Arial", 14, "bold"),
+            bg="white",
+            fg="#1a202c",
+        ).pack(pady=(15, 10))
+
+        columns = ("window", "duration", "break", "sessions", "coverage", "balance", "conflicts", "score")
+        tree = ttk.Treeview(dialog, columns=columns, show="headings", height=14)
+        for col in columns:
+            tree.heading(col, text=col.title())
+            tree.column(col, width=90, anchor="center")
+        tree.column("window", width=110)
+        tree.pack(fill="both", expand=True, padx=15)
+
+        for idx, row in enumerate(rows):
+            if row["error"]:
+                values = (
+                    f"{row['start_time']}-{row['end_time']}",
+                    f"{row['session_duration']:g}h",
+                    f"{row['break_time']:g}h",
+                    row["error"], "", "", "", "",
+                )
+            else:
+                values = (
+                    f"{row['start_time']}-{row['end_time']}",
+                    f"{row['session_duration']:g}h",
+                    f"{row['break_time']:g}h",
+                    row["scheduled_count"],
+                    f"{row['coverage']:.0%}",
+                    f"{row['balance']:.2f}",
+                    row["conflicts"],
+                    f"{row['score']:.2f}",
+                )
+            tree.insert("", "end", iid=str(idx), values=values)
+
+        def select(event=None):
+            selection = tree.selection()
+            if not selection:
                 return
+            on_select(rows[int(selection[0])])
+            dialog.destroy()
 
+        tree.bind("<Double-1>", select)
+
+        tk.Button(
+            dialog,
+            text="Use Selected",
+            command=select,
+            bg="#48bb78",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(pady=15)
+
+    def auto_schedule_with_settings(self, start_time, end_time, session_duration, break_time):
+        # Preview auto-scheduling with user settings before committing it
         success, result = self.logic.auto_schedule(
-            start_time, end_time, session_duration, break_time
+            start_time, end_time, session_duration, break_time, preview=True
         )
 
         if not success:
             messagebox.showerror("Auto-Schedule Failed", result)
             return
 
-        scheduled_count = result["scheduled_count"]
-        incomplete_subjects = result["incomplete_subjects"]
+        self.show_schedule_preview(result)
 
-        self.show_schedule_tab()
+    def show_schedule_preview(self, result):
+        # Show the proposed schedule and its changes, and commit on request
+        diff = result["diff"]
 
-        if incomplete_subjects:
-            warning_msg = f"Successfully scheduled {scheduled_count} study sessions!\n\n"
-            warning_msg += "⚠️ Some subjects couldn't be fully scheduled:\n"
-            warning_msg += "\n".join(f"  • {subj}" for subj in incomplete_subjects)
-            warning_msg += "\n\nTip: Try increasing daily study hours or extending your available time window."
-            messagebox.showwarning("Auto-Schedule Complete", warning_msg)
-        else:
-            messagebox.showinfo(
-                "Auto-Schedule Complete",
-                f"🎉 Successfully scheduled {scheduled_count} study sessions!\n\n"
-                f"All subjects scheduled to 100% completion with proper daily limits!"
-            )
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Auto-Schedule Preview")
+        dialog.geometry("560x520")
+        dialog.configure(bg="white")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(
+            dialog,
+            text="👀 Schedule Preview",
+            font=("Arial", 16, "bold"),
+            bg="white",
+            fg="#1a202c",
+        ).pack(pady=(20, 5))
+
+        tk.Label(
+            dialog,
+            text=(
+                f"{result['scheduled_count']} sessions proposed  •  "
+                f"{len(diff['added'])} added  •  {len(diff['moved'])} moved  •  "
+                f"{len(diff['removed'])} removed  •  {diff['unchanged']} unchanged"
+            ),
+            font=("Arial", 10),
+            bg="white",
+            fg="#4a5568",
+        ).pack(pady=(0, 10))
+
+        list_frame = tk.Frame(dialog, bg="white")
+        list_frame.pack(fill="both", expand=True, padx=20)
+
+        changes = tk.Listbox(list_frame, font=("Courier", 10), bg="#f7fafc", relief="flat")
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=changes.yview)
+        changes.configure(yscrollcommand=scrollbar.set)
+
+        def describe(session):
+            return f"{session['date']} {session['start_time']}-{session['end_time']} {session['subject']}"
+
+        for session in diff["added"]:
+            changes.insert(tk.END, f"+ {describe(session)}")
+        for old, new in diff["moved"]:
+            changes.insert(tk.END, f"~ {describe(old)}  →  {new['date']} {new['start_time']}-{new['end_time']}")
+        for session in diff["removed"]:
+            changes.insert(tk.END, f"- {describe(session)}")
+        if changes.size() == 0:
+            changes.insert(tk.END, "No changes to the current schedule")
+
+        changes.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        if result["incomplete_subjects"]:
+            warning_msg = "⚠️ Some subjects couldn't be fully scheduled:\n"
+            warning_msg += "\n".join(f"  • {subj}" for subj in result["incomplete_subjects"])
+            tk.Label(
+                dialog,
+                text=warning_msg,
+                font=("Arial", 9),
+                bg="white",
+                fg="#c05621",
+                wraplength=500,
+                justify="left",
+            ).pack(anchor="w", padx=20, pady=(10, 0))
+
+        btn_frame = tk.Frame(dialog, bg="white")
+        btn_frame.pack(pady=20)
+
+        def apply():
+            self.logic.apply_schedule(result["sessions"])
+            dialog.destroy()
+            self.show_schedule_tab()
+
+            if result["incomplete_subjects"]:
+                warning_msg = f"Successfully scheduled {result['scheduled_count']} study sessions!\n\n"
+                warning_msg += "⚠️ Some subjects couldn't be fully scheduled:\n"
+                warning_msg += "\n".join(f"  • {subj}" for subj in result["incomplete_subjects"])
+                warning_msg += "\n\nTip: Try increasing daily study hours or extending your available time window."
+                messagebox.showwarning("Auto-Schedule Complete", warning_msg)
+            else:
+                messagebox.showinfo(
+                    "Auto-Schedule Complete",
+                    f"🎉 Successfully scheduled {result['scheduled_count']} study sessions!\n\n"
+                    f"All subjects scheduled to 100% completion with proper daily limits!"
+                )
+
+        tk.Button(
+            btn_frame,
+            text="Apply Schedule",
+            command=apply,
+            bg="#48bb78",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
+
+        tk.Button(
+            btn_frame,
+            text="Discard",
+            command=dialog.destroy,
+            bg="#cbd5e0",
+            fg="#2d3748",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=5)
 
     # Dashboard Tab
 
     def show_dashboard_tab(self):
         # Display dashboard tab
-        self.highlight_tab(self.dashboard_btn)
-        self.clear_content()
+        self.show_tab("dashboard", self.dashboard_btn, self.build_dashboard_tab)
 
+    def build_dashboard_tab(self, frame):
+        # Build the dashboard tab into its cached frame
         # Statistics cards
-        stats_frame = tk.Frame(self.content_frame, bg="#f0f4ff")
+        stats_frame = tk.Frame(frame, bg="#f0f4ff")
         stats_frame.pack(fill="x", pady=(0, 20))
 
-        # Calculate statistics
-        stats = self.logic.get_statistics()
+        view = {"stats": {}, "rows_parent": None, "rows": {}, "empty": None}
+        self.tab_views["dashboard"] = view
 
-        stat_items = [
-            ("Total Subjects", stats["total_subjects"], "#667eea"),
-            ("Total Hours Needed", f"{stats['total_hours_needed']}h", "#f56565"),
-            ("Hours Completed", f"{stats['total_hours_completed']:.1f}h", "#48bb78"),
-            ("Study Sessions", stats["total_sessions"], "#ed8936"),
-            ("Completed Sessions", stats["completed_sessions"], "#38b2ac"),
-        ]
-
-        for label, value, color in stat_items:
-            self.create_stat_card(stats_frame, label, value, color).pack(
-                side="left", padx=10, fill="both", expand=True
-            )
+        for label, value, color in self.get_stat_items():
+            card = self.create_stat_card(stats_frame, label, value, color)
+            card.pack(side="left", padx=10, fill="both", expand=True)
+            view["stats"][label] = card.value_label
 
         # Progress overview
         tk.Label(
-            self.content_frame,
+            frame,
             text="Subject Progress",
             font=("Arial", 18, "bold"),
             bg="#f0f4ff",
@@ -929,9 +1833,9 @@ class IntelligentStudyPlannerUI:
         ).pack(anchor="w", pady=(20, 10))
 
         # Canvas for subject progress
-        canvas = tk.Canvas(self.content_frame, bg="#f0f4ff", highlightthickness=0)
+        canvas = tk.Canvas(frame, bg="#f0f4ff", highlightthickness=0)
         scrollbar = ttk.Scrollbar(
-            self.content_frame, orient="vertical", command=canvas.yview
+            frame, orient="vertical", command=canvas.yview
         )
         scrollable_frame = tk.Frame(canvas, bg="#f0f4ff")
 
@@ -943,32 +1847,73 @@ class IntelligentStudyPlannerUI:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
+        view["rows_parent"] = scrollable_frame
         if not self.logic.subjects:
-            tk.Label(
+            view["empty"] = tk.Label(
                 scrollable_frame,
                 text="No subjects to display",
                 font=("Arial", 12),
                 bg="#f0f4ff",
                 fg="#718096",
-            ).pack(pady=50)
+            )
+            view["empty"].pack(pady=50)
         else:
             for subject in self.logic.subjects:
-                self.create_progress_row(scrollable_frame, subject)
+                view["rows"][subject["name"]] = self.create_progress_row(
+                    scrollable_frame, subject
+                )
 
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
+    def get_stat_items(self):
+        # Label, value and color of each dashboard statistics card
+        stats = self.logic.get_statistics()
+        return [
+            ("Total Subjects", stats["total_subjects"], "#667eea"),
+            ("Total Hours Needed", f"{stats['total_hours_needed']}h", "#f56565"),
+            ("Hours Completed", f"{stats['total_hours_completed']:.1f}h", "#48bb78"),
+            ("Study Sessions", stats["total_sessions"], "#ed8936"),
+            ("Completed Sessions", stats["completed_sessions"], "#38b2ac"),
+        ]
+
+    def patch_dashboard_tab(self, event, details):
+        # Refresh the stat values and the progress row of the subject that changed
+        view = self.tab_views["dashboard"]
+        for label, value, _ in self.get_stat_items():
+            view["stats"][label].config(text=str(value))
+
+        if event == SUBJECT_CHANGED:
+            name = details["name"]
+        elif event == SESSION_UPDATED:
+            name = details["session"]["subject"]
+        else:
+            return True
+
+        subject = self.logic.get_subject_by_name(name)
+        if subject is None or view["empty"] is not None:
+            return False
+
+        new_row = self.create_progress_row(view["rows_parent"], subject)
+        old_row = view["rows"].get(name)
+        if old_row is not None:
+            new_row.pack(before=old_row)
+            old_row.destroy()
+        view["rows"][name] = new_row
+        return True
+
     def create_stat_card(self, parent, label, value, color):
         # Create a statistics card
         card = tk.Frame(parent, bg="white", relief="solid", bd=1)
 
-        tk.Label(
+        card.value_label = tk.Label(
             card,
             text=str(value),
             font=("Arial", 24, "bold"),
             bg="white",
             fg=color,
-        ).pack(pady=(20, 5))
+        )
+        card.value_label.pack(pady=(20, 5))
 
         tk.Label(
             card,
@@ -1042,16 +1987,245 @@ class IntelligentStudyPlannerUI:
             fg="#4a5568",
         ).place(relx=0.5, rely=0.5, anchor="center")
 
+        return row
+
+    # Calendar Tab
+
+    def show_calendar_tab(self):
+        # Display calendar heatmap tab
+        self.show_tab("calendar", self.calendar_btn, self.build_calendar_tab)
+
+    def build_calendar_tab(self, frame):
+        # Build the calendar tab: controls above a single heatmap canvas
+        header = tk.Frame(frame, bg="#f0f4ff")
+        header.pack(fill="x", pady=(0, 10))
+
+        tk.Label(
+            header,
+            text="Study Calendar",
+            font=("Arial", 18, "bold"),
+            bg="#f0f4ff",
+            fg="#1a202c",
+        ).pack(side="left")
+
+        controls = tk.Frame(header, bg="#f0f4ff")
+        controls.pack(side="right")
+
+        nav_style = {
+            "bg": "#D8B9FF",
+            "fg": "#8B008B",
+            "font": ("Arial", 11, "bold"),
+            "padx": 10,
+            "pady": 4,
+            "relief": "flat",
+            "cursor": "hand2",
+        }
+
+        tk.Button(
+            controls, text="◀", command=lambda: self.shift_calendar(-1), **nav_style
+        ).pack(side="left", padx=2)
+
+        range_label = tk.Label(
+            controls, font=("Arial", 11, "bold"), bg="#f0f4ff", fg="#2d3748", width=22
+        )
+        range_label.pack(side="left", padx=5)
+
+        tk.Button(
+            controls, text="▶", command=lambda: self.shift_calendar(1), **nav_style
+        ).pack(side="left", padx=2)
+
+        for months, text in ((1, "Month"), (3, "Term"), (6, "Semester")):
+            tk.Button(
+                controls,
+                text=text,
+                command=lambda m=months: self.set_calendar_span(m),
+                **nav_style,
+            ).pack(side="left", padx=(8 if months == 1 else 2, 2))
+
+        canvas = tk.Canvas(frame, bg="#f0f4ff", highlightthickness=0)
+        canvas.pack(fill="both", expand=True)
+
+        info = tk.Label(
+            frame,
+            text="Hover over a day to see its sessions by subject",
+            font=("Arial", 10),
+            bg="#f0f4ff",
+            fg="#718096",
+            anchor="w",
+        )
+        info.pack(fill="x", pady=(5, 0))
+
+        self.tab_views["calendar"] = {
+            "canvas": canvas,
+            "range_label": range_label,
+            "info": info,
+            "daily": {},
+        }
+
+        canvas.bind("<Configure>", lambda e: self.draw_calendar())
+        canvas.bind("<Motion>", self.on_calendar_hover)
+        self.draw_calendar()
+
+    def shift_calendar(self, step):
+        # Move the calendar by its own span
+        self.calendar_start = add_months(self.calendar_start, step * self.calendar_months)
+        self.draw_calendar()
+
+    def set_calendar_span(self, months):
+        self.calendar_months = months
+        self.draw_calendar()
+
+    def patch_calendar_tab(self, event, details):
+        # The heatmap is cheap to redraw from the daily rollup
+        self.draw_calendar()
+        return True
+
+    def subject_color(self, name):
+        # Stable color per subject; archived subjects get one from their name
+        names = self.logic.get_subject_names()
+        if name in names:
+            return SUBJECT_COLORS[names.index(name) % len(SUBJECT_COLORS)]
+        return SUBJECT_COLORS[sum(map(ord, name)) % len(SUBJECT_COLORS)]
+
+    def draw_calendar(self):
+        # Draw every month in view on the one canvas from the per-day rollup
+        view = self.tab_views["calendar"]
+        canvas = view["canvas"]
+        canvas.delete("all")
+
+        first = self.calendar_start
+        last = add_months(first, self.calendar_months) - timedelta(days=1)
+        view["range_label"].config(
+            text=first.strftime("%b %Y")
+            if self.calendar_months == 1
+            else f"{first.strftime('%b %Y')} – {last.strftime('%b %Y')}"
+        )
+
+        daily = self.logic.get_daily_hours(first.isoformat(), last.isoformat())
+        view["daily"] = daily
+        busiest = max((sum(hours.values()) for hours in daily.values()), default=0) or 1
+
+        width = max(canvas.winfo_width(), 600)
+        height = max(canvas.winfo_height(), 400)
+        columns = min(self.calendar_months, 3)
+        rows = -(-self.calendar_months // columns)
+        month_width = (width - 20 * (columns + 1)) / columns
+        month_height = (height - 40 - 20 * rows) / rows
+        cell = max(12, min(month_width / 7, (month_height - 40) / 6))
+
+        month = first
+        for i in range(self.calendar_months):
+            x0 = 20 + (i % columns) * (month_width + 20)
+            y0 = 10 + (i // columns) * (month_height + 20)
+            self.draw_calendar_month(canvas, month, x0, y0, cell, daily, busiest)
+            month = add_months(month, 1)
+
+        # Legend of subject colors along the bottom
+        x = 20
+        y = height - 20
+        subjects = sorted({name for hours in daily.values() for name in hours})
+        for name in subjects:
+            canvas.create_rectangle(x, y - 6, x + 12, y + 6, fill=self.subject_color(name), width=0)
+            text = canvas.create_text(x + 18, y, text=name, anchor="w", font=("Arial", 9), fill="#4a5568")
+            x = canvas.bbox(text)[2] + 15
+
+    def draw_calendar_month(self, canvas, month, x0, y0, cell, daily, busiest):
+        # One month grid: heat-colored days with a subject split along the bottom
+        canvas.create_text(
+            x0, y0, text=month.strftime("%B %Y"), anchor="nw",
+            font=("Arial", 12, "bold"), fill="#2d3748",
+        )
+        for weekday, name in enumerate(WEEKDAY_NAMES):
+            canvas.create_text(
+                x0 + weekday * cell + cell / 2, y0 + 28, text=name[:2],
+                font=("Arial", 8), fill="#718096",
+            )
+
+        top = y0 + 38
+        for week, days in enumerate(calendar.monthcalendar(month.year, month.month)):
+            for weekday, day in enumerate(days):
+                if not day:
+                    continue
+                day_str = month.replace(day=day).isoformat()
+                hours = daily.get(day_str, {})
+                total = sum(hours.values())
+                tag = ("day", f"d{day_str}")
+
+                x = x0 + weekday * cell
+                y = top + week * cell
+                canvas.create_rectangle(
+                    x + 1, y + 1, x + cell - 1, y + cell - 1,
+                    fill=heat_color(total / busiest), outline="#e2e8f0", tags=tag,
+                )
+                canvas.create_text(
+                    x + 4, y + 3, text=str(day), anchor="nw", font=("Arial", 7),
+                    fill="white" if total / busiest > 0.6 else "#4a5568", tags=tag,
+                )
+
+                # Subject split as a stacked strip along the bottom of the cell
+                left = x + 2
+                for name, subject_hours in sorted(hours.items()):
+                    right = left + (cell - 4) * subject_hours / total
+                    canvas.create_rectangle(
+                        left, y + cell - 6, right, y + cell - 2,
+                        fill=self.subject_color(name), width=0, tags=tag,
+                    )
+                    left = right
+
+    def on_calendar_hover(self, event):
+        # Show the hovered day's hours by subject under the canvas
+        view = self.tab_views["calendar"]
+        tags = view["canvas"].gettags("current")
+        day = next((t[1:] for t in tags if t.startswith("d2")), None)
+        if day is None:
+            return
+
+        hours = view["daily"].get(day, {})
+        if not hours:
+            text = f"{self.logic.format_date_display(day)}: nothing scheduled"
+        else:
+            parts = ", ".join(f"{name} {h:.1f}h" for name, h in sorted(hours.items()))
+            text = f"{self.logic.format_date_display(day)}: {sum(hours.values()):.1f}h ({parts})"
+        view["info"].config(text=text)
+
     # Conflict handling
 
     def show_conflict_alert(self, conflicts):
         # Show conflicts to the user
-        if not conflicts:
+        if not conflicts or not self.alerts_enabled:
             return
 
         msg_lines = self.logic.format_conflict_messages(conflicts)
         all_msg = "\n".join(msg_lines)
-        messagebox.showwarning("Scheduling Conflicts Detected", all_msg)
+
+        if not any(
+                c["type"] == "overlap" or c.get("session") is not None for c in conflicts
+        ):
+            messagebox.showwarning("Scheduling Conflicts Detected", all_msg)
+            return
+
+        if messagebox.askyesno(
+                "Scheduling Conflicts Detected",
+                f"{all_msg}\n\nMove overlapping sessions to free slots automatically?",
+                icon="warning",
+        ):
+            # Resolve once the tab that raised the alert has finished building
+            self.root.after_idle(self.resolve_all_conflicts)
+
+    def resolve_all_conflicts(self):
+        # Relocate every overlapping session in one pass
+        success, result = self.logic.resolve_all_conflicts()
+        if not success:
+            messagebox.showerror("Could Not Resolve Conflicts", result)
+            return
+
+        message = f"Moved {result['moved']} session(s) to free slots."
+        if result["unresolved"]:
+            message += (
+                f"\n\n{len(result['unresolved'])} session(s) had no free slot before their "
+                "exam within the daily study limit and were left in place."
+            )
+        messagebox.showinfo("Conflicts Resolved", message)
 
     # Reminder system
 
@@ -1067,4 +2241,123 @@ class IntelligentStudyPlannerUI:
             self.logic.mark_session_reminded(idx)
 
         # Schedule next check in 2 minutes
-        self.root.after(120000, self.check_reminders)
\ No newline at end of file
+        self.root.after(120000, self.check_reminders)
+
+    def watch_data_file(self):
+        # Merge changes saved elsewhere; the change events patch the open tabs
+        self.logic.reload_changes()
+        self.root.after(WATCH_POLL_MS, self.watch_data_file)
+
+    # Debugging
+
+    def profile_tabs(self):
+        # Memory reports for building each tab from scratch, ending on the tab that was showing
+        showing = "subjects"
+        for name, (frame, version) in self.tab_frames.items():
+            if frame is self.current_tab:
+                showing = name
+
+        reports = []
+        self.alerts_enabled = False
+        try:
+            for name in ("subjects", "schedule", "dashboard", "calendar"):
+                # Drop the cached frame first, so freeing it does not offset the new one
+                frame, version = self.tab_frames.pop(name, (None, None))
+                if frame is not None:
+                    if frame is self.current_tab:
+                        self.current_tab = None
+                    frame.destroy()
+
+                show = getattr(self, f"show_{name}_tab")
+                reports.append(memprofile.measure(
+                    f"{name} tab",
+                    lambda: (show(), self.root.update_idletasks()),
+                    len(self.logic.study_sessions),
+                ))
+        finally:
+            self.alerts_enabled = True
+
+        getattr(self, f"show_{showing}_tab")()
+        return reports
+
+    def memory_reports(self):
+        # Loading, conflict detection and auto-scheduling on a copy of the data file, then the tabs
+        reports = []
+        if self.logic.data_file is not None:
+            self.logic.flush()
+            reports.extend(memprofile.profile_planner(self.logic.data_file))
+        reports.extend(self.profile_tabs())
+        return reports
+
+    def show_memory_report(self):
+        # Dialog with peak and retained memory per operation and call site
+        if self.logic is None:
+            return
+
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            report = memprofile.format_report(self.memory_reports())
+        finally:
+            self.root.config(cursor="")
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Memory Report")
+        dialog.geometry("720x560")
+        dialog.configure(bg="white")
+        dialog.transient(self.root)
+
+        tk.Label(
+            dialog,
+            text="🧮 Memory Report",
+            font=("Arial", 16, "bold"),
+            bg="white",
+            fg="#1a202c",
+        ).pack(pady=(20, 10))
+
+        text_frame = tk.Frame(dialog, bg="white")
+        text_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+        text = tk.Text(text_frame, font=("Courier", 10), bg="#f7fafc", relief="flat", wrap="none")
+        scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        text.insert("1.0", report)
+        text.config(state="disabled")
+
+        text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+    # Shutdown
+
+    def on_close(self):
+        # Write pending changes, then close the window
+        if self.sweep_executor is not None:
+            self.sweep_executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.logic is None:
+            self.root.destroy()
+            return
+
+        result = self.logic.flush()
+        if result is not True:
+            close_anyway = messagebox.askyesno(
+                "Save Failed",
+                f"Could not save your changes:\n{result[1]}\n\nClose anyway?",
+            )
+            if not close_anyway:
+                return
+        self.logic.close()
+        self.root.destroy()
+
+
+def add_months(day, months):
+    # First day of the month `months` after the month of `day`
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def heat_color(level):
+    # Hex color between HEAT_EMPTY and HEAT_FULL for a level in 0..1
+    level = max(0.0, min(1.0, level))
+    r, g, b = (round(e + (f - e) * level) for e, f in zip(HEAT_EMPTY, HEAT_FULL))
+    return f"#{r:02x}{g:02x}{b:02x}"